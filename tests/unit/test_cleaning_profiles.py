@@ -40,6 +40,21 @@ def test_base_profile_config_schema():
         pass
 
 
+@pytest.mark.unit
+def test_compile_any_matches_like_any_pattern():
+    """Test a compiled alternation matches wherever one of its patterns would."""
+    import re
+
+    from webowui.scraper.cleaning_profiles.base import compile_any
+
+    patterns = [r"^##\s+Gallery\s*$", r"^##\s+(Images|Videos)\s*$", r"Advert"]
+    combined = compile_any(patterns, re.IGNORECASE)
+
+    for line in ["## Gallery", "## videos ", "An ADVERT here", "## Media", "Gallery"]:
+        expected = any(re.match(p, line, re.IGNORECASE) for p in patterns)
+        assert bool(combined.match(line)) == expected
+
+
 @pytest.mark.unit
 def test_base_profile_get_profile_name():
     """Test profile name derivation from class name."""
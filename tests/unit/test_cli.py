@@ -665,7 +665,7 @@ def test_reclean_command(mock_cdm_cls, mock_reclean_dir, runner, mock_app_config
     assert result.exit_code == 0
     assert "Re-cleaning content for site1" in result.output
     assert "Profile: profile1" in result.output
-    mock_reclean_dir.assert_called_with(Path("/path/to/content"), "profile1")
+    mock_reclean_dir.assert_called_with(Path("/path/to/content"), "profile1", dry_run=False)
 
 
 @patch("webowui.cli.CurrentDirectoryManager")
@@ -798,6 +798,9 @@ def test_rebuild_state_command(
     assert result.exit_code == 0
     assert "State rebuilt successfully" in result.output
     assert "Confidence: high" in result.output
+    # The whole command runs on the client's shared session
+    mock_client.__aenter__.assert_awaited_once()
+    mock_client.__aexit__.assert_awaited_once()
 
 
 @patch("webowui.cli.CurrentDirectoryManager")
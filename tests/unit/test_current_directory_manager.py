@@ -10,8 +10,9 @@ Tests for:
 """
 
 import json
+import os
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -22,10 +23,29 @@ from tests.utils.helpers import (
     save_json_file,
     validate_current_directory,
 )
-from webowui.storage.current_directory_manager import CurrentDirectoryManager
+from webowui.storage.current_directory_manager import (
+    CurrentDirectoryManager,
+    _diff_file_maps,
+    _iter_md_entries,
+    _make_dirs,
+    _same_contents,
+)
 from webowui.storage.metadata_tracker import MetadataTracker
 
 
+def _read_delta_log(path: Path) -> list[dict]:
+    """Read delta log entries, skipping missing files and corrupt lines."""
+    if not path.exists():
+        return []
+    entries = []
+    for line in path.read_text().splitlines():
+        try:
+            entries.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return entries
+
+
 @pytest.mark.unit
 class TestCurrentDirectoryManagerInitialization:
     """Test CurrentDirectoryManager initialization."""
@@ -183,86 +203,87 @@ class TestCurrentDirectoryDeltaLog:
         site_name = "test_wiki"
         current_dir = tmp_outputs_dir / site_name / "current"
         current_dir.mkdir(parents=True)
+        manager = CurrentDirectoryManager(tmp_outputs_dir, site_name)
 
-        delta_log = {
-            "deltas": [
-                {
-                    "timestamp": "2025-11-20_01-00-00",
-                    "operation": "initial",
-                    "changes": {"added": 10, "modified": 0, "removed": 0},
-                }
-            ]
+        entry = {
+            "timestamp": "2025-11-20_01-00-00",
+            "operation": "initial",
+            "changes": {"added": 10, "modified": 0, "removed": 0},
         }
+        manager._create_delta_log(entry)
 
-        delta_log_file = current_dir / "delta_log.json"
-        save_json_file(delta_log_file, delta_log)
-
+        delta_log_file = current_dir / "delta_log.jsonl"
         assert delta_log_file.exists()
+        assert delta_log_file.read_text().splitlines() == [json.dumps(entry, separators=(",", ":"))]
 
     def test_delta_log_append(self, tmp_outputs_dir: Path):
         """Test appending to delta log."""
         site_name = "test_wiki"
         current_dir = tmp_outputs_dir / site_name / "current"
         current_dir.mkdir(parents=True)
+        manager = CurrentDirectoryManager(tmp_outputs_dir, site_name)
 
-        # Create initial log
-        delta_log = {
-            "deltas": [
-                {
-                    "timestamp": "2025-11-20_01-00-00",
-                    "operation": "initial",
-                    "changes": {"added": 10, "modified": 0, "removed": 0},
-                }
-            ]
-        }
-
-        delta_log_file = current_dir / "delta_log.json"
-        save_json_file(delta_log_file, delta_log)
-
-        # Append new entry
-        delta_log["deltas"].append(
-            {
-                "timestamp": "2025-11-20_02-00-00",
-                "operation": "update",
-                "changes": {"added": 2, "modified": 1, "removed": 0},
-            }
-        )
-
-        save_json_file(delta_log_file, delta_log)
+        manager._create_delta_log({"timestamp": "2025-11-20_01-00-00", "operation": "initial"})
+        manager._append_delta_log({"timestamp": "2025-11-20_02-00-00", "operation": "update"})
 
         # Verify
-        updated_log = load_json_file(delta_log_file)
-        assert len(updated_log["deltas"]) == 2
+        lines = (current_dir / "delta_log.jsonl").read_text().splitlines()
+        assert len(lines) == 2
+        assert json.loads(lines[1])["operation"] == "update"
 
     def test_delta_log_retrieval(self, tmp_outputs_dir: Path):
         """Test reading delta log."""
         site_name = "test_wiki"
         current_dir = tmp_outputs_dir / site_name / "current"
         current_dir.mkdir(parents=True)
+        manager = CurrentDirectoryManager(tmp_outputs_dir, site_name)
 
-        delta_log = {
-            "deltas": [
-                {
-                    "timestamp": "2025-11-20_01-00-00",
-                    "operation": "initial",
-                    "changes": {"added": 10, "modified": 0, "removed": 0},
-                },
-                {
-                    "timestamp": "2025-11-20_02-00-00",
-                    "operation": "update",
-                    "changes": {"added": 2, "modified": 1, "removed": 0},
-                },
-            ]
-        }
-
-        delta_log_file = current_dir / "delta_log.json"
-        save_json_file(delta_log_file, delta_log)
+        manager._create_delta_log({"timestamp": "2025-11-20_01-00-00", "operation": "initial"})
+        manager._append_delta_log({"timestamp": "2025-11-20_02-00-00", "operation": "update"})
 
         # Retrieve and verify
-        retrieved = load_json_file(delta_log_file)
-        assert len(retrieved["deltas"]) == 2
-        assert retrieved["deltas"][0]["operation"] == "initial"
-        assert retrieved["deltas"][1]["operation"] == "update"
+        retrieved = _read_delta_log(manager.delta_log_file)
+        assert len(retrieved) == 2
+        assert retrieved[0]["operation"] == "initial"
+
+    def test_legacy_delta_log_migration(self, tmp_outputs_dir: Path):
+        """Test legacy delta_log.json files are converted to JSON Lines on the next append."""
+        site_name = "test_wiki"
+        current_dir = tmp_outputs_dir / site_name / "current"
+        current_dir.mkdir(parents=True)
+
+        deltas = [
+            {"timestamp": "2025-11-20_01-00-00", "operation": "initial"},
+            {"timestamp": "2025-11-20_02-00-00", "operation": "update"},
+        ]
+        save_json_file(current_dir / "delta_log.json", {"deltas": deltas})
+        save_json_file(current_dir / "delta_log_old.json", {"deltas": deltas[:1]})
+
+        manager = CurrentDirectoryManager(tmp_outputs_dir, site_name)
+        assert (current_dir / "delta_log.json").exists()
+        assert "Delta log missing" not in manager.verify_integrity()
+
+        entry = {"timestamp": "2025-11-20_03-00-00", "operation": "update"}
+        manager._append_delta_log(entry)
+
+        assert _read_delta_log(manager.delta_log_file) == [*deltas, entry]
+        assert not (current_dir / "delta_log.json").exists()
+        assert not (current_dir / "delta_log_old.json").exists()
+        old_lines = (current_dir / "delta_log_old.jsonl").read_text().splitlines()
+        assert [json.loads(line) for line in old_lines] == deltas[:1]
+
+    def test_legacy_delta_log_migration_corrupt(self, tmp_outputs_dir: Path):
+        """Test a corrupt legacy delta log is left in place."""
+        site_name = "test_wiki"
+        current_dir = tmp_outputs_dir / site_name / "current"
+        current_dir.mkdir(parents=True)
+        (current_dir / "delta_log.json").write_text("{ invalid }")
+
+        manager = CurrentDirectoryManager(tmp_outputs_dir, site_name)
+        manager._migrate_legacy_delta_log()
+
+        assert (current_dir / "delta_log.json").exists()
+        assert not manager.delta_log_file.exists()
 
 
 @pytest.mark.unit
@@ -417,21 +438,18 @@ class TestCurrentDirectoryIntegration:
         current_dir = create_current_directory(tmp_outputs_dir, site_name, 3)
 
         # Add delta log
-        delta_log = {
-            "deltas": [
-                {
-                    "timestamp": "2025-11-20_01-00-00",
-                    "operation": "initial",
-                    "changes": {"added": 3, "modified": 0, "removed": 0},
-                }
-            ]
-        }
-
-        save_json_file(current_dir / "delta_log.json", delta_log)
+        manager = CurrentDirectoryManager(tmp_outputs_dir, site_name)
+        manager._create_delta_log(
+            {
+                "timestamp": "2025-11-20_01-00-00",
+                "operation": "initial",
+                "changes": {"added": 3, "modified": 0, "removed": 0},
+            }
+        )
 
         # Verify all components exist
         assert validate_current_directory(current_dir)
-        assert (current_dir / "delta_log.json").exists()
+        assert (current_dir / "delta_log.jsonl").exists()
         assert (current_dir / "metadata.json").exists()
         assert (current_dir / "upload_status.json").exists()
 
@@ -640,6 +658,28 @@ class TestCurrentDirectoryManagerExtended:
 
         assert any("missing from filesystem" in issue for issue in issues)
 
+    def test_verify_integrity_missing_count(self, tmp_outputs_dir: Path):
+        """Test missing files are counted from one sweep, including nested and non-.md files."""
+        site_name = "test_wiki"
+        current_dir = create_current_directory(tmp_outputs_dir, site_name, 3)
+        metadata = load_json_file(current_dir / "metadata.json")
+        (current_dir / "content" / "sub").mkdir()
+        (current_dir / "content" / "sub" / "nested.md").write_text("nested")
+        (current_dir / "content" / "image.png").write_bytes(b"png")
+        metadata["files"] += [
+            {"url": "https://example.com/nested", "filename": "sub/nested.md", "size": 6},
+            {"url": "https://example.com/image", "filename": "image.png", "size": 3},
+            {"url": "https://example.com/gone", "filename": "sub/gone.md", "size": 1},
+        ]
+        save_json_file(current_dir / "metadata.json", metadata)
+        (current_dir / "content" / "page_0.md").unlink()
+
+        manager = CurrentDirectoryManager(tmp_outputs_dir, site_name)
+        issues = manager.verify_integrity()
+
+        assert "2 files referenced in metadata but missing from filesystem" in issues
+        assert not any("orphaned" in issue for issue in issues)
+
     def test_verify_integrity_orphaned_files(self, tmp_outputs_dir: Path):
         """Test integrity check detects orphaned files."""
         site_name = "test_wiki"
@@ -659,10 +699,10 @@ class TestCurrentDirectoryManagerExtended:
         current_dir = create_current_directory(tmp_outputs_dir, site_name, 3)
 
         # Create delta log first (helper doesn't create it)
-        (current_dir / "delta_log.json").write_text("{}")
+        (current_dir / "delta_log.jsonl").write_text("{}\n")
 
         # Remove delta log
-        (current_dir / "delta_log.json").unlink()
+        (current_dir / "delta_log.jsonl").unlink()
 
         manager = CurrentDirectoryManager(tmp_outputs_dir, site_name)
         issues = manager.verify_integrity()
@@ -723,19 +763,157 @@ class TestCurrentDirectoryManagerExtended:
         assert status["files"][0]["checksum"] == remote_checksum
         assert status["rebuilt_from_remote"] is True
 
+    def test_save_upload_status_previous_rebuild_fallback(self, tmp_outputs_dir: Path):
+        """Test files not re-uploaded keep the checksum recorded by a previous rebuild."""
+        site_name = "test_wiki"
+        current_dir = create_current_directory(tmp_outputs_dir, site_name, 2)
+        metadata = load_json_file(current_dir / "metadata.json")
+        metadata["current_state"] = {"source_timestamp": "2025-11-20_01-00-00"}
+        save_json_file(current_dir / "metadata.json", metadata)
+        save_json_file(
+            current_dir / "upload_status.json",
+            {
+                "rebuilt_from_remote": True,
+                "files": [
+                    {"url": "https://example.com/page0", "checksum": "remote0"},
+                    {"url": "https://example.com/page1", "checksum": "remote1"},
+                ],
+            },
+        )
+        manager = CurrentDirectoryManager(tmp_outputs_dir, site_name)
+
+        # Only page1 was uploaded this time
+        manager.save_upload_status(
+            {"knowledge_id": "kb-1", "file_id_map": {"https://example.com/page1": "file-1"}}
+        )
+
+        files = {f["url"]: f for f in manager.get_upload_status()["files"]}
+        assert files["https://example.com/page0"]["checksum"] == "remote0"
+        assert files["https://example.com/page1"]["checksum"] == "hash0001"
+        assert files["https://example.com/page1"]["file_id"] == "file-1"
+
     def test_copy_file_failure(self, tmp_outputs_dir: Path):
         """Test handling of file copy failure."""
         site_name = "test_wiki"
         manager = CurrentDirectoryManager(tmp_outputs_dir, site_name)
 
-        # Mock shutil.copy2 to raise exception
-        with patch("shutil.copy2", side_effect=OSError("Copy failed")):
+        # Mock the copy helper to raise exception
+        with patch(
+            "webowui.storage.current_directory_manager.fast_copy",
+            side_effect=OSError("Copy failed"),
+        ):
             result = manager._copy_file_to_current(
                 "2025-11-20_01-00-00", {"filepath": "test.md", "filename": "test.md"}
             )
 
         assert result is False
 
+    def test_copy_file_skips_identical_destination(self, tmp_outputs_dir: Path):
+        """Test copy is skipped when dest already holds the source's bytes."""
+        site_name = "test_wiki"
+        timestamp = "2025-11-20_01-00-00"
+        create_test_scrape_directory(tmp_outputs_dir, site_name, timestamp, 1)
+        manager = CurrentDirectoryManager(tmp_outputs_dir, site_name)
+        manager.content_dir.mkdir(parents=True)
+        file_info = {"filepath": "content/page_0.md", "filename": "page_0.md"}
+
+        assert manager._copy_file_to_current(timestamp, file_info) is True
+
+        with patch("webowui.storage.current_directory_manager.fast_copy") as mock_copy:
+            assert manager._copy_file_to_current(timestamp, file_info) is True
+            mock_copy.assert_not_called()
+
+            # A changed source is copied again
+            source_file = tmp_outputs_dir / site_name / timestamp / "content" / "page_0.md"
+            source_file.write_text("changed content")
+            assert manager._copy_file_to_current(timestamp, file_info) is True
+            mock_copy.assert_called_once()
+
+    def test_copy_file_skips_identical_content(self, tmp_outputs_dir: Path):
+        """Test same-size, same-bytes files aren't rewritten."""
+        site_name = "test_wiki"
+        timestamp = "2025-11-20_01-00-00"
+        create_test_scrape_directory(tmp_outputs_dir, site_name, timestamp, 1)
+        manager = CurrentDirectoryManager(tmp_outputs_dir, site_name)
+        manager.content_dir.mkdir(parents=True)
+        source_file = tmp_outputs_dir / site_name / timestamp / "content" / "page_0.md"
+        dest_file = manager.content_dir / "page_0.md"
+        dest_file.write_bytes(source_file.read_bytes())
+        os.utime(dest_file, ns=(0, 0))
+
+        with patch("webowui.storage.current_directory_manager.fast_copy") as mock_copy:
+            assert manager._copy_file_to_current(
+                timestamp, {"filepath": "content/page_0.md", "filename": "page_0.md"}
+            )
+            mock_copy.assert_not_called()
+
+    def test_copy_file_same_size_and_mtime_but_edited(self, tmp_outputs_dir: Path):
+        """Test an in-place edit keeping size and mtime is still copied."""
+        site_name = "test_wiki"
+        timestamp = "2025-11-20_01-00-00"
+        create_test_scrape_directory(tmp_outputs_dir, site_name, timestamp, 1)
+        manager = CurrentDirectoryManager(tmp_outputs_dir, site_name)
+        manager.content_dir.mkdir(parents=True)
+        file_info = {"filepath": "content/page_0.md", "filename": "page_0.md"}
+        source_file = tmp_outputs_dir / site_name / timestamp / "content" / "page_0.md"
+        dest_file = manager.content_dir / "page_0.md"
+        assert manager._copy_file_to_current(timestamp, file_info) is True
+
+        # Same length, same timestamps, different bytes
+        stat = source_file.stat()
+        data = source_file.read_bytes()
+        source_file.write_bytes(data[::-1])
+        os.utime(source_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        assert manager._copy_file_to_current(timestamp, file_info) is True
+        assert dest_file.read_bytes() == data[::-1]
+
+    def test_update_from_scrape_diffs_against_current(self, tmp_outputs_dir: Path):
+        """Test changes are computed from current/ metadata, copying only changed files."""
+        site_name = "test_wiki"
+        prev_timestamp = "2025-11-20_01-00-00"
+        curr_timestamp = "2025-11-20_02-00-00"
+        create_test_scrape_directory(tmp_outputs_dir, site_name, prev_timestamp, 2)
+        current_dir = create_current_directory(tmp_outputs_dir, site_name, 2)
+        metadata = load_json_file(current_dir / "metadata.json")
+        metadata["current_state"] = {"source_timestamp": prev_timestamp}
+        save_json_file(current_dir / "metadata.json", metadata)
+
+        new_scrape = {
+            "site": {"name": site_name},
+            "files": [
+                {**metadata["files"][0], "filepath": "content/page_0.md"},  # Same checksum
+                {**metadata["files"][1], "filepath": "content/page_1.md", "checksum": "new"},
+            ],
+        }
+        tracker = MagicMock()
+        tracker.get_scrape_by_timestamp.return_value = new_scrape
+
+        manager = CurrentDirectoryManager(tmp_outputs_dir, site_name)
+        with patch.object(manager, "_copy_file_to_current", return_value=True) as mock_copy:
+            result = manager.update_from_scrape(curr_timestamp, tracker)
+
+        assert result["changes"] == {"added": 0, "modified": 1, "removed": 0}
+        mock_copy.assert_called_once_with(curr_timestamp, new_scrape["files"][1])
+        tracker.compare_scrapes.assert_not_called()
+
+    def test_update_from_scrape_previous_source_missing(self, tmp_outputs_dir: Path):
+        """Test update rebuilds when the previous source scrape is gone."""
+        site_name = "test_wiki"
+        current_dir = create_current_directory(tmp_outputs_dir, site_name, 1)
+        metadata = load_json_file(current_dir / "metadata.json")
+        metadata["current_state"] = {"source_timestamp": "2025-11-20_01-00-00"}
+        save_json_file(current_dir / "metadata.json", metadata)
+        tracker = MagicMock()
+        tracker.get_scrape_by_timestamp.return_value = {"files": []}
+
+        manager = CurrentDirectoryManager(tmp_outputs_dir, site_name)
+        with patch.object(manager, "rebuild_from_timestamp", return_value={"ok": True}) as rebuild:
+            result = manager.update_from_scrape("2025-11-20_02-00-00", tracker)
+
+        assert result == {"ok": True}
+        rebuild.assert_called_once_with("2025-11-20_02-00-00")
+
     def test_remove_file_failure(self, tmp_outputs_dir: Path):
         """Test handling of file removal failure."""
         site_name = "test_wiki"
@@ -751,6 +929,28 @@ class TestCurrentDirectoryManagerExtended:
 
         assert result is False
 
+    def test_prune_empty_dirs(self, tmp_outputs_dir: Path):
+        """Test emptied directories are removed bottom-up, stopping at content_dir."""
+        manager = CurrentDirectoryManager(tmp_outputs_dir, "test_wiki")
+        content_dir = manager.content_dir
+        (content_dir / "a" / "b" / "c").mkdir(parents=True)
+        (content_dir / "a" / "b" / "d").mkdir()
+        (content_dir / "keep" / "x").mkdir(parents=True)
+        (content_dir / "keep" / "page.md").write_text("kept")
+
+        manager._prune_empty_dirs(
+            {
+                content_dir / "a" / "b" / "c",
+                content_dir / "a" / "b" / "d",
+                content_dir / "keep" / "x",
+            }
+        )
+
+        assert not (content_dir / "a").exists()
+        assert not (content_dir / "keep" / "x").exists()
+        assert (content_dir / "keep" / "page.md").exists()
+        assert content_dir.exists()
+
     def test_update_from_scrape_success(self, tmp_outputs_dir: Path):
         """Test successful update with additions, modifications, and deletions."""
         site_name = "test_wiki"
@@ -832,28 +1032,24 @@ class TestCurrentDirectoryManagerExtended:
         assert result["changes"]["removed"] == 1
 
         # Verify delta log
-        delta_log = load_json_file(current_dir / "delta_log.json")
-        assert (
-            len(delta_log["deltas"]) == 1
-        )  # create_current_directory doesn't create log, so this is first
-        assert delta_log["deltas"][0]["operation"] == "update"
+        deltas = _read_delta_log(manager.delta_log_file)
+        assert len(deltas) == 1  # create_current_directory doesn't create log, so this is first
+        assert deltas[0]["operation"] == "update"
 
     def test_append_delta_log_corrupt(self, tmp_outputs_dir: Path):
-        """Test appending to a corrupt delta log recreates it."""
+        """Test appending after a corrupt, unterminated delta log line keeps the new entry."""
         site_name = "test_wiki"
         current_dir = create_current_directory(tmp_outputs_dir, site_name, 1)
         manager = CurrentDirectoryManager(tmp_outputs_dir, site_name)
 
-        # Create corrupt delta log
-        (current_dir / "delta_log.json").write_text("{ invalid }")
+        # Create corrupt delta log (interrupted write, no trailing newline)
+        (current_dir / "delta_log.jsonl").write_text('{"timestamp": "earlier", "oper')
 
         entry = {"timestamp": "now", "operation": "test"}
         manager._append_delta_log(entry)
 
-        # Should be recreated with just the new entry
-        log = load_json_file(current_dir / "delta_log.json")
-        assert len(log["deltas"]) == 1
-        assert log["deltas"][0] == entry
+        # Corrupt line is skipped on read, new entry survives
+        assert _read_delta_log(manager.delta_log_file) == [entry]
 
     def test_get_files_for_upload_incremental(self, tmp_outputs_dir: Path):
         """Test incremental upload logic."""
@@ -916,6 +1112,156 @@ class TestCurrentDirectoryManagerExtended:
         # Check deletions
         assert "https://example.com/page1" in result["delete"]
 
+    def test_update_metadata_preserves_added_on(self, tmp_outputs_dir: Path):
+        """Test _update_metadata keeps added_on, rebuilds entries and drops removed files."""
+        site_name = "test_wiki"
+        current_dir = create_current_directory(tmp_outputs_dir, site_name, 2)
+        metadata = load_json_file(current_dir / "metadata.json")
+        for f in metadata["files"]:
+            f["added_on"] = "2025-11-20_01-00-00"
+        metadata["files"][1]["source_checksum"] = "stale"
+        save_json_file(current_dir / "metadata.json", metadata)
+        manager = CurrentDirectoryManager(tmp_outputs_dir, site_name)
+
+        new_scrape = {
+            "files": [
+                {**metadata["files"][1], "checksum": "new_hash"},
+                {"url": "https://example.com/new", "filename": "new.md", "size": 10},
+            ]
+        }
+        for f in new_scrape["files"]:
+            f.pop("added_on", None)
+            # Not emitted by the new scrape, so it must not survive from the old entry
+            f.pop("source_checksum", None)
+        manager._update_metadata("2025-11-20_02-00-00", new_scrape)
+
+        updated = load_json_file(current_dir / "metadata.json")
+        assert [f["url"] for f in updated["files"]] == [
+            "https://example.com/page1",
+            "https://example.com/new",
+        ]
+        assert updated["files"][0]["checksum"] == "new_hash"
+        assert "source_checksum" not in updated["files"][0]
+        assert updated["files"][0]["added_on"] == "2025-11-20_01-00-00"
+        assert updated["files"][0]["last_modified"] == "2025-11-20_02-00-00"
+        assert updated["files"][1]["added_on"] == "2025-11-20_02-00-00"
+        assert updated["current_state"]["total_files"] == 2
+
+    def test_load_metadata_cached_until_file_changes(self, tmp_outputs_dir: Path):
+        """Test metadata is parsed on first use and reloaded after the file changes."""
+        site_name = "test_wiki"
+        current_dir = create_current_directory(tmp_outputs_dir, site_name, 2)
+
+        with patch(
+            "webowui.storage.current_directory_manager.load_json", wraps=load_json_file
+        ) as mock_load:
+            manager = CurrentDirectoryManager(tmp_outputs_dir, site_name)
+            assert mock_load.call_count == 0
+
+            first = manager._load_metadata()
+            assert first is not None
+            assert manager._load_metadata() is first
+            assert mock_load.call_count == 1
+
+            metadata = load_json_file(current_dir / "metadata.json")
+            metadata["files"].pop()
+            save_json_file(current_dir / "metadata.json", metadata)
+
+            reloaded = manager._load_metadata()
+            assert mock_load.call_count == 2
+            assert reloaded is not None
+            assert len(reloaded["files"]) == 1
+
+    def test_upload_status_cached_and_refreshed(self, tmp_outputs_dir: Path):
+        """Test upload status is cached, updated on save and dropped by refresh()."""
+        site_name = "test_wiki"
+        current_dir = create_current_directory(tmp_outputs_dir, site_name, 2)
+        metadata = load_json_file(current_dir / "metadata.json")
+        metadata["current_state"] = {"source_timestamp": "2025-11-20_01-00-00"}
+        save_json_file(current_dir / "metadata.json", metadata)
+        manager = CurrentDirectoryManager(tmp_outputs_dir, site_name)
+        status = manager._load_upload_status()
+        assert status is not None
+        manager._load_metadata()
+
+        with patch("webowui.storage.current_directory_manager.load_json") as mock_load:
+            assert manager._load_upload_status() is status
+            manager.save_upload_status({"knowledge_id": "kb-new", "file_id_map": {}})
+            assert manager.get_upload_status()["knowledge_id"] == "kb-new"
+            mock_load.assert_not_called()
+
+        manager.refresh()
+        assert manager._upload_status_cache is None
+        assert manager._metadata_cache is None
+        assert load_json_file(current_dir / "upload_status.json")["knowledge_id"] == "kb-new"
+        assert manager.get_upload_status()["knowledge_id"] == "kb-new"
+
+    def test_init_has_no_side_effects(self, tmp_outputs_dir: Path):
+        """Test creating a manager neither parses state nor migrates the delta log."""
+        site_name = "test_wiki"
+        current_dir = create_current_directory(tmp_outputs_dir, site_name, 1)
+        save_json_file(current_dir / "delta_log.json", {"deltas": [{"operation": "initial"}]})
+
+        with patch("webowui.storage.current_directory_manager.load_json") as mock_load:
+            CurrentDirectoryManager(tmp_outputs_dir, site_name)
+
+        mock_load.assert_not_called()
+        assert (current_dir / "delta_log.json").exists()
+        assert not (current_dir / "delta_log.jsonl").exists()
+
+    def test_public_results_do_not_share_cache(self, tmp_outputs_dir: Path):
+        """Test modifying returned upload status or file entries leaves the cache intact."""
+        site_name = "test_wiki"
+        create_current_directory(tmp_outputs_dir, site_name, 2)
+        manager = CurrentDirectoryManager(tmp_outputs_dir, site_name)
+
+        status = manager.get_upload_status()
+        assert status is not None
+        status["files"].clear()
+        assert manager.get_upload_status()["files"]
+
+        upload = manager.get_files_for_upload(incremental=False)["upload"]
+        upload[0]["checksum"] = "tampered"
+        assert all(f["checksum"] != "tampered" for f in manager._load_metadata()["files"])
+
+    def test_write_metadata_refreshes_cache(self, tmp_outputs_dir: Path):
+        """Test writes update the cache and failed writes invalidate it."""
+        site_name = "test_wiki"
+        create_current_directory(tmp_outputs_dir, site_name, 1)
+        manager = CurrentDirectoryManager(tmp_outputs_dir, site_name)
+        metadata = {"files": [], "current_state": {}}
+
+        manager._write_metadata(metadata)
+        with patch("webowui.storage.current_directory_manager.load_json") as mock_load:
+            assert manager._load_metadata() is metadata
+            mock_load.assert_not_called()
+
+        with (
+            patch(
+                "webowui.storage.current_directory_manager.dump_json",
+                side_effect=OSError("disk full"),
+            ),
+            pytest.raises(OSError),
+        ):
+            manager._write_metadata({"files": ["partial"]})
+        assert manager._metadata_cache is None
+
+    def test_files_by_url_index_reused(self, tmp_outputs_dir: Path):
+        """Test the url index is reused for the same metadata and reset on write."""
+        site_name = "test_wiki"
+        create_current_directory(tmp_outputs_dir, site_name, 2)
+        manager = CurrentDirectoryManager(tmp_outputs_dir, site_name)
+        metadata = manager._load_metadata()
+        assert metadata is not None
+
+        index = manager._files_by_url(metadata)
+        assert set(index) == {"https://example.com/page0", "https://example.com/page1"}
+        assert manager._files_by_url(metadata) is index
+
+        metadata["files"].pop()
+        manager._write_metadata(metadata)
+        assert set(manager._files_by_url(metadata)) == {"https://example.com/page0"}
+
     def test_update_metadata_none(self, tmp_outputs_dir: Path):
         """Test _update_metadata handles missing metadata file."""
         site_name = "test_wiki"
@@ -933,7 +1279,7 @@ class TestCurrentDirectoryManagerExtended:
 
 
 def test_delta_log_rotation(tmp_path):
-    """Test that delta log rotates when it exceeds 100 entries."""
+    """Test that delta log rotates once it grows past the size limit."""
     from webowui.storage.current_directory_manager import CurrentDirectoryManager
 
     # Setup manager manually since fixture is missing/failing
@@ -944,31 +1290,153 @@ def test_delta_log_rotation(tmp_path):
 
     # Create a delta log with 101 entries
     deltas = [{"timestamp": f"2025-01-01T{i:02d}:00:00", "operation": "test"} for i in range(101)]
-    delta_log = {"deltas": deltas}
 
-    manager.delta_log_file.parent.mkdir(parents=True, exist_ok=True)
     with open(manager.delta_log_file, "w") as f:
-        json.dump(delta_log, f)
+        for entry in deltas:
+            f.write(json.dumps(entry) + "\n")
 
     # Add one more entry to trigger rotation
     new_entry = {"timestamp": "2025-01-02T00:00:00", "operation": "new"}
-    manager._append_delta_log(new_entry)
+    with patch("webowui.storage.current_directory_manager._DELTA_LOG_ROTATE_BYTES", 1024):
+        manager._append_delta_log(new_entry)
 
     # Verify rotation
-    with open(manager.delta_log_file) as f:
-        current_log = json.load(f)
+    current_log = _read_delta_log(manager.delta_log_file)
 
-    # Should have 51 entries (101 - 50 + 1 new)
-    assert len(current_log["deltas"]) == 52
-    assert current_log["deltas"][-1] == new_entry
+    # Should have 52 entries (101 - 50 + 1 new)
+    assert len(current_log) == 52
+    assert current_log[-1] == new_entry
 
     # Verify archive created
-    archive_file = manager.current_dir / "delta_log_old.json"
+    archive_file = manager.current_dir / "delta_log_old.jsonl"
     assert archive_file.exists()
 
     with open(archive_file) as f:
-        archive_log = json.load(f)
+        archive_log = [json.loads(line) for line in f]
 
     # Should have 50 archived entries
-    assert len(archive_log["deltas"]) == 50
-    assert archive_log["deltas"][0] == deltas[0]
+    assert len(archive_log) == 50
+    assert archive_log[0] == deltas[0]
+
+
+def test_delta_log_append_does_not_read_log(tmp_path):
+    """Test appending below the size limit never reads the existing log."""
+    from webowui.storage.current_directory_manager import CurrentDirectoryManager
+
+    base_dir = tmp_path / "outputs"
+    base_dir.mkdir()
+    manager = CurrentDirectoryManager(base_dir, "test_site")
+    manager.current_dir.mkdir(parents=True)
+    manager._create_delta_log({"timestamp": "t1", "operation": "initial"})
+
+    with patch.object(manager, "_rotate_delta_log") as mock_rotate:
+        manager._append_delta_log({"timestamp": "t2", "operation": "update"})
+
+    mock_rotate.assert_not_called()
+    assert [e["timestamp"] for e in _read_delta_log(manager.delta_log_file)] == ["t1", "t2"]
+
+
+@pytest.mark.unit
+def test_diff_file_maps():
+    """Test URL/checksum diff between two file maps."""
+    old = {
+        "a": {"checksum": "1"},
+        "b": {"checksum": "2"},
+        "c": {"checksum": "3"},
+    }
+    new = {
+        "a": {"checksum": "1"},
+        "b": {"checksum": "changed"},
+        "d": {"checksum": "4"},
+    }
+
+    added, modified, removed = _diff_file_maps(new, old)
+
+    assert added == {"d"}
+    assert modified == {"b"}
+    assert removed == {"c"}
+
+
+@pytest.mark.unit
+def test_same_contents(tmp_path: Path):
+    """Test mmap byte comparison of equal-size files."""
+    a = tmp_path / "a.md"
+    b = tmp_path / "b.md"
+    a.write_bytes(b"same bytes")
+    b.write_bytes(b"same bytes")
+    assert _same_contents(a, b, 10) is True
+
+    b.write_bytes(b"diff bytes")
+    assert _same_contents(a, b, 10) is False
+
+    a.write_bytes(b"")
+    b.write_bytes(b"")
+    assert _same_contents(a, b, 0) is True
+
+
+@pytest.mark.unit
+def test_make_dirs_creates_nested_directories(tmp_path: Path):
+    """Test _make_dirs creates every directory, including shared parents."""
+    directories = {tmp_path / "a" / "b" / "c", tmp_path / "a", tmp_path / "d"}
+
+    _make_dirs(directories)
+
+    assert all(d.is_dir() for d in directories)
+    _make_dirs(directories)  # Idempotent
+
+
+@pytest.mark.unit
+def test_rebuild_from_timestamp_nested_paths(tmp_outputs_dir: Path):
+    """Test rebuild copies many files across nested directories."""
+    site_name = "test_wiki"
+    timestamp = "2025-11-20_01-00-00"
+    scrape_dir = tmp_outputs_dir / site_name / timestamp
+    files = []
+    for i in range(40):
+        filename = f"section{i % 4}/sub{i % 3}/page{i}.md"
+        source = scrape_dir / "content" / filename
+        source.parent.mkdir(parents=True, exist_ok=True)
+        source.write_text(f"page {i}")
+        files.append(
+            {
+                "url": f"https://example.com/{filename}",
+                "filename": filename,
+                "filepath": f"content/{filename}",
+                "checksum": f"hash{i}",
+                "size": len(f"page {i}"),
+            }
+        )
+    # A file listed in metadata but missing on disk is skipped
+    files.append(
+        {
+            "url": "https://example.com/missing",
+            "filename": "missing.md",
+            "filepath": "content/missing.md",
+            "checksum": "hash-missing",
+            "size": 0,
+        }
+    )
+    save_json_file(scrape_dir / "metadata.json", {"site": {"name": site_name}, "files": files})
+
+    manager = CurrentDirectoryManager(tmp_outputs_dir, site_name)
+    result = manager.rebuild_from_timestamp(timestamp)
+
+    assert result["files_copied"] == 40
+    assert (manager.content_dir / "section3/sub2/page11.md").read_text() == "page 11"
+    assert not (manager.content_dir / "missing.md").exists()
+
+
+@pytest.mark.unit
+def test_iter_md_entries(tmp_path: Path):
+    """Test scandir walk yields nested markdown files with relative paths."""
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    (tmp_path / "top.md").write_text("1")
+    (tmp_path / "a" / "mid.md").write_text("22")
+    (tmp_path / "a" / "b" / "deep.md").write_text("333")
+    (tmp_path / "a" / "notes.txt").write_text("ignored")
+
+    entries = dict(_iter_md_entries(tmp_path))
+
+    assert set(entries) == {"top.md", "a/mid.md", "a/b/deep.md"}
+    assert entries["a/b/deep.md"].stat().st_size == 3
+    assert list(_iter_md_entries(tmp_path / "missing")) == []
@@ -0,0 +1,148 @@
+"""
+Unit tests for the file copy helper (webowui/utils/file_copy.py).
+
+Tests for:
+- Content, permission bits and mtime carried over to the destination
+- Reflink, kernel copy and userspace fallback paths
+- Best-effort fadvise hints
+"""
+
+import errno
+import os
+import stat
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from webowui.utils.file_copy import _fadvise, _try_reflink, fast_copy
+
+
+@pytest.mark.unit
+class TestFastCopy:
+    """Test the fast_copy helper."""
+
+    def test_fast_copy_content_and_mtime(self, tmp_path: Path):
+        """Test content is copied and modification time preserved."""
+        src = tmp_path / "src.md"
+        dst = tmp_path / "dst.md"
+        src.write_text("# Title\n\nSome content ✓\n", encoding="utf-8")
+        os.utime(src, ns=(1_700_000_000_000_000_000, 1_700_000_000_000_000_000))
+
+        fast_copy(src, dst)
+
+        assert dst.read_bytes() == src.read_bytes()
+        assert dst.stat().st_mtime_ns == src.stat().st_mtime_ns
+
+    def test_fast_copy_overwrites_existing(self, tmp_path: Path):
+        """Test a longer existing destination is truncated."""
+        src = tmp_path / "src.md"
+        dst = tmp_path / "dst.md"
+        src.write_text("short")
+        dst.write_text("a much longer previous version")
+
+        fast_copy(src, dst)
+
+        assert dst.read_text() == "short"
+
+    def test_fast_copy_userspace_fallback(self, tmp_path: Path):
+        """Test fallback to buffered copy when kernel copy paths are unavailable."""
+        src = tmp_path / "src.md"
+        dst = tmp_path / "dst.md"
+        src.write_bytes(b"x" * (3 * 1024 * 1024 + 17))
+
+        unsupported = OSError(errno.EXDEV, "Cross-device link")
+        with (
+            patch("webowui.utils.file_copy._try_reflink", return_value=False),
+            patch("os.copy_file_range", side_effect=unsupported, create=True),
+            patch("os.sendfile", side_effect=unsupported, create=True),
+        ):
+            fast_copy(src, dst)
+
+        assert dst.read_bytes() == src.read_bytes()
+
+    def test_fast_copy_userspace_fallback_short_writes(self, tmp_path: Path):
+        """Test short raw writes in the buffered fallback don't truncate the copy."""
+        src = tmp_path / "src.md"
+        dst = tmp_path / "dst.md"
+        src.write_bytes(os.urandom(64 * 1024 + 5))
+        real_write = os.write
+
+        unsupported = OSError(errno.EXDEV, "Cross-device link")
+        with (
+            patch("webowui.utils.file_copy._try_reflink", return_value=False),
+            patch("os.copy_file_range", side_effect=unsupported, create=True),
+            patch("os.sendfile", side_effect=unsupported, create=True),
+            patch("os.write", side_effect=lambda fd, data: real_write(fd, data[:1000])),
+        ):
+            fast_copy(src, dst)
+
+        assert dst.read_bytes() == src.read_bytes()
+
+    def test_fast_copy_permission_bits(self, tmp_path: Path):
+        """Test the source's permission bits are carried over like shutil.copy2."""
+        src = tmp_path / "src.md"
+        dst = tmp_path / "dst.md"
+        src.write_text("content")
+        os.chmod(src, 0o640)
+
+        fast_copy(src, dst)
+
+        assert stat.S_IMODE(dst.stat().st_mode) == 0o640
+
+    def test_fast_copy_reflink_skips_data_copy(self, tmp_path: Path):
+        """Test a successful reflink short-circuits the data copy paths."""
+        src = tmp_path / "src.md"
+        dst = tmp_path / "dst.md"
+        src.write_text("content")
+
+        with (
+            patch("webowui.utils.file_copy._try_reflink", return_value=True),
+            patch("os.copy_file_range", create=True) as mock_copy_range,
+            patch("os.sendfile", create=True) as mock_sendfile,
+        ):
+            fast_copy(src, dst)
+
+        mock_copy_range.assert_not_called()
+        mock_sendfile.assert_not_called()
+
+    def test_try_reflink_unsupported(self, tmp_path: Path):
+        """Test reflink reports False when the filesystem can't clone."""
+        unsupported = OSError(errno.EOPNOTSUPP, "Operation not supported")
+        with patch("webowui.utils.file_copy.fcntl.ioctl", side_effect=unsupported):
+            assert _try_reflink(0, 1) is False
+
+    def test_fast_copy_fadvise_source(self, tmp_path: Path):
+        """Test the source gets sequential + dontneed hints and copy still succeeds."""
+        src = tmp_path / "src.md"
+        dst = tmp_path / "dst.md"
+        src.write_text("content")
+
+        with (
+            patch("webowui.utils.file_copy._try_reflink", return_value=False),
+            patch("webowui.utils.file_copy._fadvise") as mock_fadvise,
+        ):
+            fast_copy(src, dst)
+
+        advice = [call.args[1] for call in mock_fadvise.call_args_list]
+        assert advice == ["POSIX_FADV_SEQUENTIAL", "POSIX_FADV_DONTNEED"]
+        assert dst.read_text() == "content"
+
+    def test_fadvise_ignores_errors(self):
+        """Test fadvise failures (e.g. unsupported fd types) are ignored."""
+        with patch(
+            "os.posix_fadvise", side_effect=OSError(errno.ESPIPE, "Illegal seek"), create=True
+        ):
+            _fadvise(0, "POSIX_FADV_SEQUENTIAL")
+        _fadvise(0, "POSIX_FADV_NOT_A_REAL_ADVICE")
+
+    def test_fast_copy_empty_file(self, tmp_path: Path):
+        """Test copying an empty file."""
+        src = tmp_path / "empty.md"
+        dst = tmp_path / "copy.md"
+        src.write_bytes(b"")
+
+        fast_copy(src, dst)
+
+        assert dst.exists()
+        assert dst.read_bytes() == b""
@@ -0,0 +1,176 @@
+"""
+Unit tests for JSON_IO module (webowui/utils/json_io.py).
+
+Tests for:
+- Round-tripping documents through load_json/dump_json
+- Stdlib fallback when orjson is not installed
+- Error propagation for invalid files
+- Atomic writes
+"""
+
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from webowui.utils.json_io import (
+    atomic_write_bytes,
+    dump_json,
+    dump_json_streaming,
+    dumps_json,
+    load_json,
+    loads_json,
+)
+
+SAMPLE = {
+    "site": {"name": "test_wiki"},
+    "files": [{"url": "https://example.com/page0", "size": 1024, "title": "Café"}],
+}
+
+
+@pytest.fixture(params=["default", "stdlib"])
+def json_backend(request):
+    """Run a test with the default backend and with orjson unavailable."""
+    if request.param == "stdlib":
+        with patch("webowui.utils.json_io.orjson", None):
+            yield request.param
+    else:
+        yield request.param
+
+
+@pytest.mark.unit
+class TestJsonIO:
+    """Test JSON load/dump helpers."""
+
+    def test_round_trip(self, tmp_path: Path, json_backend):
+        """Test a document survives dump + load unchanged."""
+        path = tmp_path / "metadata.json"
+
+        dump_json(SAMPLE, path)
+
+        assert load_json(path) == SAMPLE
+
+    def test_output_is_compact_json(self, tmp_path: Path, json_backend, monkeypatch):
+        """Test written files are compact, UTF-8 and stdlib-compatible by default."""
+        monkeypatch.delenv("WEBOWUI_PRETTY_JSON", raising=False)
+        path = tmp_path / "metadata.json"
+
+        dump_json(SAMPLE, path)
+
+        text = path.read_text(encoding="utf-8")
+        assert text.startswith('{"site":{"name":"test_wiki"}')
+        assert "Café" in text
+        assert json.loads(text) == SAMPLE
+
+    def test_pretty_json_env(self, tmp_path: Path, json_backend, monkeypatch):
+        """Test WEBOWUI_PRETTY_JSON switches to indented output."""
+        monkeypatch.setenv("WEBOWUI_PRETTY_JSON", "1")
+        path = tmp_path / "metadata.json"
+
+        dump_json(SAMPLE, path)
+
+        text = path.read_text(encoding="utf-8")
+        assert text.startswith('{\n  "site"')
+        assert json.loads(text) == SAMPLE
+
+    def test_pretty_argument(self, tmp_path: Path, json_backend, monkeypatch):
+        """Test pretty=True indents regardless of WEBOWUI_PRETTY_JSON."""
+        monkeypatch.delenv("WEBOWUI_PRETTY_JSON", raising=False)
+        path = tmp_path / "scrape_report.json"
+
+        dump_json(SAMPLE, path, pretty=True)
+
+        assert path.read_text(encoding="utf-8").startswith('{\n  "site"')
+
+    def test_load_invalid_json(self, tmp_path: Path, json_backend):
+        """Test invalid JSON raises ValueError on either backend."""
+        path = tmp_path / "metadata.json"
+        path.write_text("{ invalid }")
+
+        with pytest.raises(ValueError):
+            load_json(path)
+
+    def test_load_empty_file(self, tmp_path: Path, json_backend):
+        """Test an empty file is reported as invalid JSON, not an mmap error."""
+        path = tmp_path / "metadata.json"
+        path.write_bytes(b"")
+
+        with pytest.raises(ValueError):
+            load_json(path)
+
+    def test_load_missing_file(self, tmp_path: Path, json_backend):
+        """Test missing files raise OSError."""
+        with pytest.raises(OSError):
+            load_json(tmp_path / "missing.json")
+
+    def test_loads_json(self, json_backend):
+        """Test in-memory documents decode from str or bytes on either backend."""
+        text = json.dumps(SAMPLE)
+
+        assert loads_json(text) == SAMPLE
+        assert loads_json(text.encode()) == SAMPLE
+        with pytest.raises(ValueError):
+            loads_json("{ invalid }")
+
+    def test_dumps_json(self, json_backend):
+        """Test request bodies serialize compactly and round-trip on either backend."""
+        text = dumps_json([{"file_id": "file-1"}, {"file_id": "file-2"}])
+
+        assert text == '[{"file_id":"file-1"},{"file_id":"file-2"}]'
+        assert json.loads(dumps_json(SAMPLE)) == SAMPLE
+
+    def test_dump_leaves_no_temp_file(self, tmp_path: Path, json_backend):
+        """Test the temporary file is renamed over the target."""
+        path = tmp_path / "metadata.json"
+        path.write_text("{}")
+
+        dump_json(SAMPLE, path)
+
+        assert load_json(path) == SAMPLE
+        assert [p.name for p in tmp_path.iterdir()] == ["metadata.json"]
+
+
+@pytest.mark.unit
+class TestJsonStreaming:
+    """Test dump_json_streaming."""
+
+    def test_matches_dump_json(self, tmp_path: Path, json_backend, monkeypatch):
+        """Test streamed output is byte-identical to dump_json."""
+        monkeypatch.delenv("WEBOWUI_PRETTY_JSON", raising=False)
+        doc = {**SAMPLE, "failed_urls": [], "statistics": {"total": 1}, "tags": ["a", "b"]}
+
+        dump_json(doc, tmp_path / "a.json")
+        dump_json_streaming(doc, tmp_path / "b.json")
+
+        assert (tmp_path / "b.json").read_bytes() == (tmp_path / "a.json").read_bytes()
+        assert load_json(tmp_path / "b.json") == doc
+
+    def test_pretty_env_falls_back(self, tmp_path: Path, json_backend, monkeypatch):
+        """Test WEBOWUI_PRETTY_JSON still produces indented output."""
+        monkeypatch.setenv("WEBOWUI_PRETTY_JSON", "1")
+        path = tmp_path / "metadata.json"
+
+        dump_json_streaming(SAMPLE, path)
+
+        assert path.read_text(encoding="utf-8").startswith('{\n  "site"')
+        assert load_json(path) == SAMPLE
+
+
+@pytest.mark.unit
+class TestAtomicWrite:
+    """Test atomic_write_bytes."""
+
+    def test_failed_write_keeps_original(self, tmp_path: Path):
+        """Test a failure before the rename leaves the original file intact."""
+        path = tmp_path / "upload_status.json"
+        path.write_bytes(b"original")
+
+        with (
+            patch("webowui.utils.json_io.os.fsync", side_effect=OSError("disk full")),
+            pytest.raises(OSError),
+        ):
+            atomic_write_bytes(path, b"replacement")
+
+        assert path.read_bytes() == b"original"
+        assert not (tmp_path / "upload_status.json.tmp").exists()
@@ -8,7 +8,10 @@ Tests for:
 """
 
 import json
+import os
+import shutil
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -17,7 +20,13 @@ from tests.utils.helpers import (
     create_test_scrape_directory,
     load_json_file,
 )
-from webowui.storage.metadata_tracker import MetadataTracker
+from webowui.storage import metadata_tracker
+from webowui.storage.metadata_tracker import (
+    MetadataTracker,
+    _merge_diff,
+    _sorted_pairs,
+    files_root_hash,
+)
 
 
 @pytest.mark.unit
@@ -114,6 +123,105 @@ class TestMetadataTrackerScrapeTracking:
         assert metadata["scrape"]["timestamp"] == target_timestamp
         assert len(metadata["files"]) == 4
 
+    def test_list_scrapes_skips_non_scrape_entries(self, tmp_outputs_dir: Path):
+        """Test stray files and directories without metadata.json are ignored."""
+        site_name = "test_wiki"
+        create_test_scrape_directory(tmp_outputs_dir, site_name, "2025-11-20_01-00-00", 3)
+        create_test_scrape_directory(tmp_outputs_dir, site_name, "2025-11-20_02-00-00", 3)
+        site_dir = tmp_outputs_dir / site_name
+        (site_dir / "2025-11-20_03-00-00").mkdir()  # scrape in progress
+        (site_dir / "notes.txt").write_text("not a scrape")
+
+        tracker = MetadataTracker(tmp_outputs_dir, site_name)
+        scrapes = tracker.get_all_scrapes()
+
+        assert [s["scrape"]["timestamp"] for s in scrapes] == [
+            "2025-11-20_02-00-00",
+            "2025-11-20_01-00-00",
+        ]
+        assert tracker.get_scrape_by_timestamp("2025-11-20_03-00-00") is None
+
+    def test_metadata_parse_is_cached(self, tmp_outputs_dir: Path):
+        """Test unchanged metadata.json files are parsed only once."""
+        site_name = "test_wiki"
+        create_test_scrape_directory(tmp_outputs_dir, site_name, "2025-11-20_01-00-00", 3)
+        tracker = MetadataTracker(tmp_outputs_dir, site_name)
+
+        with patch(
+            "webowui.storage.metadata_tracker.load_json", wraps=metadata_tracker.load_json
+        ) as mock_load:
+            tracker.get_all_scrapes()
+            tracker.get_all_scrapes()
+            tracker.get_scrape_by_timestamp("2025-11-20_01-00-00")
+
+        assert mock_load.call_count == 1
+
+    def test_metadata_cache_sees_rewrites(self, tmp_outputs_dir: Path):
+        """Test rewriting metadata.json invalidates the cached parse."""
+        site_name = "test_wiki"
+        timestamp = "2025-11-20_01-00-00"
+        scrape_dir = create_test_scrape_directory(tmp_outputs_dir, site_name, timestamp, 3)
+        tracker = MetadataTracker(tmp_outputs_dir, site_name)
+        assert len(tracker.get_scrape_by_timestamp(timestamp)["files"]) == 3
+
+        metadata_file = scrape_dir / "metadata.json"
+        metadata = load_json_file(metadata_file)
+        metadata["files"] = metadata["files"][:1]
+        metadata_file.write_text(json.dumps(metadata))
+
+        assert len(tracker.get_scrape_by_timestamp(timestamp)["files"]) == 1
+
+    def test_metadata_cache_keeps_newest_scrapes(self, tmp_outputs_dir: Path):
+        """Test the cache is per tracker and holds only the newest scrapes."""
+        site_name = "test_wiki"
+        timestamps = [f"2025-11-20_0{hour}-00-00" for hour in range(1, 7)]
+        for timestamp in timestamps:
+            create_test_scrape_directory(tmp_outputs_dir, site_name, timestamp, 1)
+        tracker = MetadataTracker(tmp_outputs_dir, site_name)
+
+        tracker.get_all_scrapes()
+
+        cached = sorted(os.path.basename(d) for d in tracker._metadata_cache)
+        assert cached == timestamps[-metadata_tracker._METADATA_CACHE_SCRAPES :]
+        assert MetadataTracker(tmp_outputs_dir, site_name)._metadata_cache == {}
+
+    def test_metadata_cache_drops_removed_scrapes(self, tmp_outputs_dir: Path):
+        """Test cleanup_old_scrapes and vanished directories evict cached metadata."""
+        site_name = "test_wiki"
+        for hour in range(1, 4):
+            create_test_scrape_directory(tmp_outputs_dir, site_name, f"2025-11-20_0{hour}-00-00", 1)
+        tracker = MetadataTracker(tmp_outputs_dir, site_name)
+        tracker.get_all_scrapes()
+
+        tracker.cleanup_old_scrapes(keep_count=2)
+        assert sorted(os.path.basename(d) for d in tracker._metadata_cache) == [
+            "2025-11-20_02-00-00",
+            "2025-11-20_03-00-00",
+        ]
+
+        shutil.rmtree(tmp_outputs_dir / site_name / "2025-11-20_02-00-00")
+        assert tracker.get_scrape_by_timestamp("2025-11-20_02-00-00") is None
+        assert [os.path.basename(d) for d in tracker._metadata_cache] == ["2025-11-20_03-00-00"]
+
+    def test_cached_metadata_not_shared_between_callers(self, tmp_outputs_dir: Path):
+        """Test callers get their own copy, down to the file entries."""
+        site_name = "test_wiki"
+        timestamp = "2025-11-20_01-00-00"
+        scrape_dir = create_test_scrape_directory(tmp_outputs_dir, site_name, timestamp, 3)
+        tracker = MetadataTracker(tmp_outputs_dir, site_name)
+
+        first = tracker.get_scrape_by_timestamp(timestamp)
+        first["scrape_dir"] = "elsewhere"
+        first["files"][0]["checksum"] = "tampered"
+        first["files"].pop()
+        first["site"]["name"] = "tampered"
+
+        second = tracker.get_scrape_by_timestamp(timestamp)
+        assert second["scrape_dir"] == str(scrape_dir)
+        assert len(second["files"]) == 3
+        assert second["files"][0]["checksum"] != "tampered"
+        assert second["site"]["name"] != "tampered"
+
 
 @pytest.mark.unit
 class TestMetadataTrackerComparison:
@@ -221,6 +329,93 @@ class TestMetadataTrackerComparison:
         assert len(file_urls_1) == 5
         assert len(file_urls_2) == 6
 
+    @staticmethod
+    def _write_scrape(outputs_dir: Path, timestamp: str, files: dict[str, str], root_hash=True):
+        """Write a scrape whose files map url -> checksum."""
+        scrape_dir = outputs_dir / "test_wiki" / timestamp
+        scrape_dir.mkdir(parents=True)
+        entries = [{"url": url, "checksum": checksum} for url, checksum in files.items()]
+        metadata = {"scrape": {"timestamp": timestamp}, "files": entries}
+        if root_hash:
+            metadata["files_root_hash"] = files_root_hash(entries)
+        (scrape_dir / "metadata.json").write_text(json.dumps(metadata))
+
+    @pytest.mark.parametrize("root_hash", [True, False])
+    def test_compare_scrapes_detects_all_change_kinds(self, tmp_outputs_dir: Path, root_hash):
+        """Test added, removed, modified and unchanged URLs are classified."""
+        self._write_scrape(
+            tmp_outputs_dir, "2025-11-20_01-00-00", {"a": "1", "b": "1", "c": "1"}, root_hash
+        )
+        self._write_scrape(
+            tmp_outputs_dir, "2025-11-20_02-00-00", {"b": "1", "c": "2", "d": "1"}, root_hash
+        )
+        tracker = MetadataTracker(tmp_outputs_dir, "test_wiki")
+
+        result = tracker.compare_scrapes("2025-11-20_01-00-00", "2025-11-20_02-00-00")
+
+        assert set(result["changes"]["added"]) == {"d"}
+        assert set(result["changes"]["removed"]) == {"a"}
+        assert set(result["changes"]["modified"]) == {"c"}
+        assert set(result["changes"]["unchanged"]) == {"b"}
+        assert result["old_scrape"]["total_files"] == 3
+        assert result["new_scrape"]["total_files"] == 3
+
+    def test_compare_scrapes_matching_root_hash(self, tmp_outputs_dir: Path):
+        """Test matching root hashes report every file as unchanged."""
+        self._write_scrape(tmp_outputs_dir, "2025-11-20_01-00-00", {"a": "1", "b": "2"})
+        self._write_scrape(tmp_outputs_dir, "2025-11-20_02-00-00", {"b": "2", "a": "1"})
+        tracker = MetadataTracker(tmp_outputs_dir, "test_wiki")
+
+        result = tracker.compare_scrapes("2025-11-20_01-00-00", "2025-11-20_02-00-00")
+
+        assert set(result["changes"]["unchanged"]) == {"a", "b"}
+        assert result["statistics"]["unchanged_count"] == 2
+        assert result["statistics"]["modified_count"] == 0
+
+    def test_merge_diff(self):
+        """Test the merge walk handles interleaved URLs and leftover tails."""
+        old = _sorted_pairs([{"url": u, "checksum": "1"} for u in ["b", "a", "c", "x", "y"]])
+        new = _sorted_pairs(
+            [{"url": "c", "checksum": "2"}, {"url": "a", "checksum": "1"}]
+            + [{"url": u, "checksum": "1"} for u in ["bb", "z"]]
+        )
+
+        added, removed, modified, unchanged = _merge_diff(old, new)
+
+        assert added == ["bb", "z"]
+        assert removed == ["b", "x", "y"]
+        assert modified == ["c"]
+        assert unchanged == ["a"]
+
+    def test_sorted_pairs_collapses_duplicate_urls(self):
+        """Test each URL appears once, with the checksum of its last entry in file order."""
+        files = [
+            {"url": "b", "checksum": "1"},
+            {"url": "a", "checksum": "9"},
+            {"url": "a", "checksum": "2"},
+        ]
+
+        assert _sorted_pairs(files) == [("a", "2"), ("b", "1")]
+
+    def test_get_changed_files_returns_sets(self, tmp_outputs_dir: Path):
+        """Test get_changed_files classifies URLs against the previous scrape."""
+        self._write_scrape(tmp_outputs_dir, "2025-11-20_01-00-00", {"a": "1", "b": "1", "c": "1"})
+        self._write_scrape(tmp_outputs_dir, "2025-11-20_02-00-00", {"b": "1", "c": "2", "d": "1"})
+        tracker = MetadataTracker(tmp_outputs_dir, "test_wiki")
+
+        assert tracker.get_changed_files() == {
+            "added": {"d"},
+            "modified": {"c"},
+            "removed": {"a"},
+        }
+
+    def test_files_root_hash_is_order_independent(self):
+        """Test the root hash depends on the (url, checksum) set only."""
+        files = [{"url": "a", "checksum": "1"}, {"url": "b", "checksum": "2"}]
+
+        assert files_root_hash(files) == files_root_hash(files[::-1])
+        assert files_root_hash(files) != files_root_hash([{"url": "a", "checksum": "1"}])
+
     def test_compare_scrapes_missing_scrape(self, tmp_outputs_dir: Path):
         """Test comparing when one scrape is missing."""
         site_name = "test_wiki"
@@ -447,6 +642,26 @@ class TestMetadataTrackerCleanup:
         assert "2025-11-20_03-00-00" in remaining_timestamps
         assert "2025-11-20_01-00-00" not in remaining_timestamps
 
+    def test_cleanup_continues_after_failure(self, tmp_outputs_dir: Path):
+        """Test one failed removal doesn't stop the others."""
+        site_name = "test_wiki"
+        tracker = MetadataTracker(tmp_outputs_dir, site_name)
+        for hour in range(1, 5):
+            create_test_scrape_directory(tmp_outputs_dir, site_name, f"2025-11-20_0{hour}-00-00", 1)
+
+        real_rmtree = metadata_tracker.shutil.rmtree
+
+        def flaky_rmtree(path):
+            if Path(path).name == "2025-11-20_02-00-00":
+                raise PermissionError("Access denied")
+            real_rmtree(path)
+
+        with patch("webowui.storage.metadata_tracker.shutil.rmtree", side_effect=flaky_rmtree):
+            tracker.cleanup_old_scrapes(keep_count=2)
+
+        remaining = [s["scrape"]["timestamp"] for s in tracker.get_all_scrapes()]
+        assert remaining == ["2025-11-20_04-00-00", "2025-11-20_03-00-00", "2025-11-20_02-00-00"]
+
     def test_cleanup_no_action_needed(self, tmp_outputs_dir: Path):
         """Test cleanup when count is below limit."""
         site_name = "test_wiki"
@@ -11,13 +11,17 @@ Tests the OpenWebUIClient class with mock responses, covering:
 - Error handling and edge cases
 """
 
+import asyncio
+import threading
 from pathlib import Path
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import aiohttp
 import pytest
 from aiohttp import ClientSession
 
-from webowui.uploader.openwebui_client import OpenWebUIClient
+from webowui.uploader.openwebui_client import OpenWebUIClient, _retry_delay
+from webowui.utils.json_io import dumps_json
 
 # ============================================================================
 # Fixtures
@@ -39,6 +43,13 @@ def mock_session():
         yield session
 
 
+@pytest.fixture
+def no_retry_delay():
+    """Skip the backoff sleeps between request retries."""
+    with patch("webowui.uploader.openwebui_client._retry_delay", return_value=0) as mock:
+        yield mock
+
+
 # ============================================================================
 # Initialization Tests
 # ============================================================================
@@ -109,6 +120,60 @@ async def test_test_connection_exception(client, mock_session):
     assert result is False
 
 
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_sessions_encode_json_with_dumps_json(client, mock_session):
+    """Test both shared and per-call sessions serialize json= bodies via dumps_json."""
+    mock_session.get.return_value.__aenter__.return_value = AsyncMock(status=200)
+
+    assert await client.test_connection() is True
+    async with client:
+        pass
+
+    assert aiohttp.ClientSession.call_count == 2
+    for call in aiohttp.ClientSession.call_args_list:
+        assert call.kwargs["json_serialize"] is dumps_json
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_shared_session_reused(client):
+    """Test calls inside `async with client` share one session."""
+    with patch("aiohttp.ClientSession") as mock_cls:
+        session = AsyncMock(spec=ClientSession)
+        mock_cls.return_value.__aenter__.return_value = session
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        session.get.return_value.__aenter__.return_value = mock_response
+
+        async with client:
+            assert await client.test_connection() is True
+            assert await client.verify_file_exists("file-1") is True
+
+        assert mock_cls.call_count == 1
+        assert session.get.call_count == 1
+        assert session.head.call_count == 1
+        mock_cls.return_value.__aexit__.assert_awaited_once()
+    assert client._session is None
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_workflow_opens_shared_session(client, mock_session):
+    """Test multi-request workflows run on a shared session that is closed afterwards."""
+    sessions = []
+
+    async def status(file_id):
+        sessions.append(client._session)
+        return {"status": "completed"}
+
+    with patch.object(client, "get_file_process_status", side_effect=status):
+        await client._wait_for_file_processing(["file-1", "file-2"])
+
+    assert sessions == [mock_session, mock_session]
+    assert client._session is None
+
+
 # ============================================================================
 # Knowledge Base Creation Tests
 # ============================================================================
@@ -215,6 +280,29 @@ async def test_find_knowledge_by_content_single_match(client, mock_session):
     mock_session.get.assert_called_once()
 
 
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_knowledge_list_cached(client, mock_session):
+    """Test knowledge lookups share one listing until a knowledge base is created."""
+    mock_response = AsyncMock()
+    mock_response.status = 200
+    mock_response.json.return_value = [{"id": "kb-1", "name": "Test KB"}]
+    mock_session.get.return_value.__aenter__.return_value = mock_response
+    mock_create_response = AsyncMock()
+    mock_create_response.status = 200
+    mock_create_response.json.return_value = {"id": "kb-2", "name": "New KB"}
+    mock_session.post.return_value.__aenter__.return_value = mock_create_response
+
+    assert await client.find_knowledge_by_content("site", "Test KB") == "kb-1"
+    assert (await client.create_knowledge("Test KB"))["id"] == "kb-1"
+    assert mock_session.get.call_count == 1
+
+    # Creating a new knowledge base drops the cached listing
+    assert (await client.create_knowledge("New KB"))["id"] == "kb-2"
+    assert await client.find_knowledge_by_content("site", "Test KB") == "kb-1"
+    assert mock_session.get.call_count == 2
+
+
 @pytest.mark.unit
 @pytest.mark.asyncio
 async def test_find_knowledge_by_content_multiple_matches(client, mock_session):
@@ -252,6 +340,33 @@ async def test_find_knowledge_by_content_multiple_matches(client, mock_session):
     assert mock_session.get.call_count == 3
 
 
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_find_knowledge_by_content_checks_concurrently(client, mock_session):
+    """Test content checks for duplicate-named KBs overlap and keep listing order."""
+    listing = {"Test KB": [{"id": f"kb-{i}", "name": "Test KB"} for i in range(3)]}
+    in_flight = 0
+    max_in_flight = 0
+
+    async def get_files(kb_id, site_folder=None):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        # kb-1 answers last but still wins over kb-2, as the earlier match
+        await asyncio.sleep(0.03 if kb_id == "kb-1" else 0.01)
+        in_flight -= 1
+        return [] if kb_id == "kb-0" else [{"id": f"{kb_id}-file"}]
+
+    with (
+        patch.object(client, "_list_knowledge", AsyncMock(return_value=listing)),
+        patch.object(client, "get_knowledge_files", side_effect=get_files),
+    ):
+        result = await client.find_knowledge_by_content("site", "Test KB")
+
+    assert result == "kb-1"
+    assert max_in_flight == 3
+
+
 @pytest.mark.unit
 @pytest.mark.asyncio
 async def test_find_knowledge_by_content_no_match(client, mock_session):
@@ -308,6 +423,27 @@ async def test_upload_files_single(client, mock_session, tmp_dir: Path):
     mock_session.post.assert_called_once()
 
 
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_upload_file_streams_from_disk(client, mock_session, tmp_dir: Path):
+    """Test the upload body is the open file, closed once the request is done."""
+    file_path = tmp_dir / "test.md"
+    file_path.write_text("# Test Content")
+
+    mock_response = AsyncMock()
+    mock_response.status = 200
+    mock_response.json.return_value = {"id": "file-123"}
+    mock_session.post.return_value.__aenter__.return_value = mock_response
+
+    with patch("aiohttp.FormData.add_field") as mock_add_field:
+        result = await client._upload_file(mock_session, file_path, "test.md")
+
+    assert result == "file-123"
+    body = mock_add_field.call_args.args[1]
+    assert body.name == str(file_path)
+    assert body.closed
+
+
 @pytest.mark.unit
 @pytest.mark.asyncio
 async def test_upload_files_batch(client, mock_session, tmp_dir: Path):
@@ -333,6 +469,30 @@ async def test_upload_files_batch(client, mock_session, tmp_dir: Path):
     assert mock_session.post.call_count == 3
 
 
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_upload_files_bounded_concurrency(client, mock_session, tmp_dir: Path):
+    """Test uploads are limited to batch_size in flight and reported in input order."""
+    file_paths = [tmp_dir / f"test{i}.md" for i in range(5)]
+    in_flight = 0
+    max_in_flight = 0
+
+    async def upload(session, fp, upload_filename):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        # Later files finish first
+        await asyncio.sleep(0.01 * (5 - int(fp.stem[-1])))
+        in_flight -= 1
+        return f"file-{fp.stem}"
+
+    with patch.object(client, "_upload_file", side_effect=upload):
+        result = await client.upload_files(file_paths, batch_size=2)
+
+    assert max_in_flight == 2
+    assert [r["file_id"] for r in result] == [f"file-test{i}" for i in range(5)]
+
+
 @pytest.mark.unit
 @pytest.mark.asyncio
 async def test_upload_files_empty_list(client):
@@ -345,7 +505,7 @@ async def test_upload_files_empty_list(client):
 
 @pytest.mark.unit
 @pytest.mark.asyncio
-async def test_upload_files_failure(client, mock_session, tmp_dir: Path):
+async def test_upload_files_failure(client, mock_session, no_retry_delay, tmp_dir: Path):
     """Test file upload failure."""
     file_path = tmp_dir / "test.md"
     file_path.write_text("# Test Content")
@@ -359,6 +519,30 @@ async def test_upload_files_failure(client, mock_session, tmp_dir: Path):
     result = await client.upload_files([file_path])
 
     assert len(result) == 0  # No successful results
+    assert mock_session.post.call_count == 1  # The file may have been created: not retried
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_upload_file_retries_only_safe_failures(
+    client, mock_session, no_retry_delay, tmp_dir: Path
+):
+    """Test uploads retry 503s and failed connects, but not a dropped connection."""
+    file_path = tmp_dir / "test.md"
+    file_path.write_text("# Test Content")
+    ok = AsyncMock(status=200)
+    ok.json.return_value = {"id": "file-1"}
+    refused = aiohttp.ClientConnectorError(MagicMock(), OSError("Connection refused"))
+    mock_session.post.return_value.__aenter__.side_effect = [refused, AsyncMock(status=503), ok]
+
+    assert await client._upload_file(mock_session, file_path, "test.md") == "file-1"
+    assert mock_session.post.call_count == 3
+
+    mock_session.post.reset_mock()
+    mock_session.post.return_value.__aenter__.side_effect = aiohttp.ServerDisconnectedError()
+
+    assert await client._upload_file(mock_session, file_path, "test.md") is None
+    assert mock_session.post.call_count == 1
 
 
 # ============================================================================
@@ -435,7 +619,107 @@ async def test_add_files_to_knowledge_batch_exception(client, mock_session):
 
 @pytest.mark.unit
 @pytest.mark.asyncio
-async def test_add_files_individually_partial_success(client, mock_session):
+async def test_add_files_to_knowledge_batch_split_retry(client, mock_session):
+    """Test a rejected batch is retried in halves, isolating the bad file."""
+    batches = []
+
+    async def post_batch(session, knowledge_id, file_ids):
+        batches.append(file_ids)
+        if "file-5" in file_ids:
+            return None, 400, "400 - Invalid file"
+        return {"ok": True}, 200, None
+
+    async def add_single(session, knowledge_id, file_id):
+        return file_id != "file-5"
+
+    single = AsyncMock(side_effect=add_single)
+    file_ids = [f"file-{i}" for i in range(8)]
+    with (
+        patch.object(client, "_post_batch_add", side_effect=post_batch),
+        patch.object(client, "_add_file_to_knowledge", single),
+    ):
+        result = await client.add_files_to_knowledge_batch("kb-123", file_ids)
+
+    assert result["files_added"] == 7
+    assert result["files_failed"] == 1
+    # Full batch, two halves, two quarters; file-4 and file-5 go one by one
+    assert len(batches) == 5
+    assert sorted(call.args[2] for call in single.await_args_list) == ["file-4", "file-5"]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_add_files_to_knowledge_batch_split_is_bounded(client, mock_session):
+    """Test splitting a fully rejected batch keeps the add concurrency limit."""
+    in_flight = 0
+    peak = 0
+
+    async def request(result):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return result
+
+    async def post_batch(session, knowledge_id, file_ids):
+        return await request((None, 400, "400 - Already attached"))
+
+    async def add_single(session, knowledge_id, file_id):
+        return await request(False)
+
+    file_ids = [f"file-{i}" for i in range(64)]
+    with (
+        patch("webowui.uploader.openwebui_client._ADD_FILE_CONCURRENCY", 4),
+        patch.object(client, "_post_batch_add", side_effect=post_batch),
+        patch.object(client, "_add_file_to_knowledge", side_effect=add_single),
+    ):
+        result = await client.add_files_to_knowledge_batch("kb-123", file_ids)
+
+    assert result["files_added"] == 0
+    assert peak <= 4
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_add_files_to_knowledge_batch_server_error_not_split(
+    client, mock_session, no_retry_delay
+):
+    """Test a server error falls back to individual adds once instead of splitting."""
+    batch_failure = AsyncMock(status=502)
+    batch_failure.text.return_value = "Bad Gateway"
+    mock_session.post.return_value.__aenter__.side_effect = [
+        batch_failure,
+        *[AsyncMock(status=200)] * 4,
+    ]
+    file_ids = [f"file-{i}" for i in range(4)]
+
+    result = await client.add_files_to_knowledge_batch("kb-123", file_ids)
+
+    assert result["files_added"] == 4
+    assert mock_session.post.call_count == 5  # 1 batch + 4 individual
+    urls = [call.args[0] for call in mock_session.post.call_args_list]
+    assert sum(url.endswith("/batch/add") for url in urls) == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_add_files_to_knowledge_batch_auth_error_fails_fast(client, mock_session):
+    """Test an auth error is not retried per file or split."""
+    batch_failure = AsyncMock(status=401)
+    batch_failure.text.return_value = "Unauthorized"
+    mock_session.post.return_value.__aenter__.return_value = batch_failure
+
+    result = await client.add_files_to_knowledge_batch("kb-123", ["file-1", "file-2"])
+
+    assert result["success"] is False
+    assert result["files_failed"] == 2
+    mock_session.post.assert_called_once()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_add_files_individually_partial_success(client, mock_session, no_retry_delay):
     """Test individual file addition with partial success."""
     # Setup mock responses
     mock_success = AsyncMock(status=200)
@@ -444,7 +728,7 @@ async def test_add_files_individually_partial_success(client, mock_session):
 
     mock_session.post.return_value.__aenter__.side_effect = [
         mock_success,  # file-1
-        mock_failure,  # file-2
+        *[mock_failure] * 4,  # file-2, every attempt
     ]
 
     result = await client._add_files_individually("kb-123", ["file-1", "file-2"])
@@ -456,7 +740,7 @@ async def test_add_files_individually_partial_success(client, mock_session):
 
 @pytest.mark.unit
 @pytest.mark.asyncio
-async def test_add_files_individually_all_failures(client, mock_session):
+async def test_add_files_individually_all_failures(client, mock_session, no_retry_delay):
     """Test individual file addition with all failures."""
     # Setup mock responses
     mock_failure = AsyncMock(status=500)
@@ -469,6 +753,31 @@ async def test_add_files_individually_all_failures(client, mock_session):
     assert result["success"] is False
     assert result["files_added"] == 0
     assert result["files_failed"] == 2
+    assert mock_session.post.call_count == 8
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_add_files_to_knowledge_bounded_concurrency(client, mock_session):
+    """Test single-file adds run concurrently, capped at the add concurrency limit."""
+    in_flight = 0
+    max_in_flight = 0
+
+    async def add(session, knowledge_id, file_id):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return file_id != "file-3"
+
+    file_ids = [f"file-{i}" for i in range(20)]
+    with patch.object(client, "_add_file_to_knowledge", side_effect=add):
+        result = await client.add_files_to_knowledge("kb-123", file_ids)
+
+    assert max_in_flight == 8
+    assert result["success"] == 19
+    assert result["failed"] == 1
 
 
 @pytest.mark.unit
@@ -496,6 +805,85 @@ async def test_get_knowledge_files(client, mock_session):
     assert args[0] == "http://localhost:8000/api/v1/knowledge/kb-123/files"
 
 
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_get_knowledge_files_site_folder(client, mock_session):
+    """Test site folder filtering on plain and percent-encoded names."""
+    mock_response = AsyncMock()
+    mock_response.status = 200
+    mock_response.json.return_value = {
+        "items": [
+            {"id": "file-1", "meta": {"name": "mysite_page1.md"}},
+            {"id": "file-2", "meta": {"name": "mysite_sub%20dir_page.md"}},
+            {"id": "file-3", "filename": "mysite_page3.md"},
+            {"id": "file-4", "meta": {"name": "other_page.md"}},
+            {"id": "file-5", "meta": None, "filename": "mysite_page5.md"},
+        ]
+    }
+    mock_session.get.return_value.__aenter__.return_value = mock_response
+
+    files = await client.get_knowledge_files("kb-123", site_folder="mysite")
+
+    assert [f["id"] for f in files] == ["file-1", "file-2", "file-3", "file-5"]
+    assert files[1]["decoded_filename"] == "mysite_sub dir_page.md"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_get_knowledge_files_with_hashes(client, mock_session):
+    """Test file details are fetched per file, keeping order and falling back to basic info."""
+    mock_response = AsyncMock()
+    mock_response.status = 200
+    mock_response.json.return_value = {
+        "items": [
+            {"id": "file-1", "filename": "test1.md"},
+            {"filename": "no-id.md"},
+            {"id": "file-2", "filename": "test2.md"},
+        ]
+    }
+    mock_session.get.return_value.__aenter__.return_value = mock_response
+
+    async def details(session, file_id):
+        # file-1 answers last; file-2 has no details
+        if file_id == "file-1":
+            await asyncio.sleep(0.01)
+            return {"id": "file-1", "hash": "abc"}
+        return None
+
+    with patch.object(client, "_get_file_details", side_effect=details):
+        files = await client.get_knowledge_files("kb-123", include_hashes=True)
+
+    assert files == [
+        {"id": "file-1", "hash": "abc"},
+        {"id": "file-2", "filename": "test2.md"},
+    ]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_get_knowledge_files_cached(client, mock_session):
+    """Test repeat lookups reuse the listing until this client changes files."""
+    mock_response = AsyncMock(status=200)
+    mock_response.json.return_value = {"items": [{"id": "file-1", "filename": "test1.md"}]}
+    mock_session.get.return_value.__aenter__.return_value = mock_response
+    mock_session.post.return_value.__aenter__.return_value = AsyncMock(status=200)
+
+    first = await client.get_knowledge_files("kb-123")
+    first.append({"id": "caller-added"})
+    first[0]["decoded_filename"] = "changed.md"
+    assert await client.get_knowledge_files("kb-123") == [{"id": "file-1", "filename": "test1.md"}]
+    assert mock_session.get.call_count == 1
+
+    # A different key, an explicit max_age=0, and a removal all refetch
+    await client.get_knowledge_files("kb-123", site_folder="site")
+    await client.get_knowledge_files("kb-123", max_age=0)
+    assert mock_session.get.call_count == 3
+
+    await client.remove_file_from_knowledge("kb-123", "file-1")
+    await client.get_knowledge_files("kb-123")
+    assert mock_session.get.call_count == 4
+
+
 @pytest.mark.unit
 @pytest.mark.asyncio
 async def test_remove_file_from_knowledge(client, mock_session):
@@ -531,7 +919,7 @@ async def test_remove_file_from_knowledge_404(client, mock_session):
 
 @pytest.mark.unit
 @pytest.mark.asyncio
-async def test_remove_file_from_knowledge_failure(client, mock_session):
+async def test_remove_file_from_knowledge_failure(client, mock_session, no_retry_delay):
     """Test removing file failure."""
     # Setup mock response
     mock_response = AsyncMock()
@@ -542,6 +930,60 @@ async def test_remove_file_from_knowledge_failure(client, mock_session):
     result = await client.remove_file_from_knowledge("kb-1", "file-1")
 
     assert result is False
+    assert mock_session.post.call_count == 4
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_remove_file_from_knowledge_retries_transient_error(
+    client, mock_session, no_retry_delay
+):
+    """Test a transient 503 is retried and the retry's result is used."""
+    mock_session.post.return_value.__aenter__.side_effect = [
+        AsyncMock(status=503),
+        AsyncMock(status=200),
+    ]
+
+    assert await client.remove_file_from_knowledge("kb-1", "file-1") is True
+    assert mock_session.post.call_count == 2
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_add_file_to_knowledge_honours_retry_after(client, mock_session):
+    """Test a 429 waits for its Retry-After before retrying."""
+    rate_limited = AsyncMock(status=429)
+    rate_limited.headers = {"Retry-After": "3"}
+    mock_session.post.return_value.__aenter__.side_effect = [
+        rate_limited,
+        AsyncMock(status=200),
+    ]
+
+    with patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+        assert await client._add_file_to_knowledge(mock_session, "kb-1", "file-1") is True
+
+    mock_sleep.assert_awaited_once_with(3.0)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_add_file_to_knowledge_retries_connection_error(client, mock_session, no_retry_delay):
+    """Test connection errors are retried, and reported once attempts run out."""
+    mock_session.post.return_value.__aenter__.side_effect = aiohttp.ClientConnectionError("reset")
+
+    assert await client._add_file_to_knowledge(mock_session, "kb-1", "file-1") is False
+    assert mock_session.post.call_count == 4
+
+
+@pytest.mark.unit
+def test_retry_delay():
+    """Test backoff grows per attempt, is capped, and defers to Retry-After."""
+    assert 0 <= _retry_delay(1) <= 0.2
+    assert 0 <= _retry_delay(3) <= 0.8
+    assert 0 <= _retry_delay(20) <= 5.0
+    assert _retry_delay(1, "7") == 7.0
+    # HTTP-date Retry-After values fall back to backoff
+    assert _retry_delay(1, "Wed, 21 Oct 2026 07:28:00 GMT") <= 0.2
 
 
 # ============================================================================
@@ -555,7 +997,7 @@ async def test_verify_file_exists_true(client, mock_session):
     """Test verifying that file exists."""
     mock_response = AsyncMock()
     mock_response.status = 200
-    mock_session.get.return_value.__aenter__.return_value = mock_response
+    mock_session.head.return_value.__aenter__.return_value = mock_response
 
     result = await client.verify_file_exists("file-123")
 
@@ -568,13 +1010,28 @@ async def test_verify_file_exists_false(client, mock_session):
     """Test verifying non-existent file."""
     mock_response = AsyncMock()
     mock_response.status = 404
-    mock_session.get.return_value.__aenter__.return_value = mock_response
+    mock_session.head.return_value.__aenter__.return_value = mock_response
 
     result = await client.verify_file_exists("file-123")
 
     assert result is False
 
 
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_verify_file_exists_head_not_allowed(client, mock_session):
+    """Test a server without HEAD support falls back to a ranged GET, once."""
+    mock_session.head.return_value.__aenter__.return_value = AsyncMock(status=405)
+    mock_session.get.return_value.__aenter__.return_value = AsyncMock(status=200)
+
+    assert await client.verify_file_exists("file-1") is True
+    assert await client.verify_file_exists("file-2") is True
+
+    assert mock_session.head.call_count == 1
+    assert mock_session.get.call_count == 2
+    assert mock_session.get.call_args.kwargs["headers"]["Range"] == "bytes=0-0"
+
+
 @pytest.mark.unit
 @pytest.mark.asyncio
 async def test_update_file_content(client, mock_session, tmp_dir: Path):
@@ -596,6 +1053,28 @@ async def test_update_file_content(client, mock_session, tmp_dir: Path):
     assert kwargs["json"]["content"] == "# Updated Content"
 
 
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_update_file_content_reads_off_loop(client, mock_session, tmp_dir: Path):
+    """Test the file is read in the executor, not on the event loop thread."""
+    file_path = tmp_dir / "updated.md"
+    file_path.write_text("# Updated Content")
+    mock_session.post.return_value.__aenter__.return_value = AsyncMock(status=200)
+
+    loop_thread = threading.get_ident()
+    read_threads = []
+    original_read_text = Path.read_text
+
+    def read_text(self, *args, **kwargs):
+        read_threads.append(threading.get_ident())
+        return original_read_text(self, *args, **kwargs)
+
+    with patch.object(Path, "read_text", read_text):
+        assert await client.update_file_content("file-123", file_path) is True
+
+    assert read_threads and loop_thread not in read_threads
+
+
 @pytest.mark.unit
 @pytest.mark.asyncio
 async def test_update_file_content_404(client, mock_session, tmp_dir: Path):
@@ -811,6 +1290,89 @@ async def test_upload_scrape_incrementally_delete(client, mock_session, tmp_dir:
     assert "http://test.com/page" not in result["file_id_map"]
 
 
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_upload_scrape_incrementally_delete_concurrent(client, mock_session, tmp_dir: Path):
+    """Test removals run side by side, capped, and count only successful deletes."""
+    previous_map = {f"http://test.com/page{i}": f"file-{i}" for i in range(25)}
+    in_flight = 0
+    max_in_flight = 0
+
+    async def remove(knowledge_id, file_id):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return file_id != "file-3"
+
+    with (
+        patch.object(client, "get_knowledge_files", AsyncMock(return_value=[])),
+        patch.object(client, "remove_file_from_knowledge", side_effect=remove),
+        patch.object(client, "delete_file", AsyncMock(return_value=True)) as mock_delete,
+        patch.object(client, "reindex_knowledge", AsyncMock(return_value=True)),
+    ):
+        result = await client.upload_scrape_incrementally(
+            scrape_dir=tmp_dir,
+            site_name="test-site",
+            knowledge_name="Test KB",
+            files_to_upload=[],
+            files_to_delete=list(previous_map),
+            previous_file_map=previous_map,
+            knowledge_id="kb-1",
+        )
+
+    assert max_in_flight == 10
+    assert result["files_deleted"] == 24
+    assert mock_delete.await_count == 24
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_upload_scrape_incrementally_verify_concurrent(client, mock_session, tmp_dir: Path):
+    """Test modified files are verified side by side before updating."""
+    files_to_upload = []
+    previous_map = {}
+    for i in range(30):
+        (tmp_dir / f"page{i}.md").write_text(f"# Page {i}")
+        files_to_upload.append({"url": f"http://test.com/page{i}", "filename": f"page{i}.md"})
+        previous_map[f"http://test.com/page{i}"] = f"file-{i}"
+    in_flight = 0
+    max_in_flight = 0
+
+    async def verify(file_id):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return file_id not in ("file-4", "file-7")
+
+    with (
+        patch.object(client, "get_knowledge_files", AsyncMock(return_value=[])),
+        patch.object(client, "verify_file_exists", side_effect=verify),
+        patch.object(client, "upload_files", AsyncMock(return_value=[])) as mock_upload,
+        patch.object(client, "update_file_content", AsyncMock(return_value=True)) as mock_update,
+        patch.object(client, "reindex_knowledge", AsyncMock(return_value=True)),
+    ):
+        result = await client.upload_scrape_incrementally(
+            scrape_dir=tmp_dir,
+            site_name="test-site",
+            knowledge_name="Test KB",
+            files_to_upload=files_to_upload,
+            files_to_delete=[],
+            previous_file_map=previous_map,
+            knowledge_id="kb-1",
+        )
+
+    assert max_in_flight == 20
+    assert result["files_reuploaded"] == 2
+    assert result["files_updated"] == 28
+    reuploaded = mock_upload.call_args.args[0]
+    assert reuploaded == [tmp_dir / "page4.md", tmp_dir / "page7.md"]
+    assert mock_update.await_count == 28
+
+
 @pytest.mark.unit
 @pytest.mark.asyncio
 async def test_upload_scrape_incrementally_cleanup_untracked(client, mock_session, tmp_dir: Path):
@@ -885,9 +1447,9 @@ async def test_upload_scrape_incrementally_verification_fail(client, mock_sessio
 
     mock_session.get.return_value.__aenter__.side_effect = [
         mock_list_kb,  # Check KB
-        mock_verify,  # Verify file (fails)
         mock_status,  # Check status
     ]
+    mock_session.head.return_value.__aenter__.return_value = mock_verify  # Verify file (fails)
     mock_session.post.return_value.__aenter__.side_effect = [
         mock_upload,  # Upload new
         mock_add,  # Add to KB
@@ -970,6 +1532,40 @@ async def test_wait_for_file_processing_timeout(client, mock_session):
     mock_session.get.assert_called()
 
 
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_wait_for_file_processing_polls_concurrently_with_backoff(client):
+    """Test pending files are polled together each round with growing delays."""
+    rounds = {"file-1": ["processing", "processing", "completed"], "file-2": ["completed"]}
+    in_flight = 0
+    peak = 0
+
+    async def status(file_id):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return {"status": rounds[file_id].pop(0)}
+
+    real_sleep = asyncio.sleep
+    delays = []
+
+    async def fake_sleep(delay):
+        if delay:
+            delays.append(delay)
+        await real_sleep(0)
+
+    with (
+        patch.object(client, "get_file_process_status", side_effect=status),
+        patch("asyncio.sleep", side_effect=fake_sleep),
+    ):
+        await client._wait_for_file_processing(["file-1", "file-2"], timeout=60)
+
+    assert peak == 2
+    assert delays == [0.5, 1.0]
+
+
 # ============================================================================
 # State Reconciliation Tests
 # ============================================================================
@@ -1079,12 +1675,24 @@ async def test_match_and_reconcile_no_match(client, mock_session):
     assert len(result["unmatched_local"]) == 1
 
 
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_match_and_reconcile_no_local_files(client, mock_session):
+    """Test matching with no local files skips the remote fetch."""
+    result = await client.match_and_reconcile("kb-1", "site", {"files": []})
+
+    assert result["success"] is True
+    assert result["matched_count"] == 0
+    assert result["confidence"] == "very_low"
+    mock_session.get.assert_not_called()
+
+
 @pytest.mark.unit
 @pytest.mark.asyncio
 async def test_rebuild_state_inline_high_confidence(client, mock_session):
     """Test state rebuild with high confidence match."""
     local_metadata = {
-        "files": [{"url": "http://test.com/1", "filename": "test1.md", "checksum": "hash1"}]
+        "files": [{"url": "http://test.com/1", "filename": "test1.md", "checksum": "hash1-local"}]
     }
 
     # Mock match_and_reconcile success
@@ -1096,21 +1704,23 @@ async def test_rebuild_state_inline_high_confidence(client, mock_session):
             "total_local": 1,
             "match_rate": 1.0,
             "file_id_map": {"http://test.com/1": "file-1"},
+            "remote_filename_map": {
+                "test1.md": {"file_id": "file-1", "hash": "hash1", "filename": "site_test1.md"}
+            },
         }
 
-        # Mock get_knowledge_files for hash lookup
+        # The remote listing comes from match_and_reconcile, not a second fetch
         with patch.object(client, "get_knowledge_files") as mock_get_files:
-            mock_get_files.return_value = [
-                {"id": "file-1", "hash": "hash1", "decoded_filename": "site/test1.md"}
-            ]
-
             result = await client._rebuild_state_inline("kb-1", "site", local_metadata)
 
+            mock_get_files.assert_not_called()
             assert result is not None
             assert result["rebuild_confidence"] == "high"
             assert result["files_uploaded"] == 1
             assert len(result["files"]) == 1
             assert result["files"][0]["file_id"] == "file-1"
+            # Filename match with a different hash takes the remote hash
+            assert result["files"][0]["checksum"] == "hash1"
 
 
 @pytest.mark.unit
@@ -1194,6 +1804,25 @@ async def test_check_state_health_healthy(client, mock_session):
     assert len(result["issues"]) == 0
 
 
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_check_state_health_ignores_null_file_ids(client, mock_session):
+    """Test local entries with a null file_id are not reported as missing remotely."""
+    local_metadata = {
+        "files": [
+            {"file_id": "file-1", "filename": "test1.md"},
+            {"file_id": None, "filename": "test2.md"},
+        ]
+    }
+    remote_files = [{"id": "file-1", "meta": {"name": "site_test1.md"}}]
+
+    with patch.object(client, "get_knowledge_files", return_value=remote_files):
+        result = await client.check_state_health("kb-1", "site", local_metadata)
+
+    assert result["status"] == "healthy"
+    assert result["missing_remote"] == 0
+
+
 @pytest.mark.unit
 @pytest.mark.asyncio
 async def test_check_state_health_missing_local(client, mock_session):
@@ -1337,7 +1966,9 @@ async def test_upload_scrape_to_knowledge_no_files(client, tmp_dir: Path):
 
 @pytest.mark.unit
 @pytest.mark.asyncio
-async def test_upload_scrape_to_knowledge_upload_fail(client, mock_session, tmp_dir: Path):
+async def test_upload_scrape_to_knowledge_upload_fail(
+    client, mock_session, no_retry_delay, tmp_dir: Path
+):
     """Test full upload with file upload failure."""
     file_path = tmp_dir / "test.md"
     file_path.write_text("# Test")
@@ -1422,6 +2053,7 @@ async def test_api_404_handling(client, mock_session):
     """Test handling of 404 API errors."""
     mock_response = AsyncMock(status=404)
     mock_session.get.return_value.__aenter__.return_value = mock_response
+    mock_session.head.return_value.__aenter__.return_value = mock_response
 
     # Should return None/False, not raise exception
     assert await client.get_knowledge_files("kb-1") is None
@@ -8,6 +8,7 @@ Tests for:
 - Checksum calculation
 """
 
+import hashlib
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -17,9 +18,11 @@ import pytest
 
 from tests.utils.helpers import (
     get_file_checksum,
+    load_json_file,
 )
+from webowui.config import SiteConfig
 from webowui.scraper.crawler import CrawlResult
-from webowui.storage.output_manager import OutputManager
+from webowui.storage.output_manager import OutputManager, _slugify_part
 
 
 @pytest.mark.unit
@@ -146,7 +149,7 @@ class TestOutputManagerSaving:
             "webowui.scraper.cleaning_profiles.CleaningProfileRegistry.get_profile"
         ) as mock_get_profile:
             mock_profile = MagicMock()
-            mock_profile.clean.return_value = "# Page 1 Content Cleaned"
+            mock_profile.clean.return_value = "# Page 1 Content Cleaned – café"
             mock_get_profile.return_value = mock_profile
 
             file_info = manager._save_page(result)
@@ -163,6 +166,30 @@ class TestOutputManagerSaving:
             assert "url: https://example.com/page1" in content  # Frontmatter
             assert "# Page 1 Content Cleaned" in content
 
+            # Checksum covers exactly the bytes on disk
+            assert file_info["checksum"] == get_file_checksum(filepath, "sha256")
+            assert file_info["size"] == filepath.stat().st_size
+
+    def test_cleaning_profile_built_once(self, tmp_outputs_dir: Path):
+        """Test the cleaning profile is looked up once per OutputManager."""
+        config = MagicMock()
+        config.name = "test_wiki"
+        config.display_name = "Test Wiki"
+        config.cleaning_profile_name = "none"
+        config.cleaning_profile_config = {}
+
+        manager = OutputManager(config, tmp_outputs_dir)
+
+        with patch(
+            "webowui.scraper.cleaning_profiles.CleaningProfileRegistry.get_profile"
+        ) as mock_get_profile:
+            mock_get_profile.return_value.clean.side_effect = lambda markdown, metadata: markdown
+            for i in range(3):
+                manager.save_page(CrawlResult(f"https://example.com/page{i}", True, "# Page"))
+
+        assert mock_get_profile.call_count == 1
+        assert len(manager.files_saved) == 3
+
     def test_save_page_cleaning_failure(self, tmp_outputs_dir: Path):
         """Test saving page when cleaning fails (should fallback to raw)."""
         config = MagicMock()
@@ -195,6 +222,120 @@ class TestOutputManagerSaving:
             assert "# Page 1 Content" in content
 
 
+@pytest.mark.unit
+class TestOutputManagerIncrementalSave:
+    """Test reuse of unchanged pages from the previous scrape."""
+
+    @staticmethod
+    def _scrape(tmp_outputs_dir: Path, timestamp: str, markdown: str, profile_config=None):
+        """Run one scrape of a single page and move it to the given timestamp."""
+        config = SiteConfig(
+            {
+                "site": {"name": "test_wiki", "display_name": "Test Wiki"},
+                "markdown_cleaning": {"profile": "none", "config": profile_config or {}},
+            },
+            tmp_outputs_dir / "test_wiki.yaml",
+        )
+        manager = OutputManager(config, tmp_outputs_dir)
+        with (
+            patch(
+                "webowui.scraper.cleaning_profiles.CleaningProfileRegistry.get_profile"
+            ) as mock_get_profile,
+            patch("webowui.storage.output_manager.CurrentDirectoryManager"),
+        ):
+            mock_get_profile.return_value.clean.side_effect = lambda md, metadata: md.upper()
+            manager.save_page(CrawlResult("https://example.com/docs/page", True, markdown))
+            manager.finalize_save()
+
+        scrape_dir = manager.output_dir.rename(manager.output_dir.parent / timestamp)
+        return manager.files_saved[0], scrape_dir, mock_get_profile.return_value.clean
+
+    def test_unchanged_page_is_copied(self, tmp_outputs_dir: Path):
+        """Test an unchanged page skips cleaning and keeps its checksum."""
+        first, first_dir, _ = self._scrape(tmp_outputs_dir, "2025-11-20_01-00-00", "# Page")
+        second, second_dir, clean = self._scrape(tmp_outputs_dir, "2025-11-20_02-00-00", "# Page")
+
+        clean.assert_not_called()
+        assert second["checksum"] == first["checksum"]
+        assert second["source_checksum"] == first["source_checksum"]
+        assert (second_dir / second["filepath"]).read_bytes() == (
+            first_dir / first["filepath"]
+        ).read_bytes()
+        assert not (second_dir / second["filepath"]).samefile(first_dir / first["filepath"])
+
+    def test_reused_page_checksum_reflects_recleaned_file(self, tmp_outputs_dir: Path):
+        """Test a reused file rewritten in place by reclean gets a fresh checksum."""
+        first, first_dir, _ = self._scrape(tmp_outputs_dir, "2025-11-20_01-00-00", "# Page")
+        (first_dir / first["filepath"]).write_bytes(b"# RECLEANED PAGE")
+
+        second, second_dir, clean = self._scrape(tmp_outputs_dir, "2025-11-20_02-00-00", "# Page")
+
+        clean.assert_not_called()
+        data = (second_dir / second["filepath"]).read_bytes()
+        assert data == b"# RECLEANED PAGE"
+        assert second["size"] == len(data)
+        assert second["checksum"] == hashlib.sha256(data).hexdigest()
+        assert second["checksum"] != first["checksum"]
+
+    def test_changed_page_is_recleaned(self, tmp_outputs_dir: Path):
+        """Test changed markdown goes through the cleaning profile again."""
+        first, _, _ = self._scrape(tmp_outputs_dir, "2025-11-20_01-00-00", "# Page")
+        second, _, clean = self._scrape(tmp_outputs_dir, "2025-11-20_02-00-00", "# Page v2")
+
+        clean.assert_called_once()
+        assert second["checksum"] != first["checksum"]
+
+    def test_profile_config_change_is_recleaned(self, tmp_outputs_dir: Path):
+        """Test changing the cleaning config invalidates reuse."""
+        self._scrape(tmp_outputs_dir, "2025-11-20_01-00-00", "# Page")
+        _, _, clean = self._scrape(
+            tmp_outputs_dir, "2025-11-20_02-00-00", "# Page", {"remove_nav": True}
+        )
+
+        clean.assert_called_once()
+
+    def test_output_format_change_is_recleaned(self, tmp_outputs_dir: Path):
+        """Test bumping the output format version invalidates reuse."""
+        self._scrape(tmp_outputs_dir, "2025-11-20_01-00-00", "# Page")
+        with patch("webowui.storage.output_manager._OUTPUT_FORMAT_VERSION", 2):
+            _, _, clean = self._scrape(tmp_outputs_dir, "2025-11-20_02-00-00", "# Page")
+
+        clean.assert_called_once()
+
+    def test_source_checksum_covers_cleaning_version(self, tmp_outputs_dir: Path):
+        """Test bumping a profile's CLEANING_VERSION changes the source checksum."""
+        from webowui.scraper.cleaning_profiles.builtin_profiles.none_profile import NoneProfile
+
+        config = SiteConfig(
+            {"site": {"name": "test_wiki"}, "markdown_cleaning": {"profile": "none"}},
+            tmp_outputs_dir / "test_wiki.yaml",
+        )
+        manager = OutputManager(config, tmp_outputs_dir)
+        manager._cleaning_profile = NoneProfile()
+        before = manager._source_checksum("# Page")
+
+        with patch.object(NoneProfile, "CLEANING_VERSION", NoneProfile.CLEANING_VERSION + 1):
+            bumped = OutputManager(config, tmp_outputs_dir)
+            bumped._cleaning_profile = NoneProfile()
+            assert bumped._source_checksum("# Page") != before
+
+    def test_source_checksum_prefix_built_once(self, tmp_outputs_dir: Path):
+        """Test the per-site part of the source checksum is computed once per manager."""
+        config = SiteConfig(
+            {"site": {"name": "test_wiki"}, "markdown_cleaning": {"profile": "none"}},
+            tmp_outputs_dir / "test_wiki.yaml",
+        )
+        manager = OutputManager(config, tmp_outputs_dir)
+
+        with patch.object(manager, "_cleaning_version", return_value=1) as mock_version:
+            first = manager._source_checksum("# Page")
+            second = manager._source_checksum("# Other page")
+            assert manager._source_checksum("# Page") == first
+
+        mock_version.assert_called_once()
+        assert first != second
+
+
 @pytest.mark.unit
 class TestOutputManagerMetadata:
     """Test metadata generation and tracking."""
@@ -280,6 +421,24 @@ class TestOutputManagerFilenameGeneration:
         # Should handle unicode gracefully
         assert "Café" in filename or "Cafe" in filename
 
+    def test_url_to_filename_reuses_slugged_components(self, tmp_outputs_dir: Path):
+        """Test shared path prefixes are slugified once."""
+        config = MagicMock()
+        config.name = "test_wiki"
+        config.cleaning_profile_name = "none"
+        config.cleaning_profile_config = {}
+        manager = OutputManager(config, tmp_outputs_dir)
+        _slugify_part.cache_clear()
+
+        assert manager._url_to_filename("https://example.com/Docs/API/Page_One") == (
+            "docs/api/page-one.md"
+        )
+        assert manager._url_to_filename("https://example.com/Docs/API/Page_Two") == (
+            "docs/api/page-two.md"
+        )
+
+        assert _slugify_part.cache_info().hits == 2
+
 
 @pytest.mark.unit
 class TestOutputManagerContentCleaning:
@@ -492,6 +651,48 @@ class TestOutputManagerReportGeneration:
         assert report["scrape"]["failed_pages"] == 3
         assert len(report["errors"]) == 3
 
+    @patch("webowui.storage.output_manager.CurrentDirectoryManager")
+    def test_finalize_save_writes_metadata_and_report(
+        self, mock_current_manager, tmp_outputs_dir: Path
+    ):
+        """Test finalize_save writes both JSON files."""
+        config = MagicMock()
+        config.name = "test_wiki"
+        config.display_name = "Test Wiki"
+        config.base_url = "https://example.com"
+        config.crawl_strategy = "bfs"
+        config.max_depth = 1
+        config.cleaning_profile_name = "none"
+        config.cleaning_profile_config = {}
+        mock_current_manager.return_value.update_from_scrape.return_value = {}
+
+        manager = OutputManager(config, tmp_outputs_dir)
+        manager.failed_urls.append({"url": "https://example.com/bad", "error": "404"})
+        manager.finalize_save()
+
+        metadata = load_json_file(manager.output_dir / "metadata.json")
+        report = load_json_file(manager.output_dir / "scrape_report.json")
+        assert metadata["site"]["name"] == "test_wiki"
+        assert report["summary"]["failed"] == 1
+
+    def test_finalize_save_propagates_write_errors(self, tmp_outputs_dir: Path):
+        """Test a failed metadata write propagates out of finalize_save."""
+        config = MagicMock()
+        config.name = "test_wiki"
+        config.cleaning_profile_name = "none"
+        config.cleaning_profile_config = {}
+
+        manager = OutputManager(config, tmp_outputs_dir)
+
+        with (
+            patch.object(manager, "_create_metadata_from_state", return_value={}),
+            patch.object(manager, "_create_report_from_state", return_value={}),
+            patch.object(manager, "_save_metadata", side_effect=OSError("disk full")),
+            patch.object(manager, "_save_report"),
+            pytest.raises(OSError),
+        ):
+            manager.finalize_save()
+
 
 @pytest.mark.unit
 class TestOutputManagerFrontmatter:
@@ -0,0 +1,134 @@
+"""
+Unit tests for the reclean utility (webowui/utils/reclean.py).
+
+Tests for:
+- Re-cleaning a single file while keeping its frontmatter
+- Files whose frontmatter is never closed
+- Skipping the write for files cleaning leaves unchanged
+- Re-cleaning every markdown file under a directory
+- Dry runs leaving files untouched
+- Large sweeps running in worker processes
+- Resolving the cleaning profile once per run
+- Finding markdown files directory by directory
+"""
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from webowui.utils import reclean
+from webowui.utils.reclean import reclean_directory, reclean_file
+
+FRONTMATTER = "---\ntitle: Page\n---"
+
+
+@pytest.mark.unit
+class TestReclean:
+    """Test re-cleaning scraped markdown."""
+
+    def test_reclean_file_keeps_frontmatter(self, tmp_path):
+        """Test the body is cleaned and written back under the original frontmatter."""
+        path = tmp_path / "page.md"
+        path.write_text(f"{FRONTMATTER}\nline one\n\nline two\n", encoding="utf-8")
+
+        before, after = reclean_file(path, "none")
+
+        content = path.read_text(encoding="utf-8")
+        assert content.startswith(FRONTMATTER + "\n\n")
+        assert "line one" in content
+        assert after == 2
+
+    def test_reclean_file_skips_unchanged_write(self, tmp_path):
+        """Test an already-clean file is not rewritten."""
+        path = tmp_path / "page.md"
+        path.write_text(f"{FRONTMATTER}\n\nClean body", encoding="utf-8")
+
+        with patch.object(Path, "write_text") as mock_write:
+            before, after = reclean_file(path, "mediawiki")
+
+        mock_write.assert_not_called()
+        assert (before, after) == (0, 1)
+
+    def test_reclean_directory_processes_all_files(self, tmp_path, capsys):
+        """Test every nested markdown file is re-cleaned, beyond one window of workers."""
+        count = reclean._RECLEAN_CONCURRENCY + 5
+        for i in range(count):
+            sub = tmp_path / f"dir{i % 3}"
+            sub.mkdir(exist_ok=True)
+            (sub / f"page{i}.md").write_text(f"{FRONTMATTER}\nbody {i}\n", encoding="utf-8")
+
+        with patch.object(reclean, "reclean_file", wraps=reclean_file) as mock_reclean:
+            reclean_directory(tmp_path, "none")
+
+        out = capsys.readouterr().out
+        assert mock_reclean.call_count == count
+        assert out.count("lines (no change)") == count
+        assert f"After: {count} lines" in out
+
+    def test_reclean_directory_dry_run_leaves_files(self, tmp_path, capsys):
+        """Test a dry run reports line counts without rewriting anything."""
+        original = f"{FRONTMATTER}\nbody\n"
+        path = tmp_path / "page.md"
+        path.write_text(original, encoding="utf-8")
+
+        reclean_directory(tmp_path, "none", dry_run=True)
+
+        assert path.read_text(encoding="utf-8") == original
+        assert "Dry run" in capsys.readouterr().out
+
+    def test_reclean_directory_uses_process_pool_for_large_sweeps(self, tmp_path):
+        """Test sweeps at the size threshold are cleaned in worker processes."""
+        paths = []
+        for i in range(3):
+            path = tmp_path / f"page{i}.md"
+            path.write_text(f"{FRONTMATTER}\nbody {i}\n", encoding="utf-8")
+            paths.append(path)
+
+        with (
+            patch.object(reclean, "_PROCESS_POOL_MIN_FILES", 3),
+            patch.object(reclean, "ProcessPoolExecutor", wraps=reclean.ProcessPoolExecutor) as pool,
+        ):
+            reclean_directory(tmp_path, "none")
+
+        pool.assert_called_once()
+        for i, path in enumerate(paths):
+            assert path.read_text(encoding="utf-8") == f"{FRONTMATTER}\n\n\nbody {i}\n"
+
+    def test_unknown_profile_resolved_once(self, tmp_path, capsys):
+        """Test an unknown profile falls back to mediawiki with a single warning."""
+        for i in range(3):
+            (tmp_path / f"page{i}.md").write_text(f"{FRONTMATTER}\nbody\n", encoding="utf-8")
+        reclean._get_profile.cache_clear()
+
+        with patch.object(
+            reclean.CleaningProfileRegistry,
+            "get_profile",
+            wraps=reclean.CleaningProfileRegistry.get_profile,
+        ) as get_profile:
+            reclean_directory(tmp_path, "no-such-profile")
+
+        get_profile.assert_called_once_with("mediawiki")
+        assert capsys.readouterr().out.count("Profile 'no-such-profile' not found") == 1
+
+    def test_reclean_file_without_closing_frontmatter(self, tmp_path):
+        """Test an unterminated frontmatter block is treated as body."""
+        path = tmp_path / "page.md"
+        path.write_text("---\ntitle: Page\nbody\n", encoding="utf-8")
+
+        reclean_file(path, "none")
+
+        assert path.read_text(encoding="utf-8") == "\n\n---\ntitle: Page\nbody\n"
+
+    def test_iter_markdown_groups_by_directory(self, tmp_path):
+        """Test markdown files are found recursively, one directory at a time."""
+        (tmp_path / "a").mkdir()
+        (tmp_path / "a-b").mkdir()
+        for name in ["z.md", "a/y.md", "a/x.md", "a-b/w.md", "notes.txt", "a/skip.json"]:
+            (tmp_path / name).write_text("x", encoding="utf-8")
+
+        found = [
+            Path(p).relative_to(tmp_path).as_posix() for p in reclean._iter_markdown(str(tmp_path))
+        ]
+
+        assert found == ["z.md", "a/x.md", "a/y.md", "a-b/w.md"]
@@ -8,7 +8,9 @@ Tests for:
 - Status reporting and recommendations
 """
 
+import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from unittest.mock import patch
 
@@ -230,6 +232,34 @@ class TestRetentionPolicies:
         # Verify 04 was deleted (sacrificed for source)
         assert not (site_dir / "2025-11-20_04-00-00").exists()
 
+    @pytest.mark.parametrize(
+        "keep_backups,kept,deleted",
+        [
+            (0, ["02"], ["05", "04", "03", "01"]),
+            (2, ["05", "02"], ["04", "03", "01"]),
+            (4, ["05", "04", "03", "02"], ["01"]),
+        ],
+    )
+    def test_apply_retention_source_partition(
+        self, tmp_outputs_dir: Path, keep_backups, kept, deleted
+    ):
+        """Test the current/ source replaces the oldest kept backup."""
+        site_name = "test_wiki"
+        for hour in range(1, 6):
+            create_test_scrape_directory(tmp_outputs_dir, site_name, f"2025-11-20_0{hour}-00-00", 1)
+        current_dir = tmp_outputs_dir / site_name / "current"
+        current_dir.mkdir()
+        save_json_file(
+            current_dir / "metadata.json",
+            {"current_state": {"source_timestamp": "2025-11-20_02-00-00"}},
+        )
+        manager = RetentionManager(tmp_outputs_dir / site_name, keep_backups=keep_backups)
+
+        result = manager.apply_retention(dry_run=True)
+
+        assert result["kept_timestamps"] == [f"2025-11-20_{h}-00-00" for h in kept]
+        assert result["deleted_timestamps"] == [f"2025-11-20_{h}-00-00" for h in deleted]
+
     def test_apply_retention_zero_backups(self, tmp_outputs_dir: Path):
         """Test with keep_backups=0 (only current)."""
         site_name = "test_wiki"
@@ -307,6 +337,37 @@ class TestRetentionStatusAndReporting:
         assert status["status"] == "needs_cleanup"
         assert "Run cleanup" in status["recommendation"]
 
+    def test_apply_retention_skip_current_source(self, tmp_outputs_dir: Path):
+        """Test the no-op path can skip reading current/ metadata."""
+        site_name = "test_wiki"
+        create_test_scrape_directory(tmp_outputs_dir, site_name, "2025-11-20_01-00-00", 1)
+        manager = RetentionManager(tmp_outputs_dir / site_name, keep_backups=2)
+
+        with patch.object(manager, "get_current_source") as mock_source:
+            result = manager.apply_retention(include_current_source=False)
+
+        mock_source.assert_not_called()
+        assert result["action"] == "none"
+        assert result["current_source"] is None
+
+    def test_retention_reuses_caller_listing(self, tmp_outputs_dir: Path):
+        """Test status and plan can share one listing passed in by the caller."""
+        site_name = "test_wiki"
+        for hour in range(1, 5):
+            create_test_scrape_directory(tmp_outputs_dir, site_name, f"2025-11-20_0{hour}-00-00", 1)
+        manager = RetentionManager(tmp_outputs_dir / site_name, keep_backups=2)
+        expected_status = manager.get_retention_status()
+        expected_plan = manager.apply_retention(dry_run=True)
+        scrapes = manager.get_scrape_directories()
+
+        with patch.object(manager, "get_scrape_directories") as mock_list:
+            status = manager.get_retention_status(scrapes=scrapes)
+            plan = manager.apply_retention(dry_run=True, scrapes=scrapes)
+
+        mock_list.assert_not_called()
+        assert status == expected_status
+        assert plan == expected_plan
+
     def test_get_retention_status_clean(self, tmp_outputs_dir: Path):
         """Test status when no cleanup is needed."""
         site_name = "test_wiki"
@@ -323,6 +384,52 @@ class TestRetentionStatusAndReporting:
         assert status["status"] == "clean"
         assert "No cleanup needed" in status["recommendation"]
 
+    def test_retention_status_counts_all_files(self, tmp_outputs_dir: Path):
+        """Test a backup's size covers every file in it and leaves the backup untouched."""
+        site_name = "test_wiki"
+        scrape_dir = create_test_scrape_directory(
+            tmp_outputs_dir, site_name, "2025-11-20_01-00-00", 2
+        )
+        (scrape_dir / "upload_status.json").write_text("{}")
+        expected = sum(f.stat().st_size for f in scrape_dir.rglob("*") if f.is_file())
+        metadata_before = (scrape_dir / "metadata.json").stat()
+        manager = RetentionManager(tmp_outputs_dir / site_name, keep_backups=2)
+
+        status = manager.get_retention_status()
+
+        assert status["total_size_mb"] * 1024 * 1024 == pytest.approx(expected)
+        metadata_after = (scrape_dir / "metadata.json").stat()
+        assert metadata_after.st_mtime_ns == metadata_before.st_mtime_ns
+        assert metadata_after.st_size == metadata_before.st_size
+
+    def test_retention_status_sizes_in_parallel(self, tmp_outputs_dir: Path):
+        """Test several backups are measured together and all counted."""
+        site_name = "test_wiki"
+        for hour in range(1, 5):
+            create_test_scrape_directory(tmp_outputs_dir, site_name, f"2025-11-20_0{hour}-00-00", 1)
+        manager = RetentionManager(tmp_outputs_dir / site_name, keep_backups=2)
+
+        with (
+            patch(
+                "webowui.storage.retention_manager.ThreadPoolExecutor", wraps=ThreadPoolExecutor
+            ) as mock_pool,
+            patch.object(manager, "_walk_size", return_value=1024 * 1024),
+        ):
+            status = manager.get_retention_status()
+
+        mock_pool.assert_called_once_with(max_workers=4)
+        assert status["total_size_mb"] == 4
+
+    def test_retention_status_size_without_metadata(self, tmp_outputs_dir: Path):
+        """Test backups without metadata.json are still measured."""
+        site_name = "test_wiki"
+        scrape_dir = tmp_outputs_dir / site_name / "2025-11-20_01-00-00" / "content"
+        scrape_dir.mkdir(parents=True)
+        (scrape_dir / "page.md").write_text("x" * 100)
+        manager = RetentionManager(tmp_outputs_dir / site_name, keep_backups=2)
+
+        assert manager._walk_size(scrape_dir.parent) == 100
+
     def test_get_scrape_directories(self, tmp_outputs_dir: Path):
         """Test listing scrape directories."""
         site_name = "test_wiki"
@@ -439,6 +546,25 @@ class TestRetentionStatusAndReporting:
         assert (site_dir / "2025-11-20_01-00-00").exists()  # Failed to delete
         assert not (site_dir / "2025-11-20_02-00-00").exists()  # Deleted
 
+    @pytest.mark.parametrize("async_delete", [True, False])
+    def test_apply_retention_delete_modes(self, tmp_outputs_dir: Path, async_delete):
+        """Test parallel and serial deletion report the same result."""
+        site_name = "test_wiki"
+        for hour in range(1, 6):
+            create_test_scrape_directory(tmp_outputs_dir, site_name, f"2025-11-20_0{hour}-00-00", 1)
+        site_dir = tmp_outputs_dir / site_name
+        manager = RetentionManager(site_dir, keep_backups=1, async_delete=async_delete)
+
+        result = manager.apply_retention(dry_run=False)
+
+        assert result["deleted_timestamps"] == [
+            "2025-11-20_04-00-00",
+            "2025-11-20_03-00-00",
+            "2025-11-20_02-00-00",
+            "2025-11-20_01-00-00",
+        ]
+        assert [d.name for d in site_dir.iterdir()] == ["2025-11-20_05-00-00"]
+
     def test_get_retention_status_size_error(self, tmp_outputs_dir: Path):
         """Test get_retention_status handles size calculation errors."""
         site_name = "test_wiki"
@@ -447,18 +573,18 @@ class TestRetentionStatusAndReporting:
         site_dir = tmp_outputs_dir / site_name
         manager = RetentionManager(site_dir, keep_backups=2)
 
-        # Let's try patching Path.stat but only raising for specific path
-        original_stat = Path.stat
+        # Let's try patching os.scandir but only raising for specific path
+        original_scandir = os.scandir
 
-        def side_effect(self, *args, **kwargs):
-            # Raise for any file inside the content directory
-            # This avoids raising for the scrape directory itself (checked by is_dir)
-            if "content" in str(self):
+        def side_effect(path):
+            # Raise when walking into the content directory
+            # This avoids raising for the site directory listing itself
+            if "content" in str(path):
                 raise PermissionError("Access denied")
-            return original_stat(self, *args, **kwargs)
+            return original_scandir(path)
 
         with (
-            patch("pathlib.Path.stat", side_effect=side_effect, autospec=True),
+            patch("webowui.storage.retention_manager.os.scandir", side_effect=side_effect),
             patch("webowui.storage.retention_manager.logger") as mock_logger,
         ):
             status = manager.get_retention_status()
@@ -567,6 +693,16 @@ class TestRetentionEdgeCases:
         # Real directory should be found
         assert len(scrape_dirs) >= 1
 
+    def test_retention_skips_symlinked_dirs(self, tmp_outputs_dir: Path):
+        """Test symlinks to directories are not treated as backups."""
+        site_name = "test_wiki"
+        real = create_test_scrape_directory(tmp_outputs_dir, site_name, "2025-11-20_01-00-00", 1)
+        (tmp_outputs_dir / site_name / "2025-11-20_02-00-00").symlink_to(real)
+
+        manager = RetentionManager(tmp_outputs_dir / site_name, keep_backups=2)
+
+        assert [d.name for d in manager.get_scrape_directories()] == ["2025-11-20_01-00-00"]
+
     def test_retention_site_dir_not_exists(self, tmp_outputs_dir: Path):
         """Test behavior when site directory does not exist."""
         site_name = "non_existent_wiki"
@@ -590,6 +726,8 @@ class TestRetentionEdgeCases:
         (site_dir / "not_a_timestamp").mkdir()
         (site_dir / "2025-11-20").mkdir()  # Missing time
         (site_dir / "2025-11-20_01-00").mkdir()  # Incomplete time
+        (site_dir / "draft-copy-old_a-b-c").mkdir()  # Right shape, not digits
+        (site_dir / "2025-11-20_01-00-00-old").mkdir()  # Trailing suffix
 
         manager = RetentionManager(site_dir, keep_backups=2)
         scrape_dirs = manager.get_scrape_directories()
@@ -699,6 +837,34 @@ class TestRetentionDirectoryManagement:
         # (Actual count depends on implementation)
         assert len(scrape_dirs) >= 1
 
+    def test_directory_listing_not_keyed_on_mtime(self, tmp_outputs_dir: Path):
+        """Test a scrape added within the same mtime tick is still listed."""
+        site_name = "test_wiki"
+        create_test_scrape_directory(tmp_outputs_dir, site_name, "2025-11-20_01-00-00", 1)
+        site_dir = tmp_outputs_dir / site_name
+        manager = RetentionManager(site_dir, keep_backups=2)
+        before = site_dir.stat()
+        manager.get_scrape_directories()
+
+        create_test_scrape_directory(tmp_outputs_dir, site_name, "2025-11-20_02-00-00", 1)
+        os.utime(site_dir, ns=(before.st_atime_ns, before.st_mtime_ns))
+
+        assert [d.name for d in manager.get_scrape_directories()] == [
+            "2025-11-20_02-00-00",
+            "2025-11-20_01-00-00",
+        ]
+
+    def test_directory_listing_refreshed_after_retention(self, tmp_outputs_dir: Path):
+        """Test apply_retention's deletions are reflected in the next listing."""
+        site_name = "test_wiki"
+        for hour in range(1, 4):
+            create_test_scrape_directory(tmp_outputs_dir, site_name, f"2025-11-20_0{hour}-00-00", 1)
+        manager = RetentionManager(tmp_outputs_dir / site_name, keep_backups=1)
+
+        manager.apply_retention()
+
+        assert [d.name for d in manager.get_scrape_directories()] == ["2025-11-20_03-00-00"]
+
 
 @pytest.mark.unit
 class TestRetentionMetadata:
@@ -662,3 +662,81 @@ class TestStateInfo:
         has_state = state_mgr.has_upload_state()
 
         assert has_state is False
+
+
+@pytest.mark.unit
+class TestSyncState:
+    """Test sync_state method."""
+
+    @pytest.mark.asyncio
+    async def test_sync_state_computes_differences(
+        self, tmp_outputs_dir: Path, mock_openwebui_client
+    ):
+        """Test in-sync, missing and extra file ids are computed correctly."""
+        site_name = "test_wiki"
+        current_dir = tmp_outputs_dir / site_name / "current"
+        current_dir.mkdir(parents=True)
+
+        upload_status = {
+            "site_name": site_name,
+            "knowledge_id": "kb-123",
+            "files": [
+                {"url": "https://example.com/a", "file_id": "file-1"},
+                {"url": "https://example.com/b", "file_id": "file-2"},
+                {"url": "https://example.com/c"},  # Never uploaded
+            ],
+        }
+        save_json_file(current_dir / "upload_status.json", upload_status)
+
+        mock_openwebui_client.get_knowledge_files = AsyncMock(
+            return_value=[{"id": "file-1"}, {"id": "file-3"}]
+        )
+
+        current_manager = CurrentDirectoryManager(tmp_outputs_dir, site_name)
+        state_mgr = StateManager(current_manager, mock_openwebui_client)
+
+        result = await state_mgr.sync_state(site_name)
+
+        assert result["success"] is True
+        assert result["local_count"] == 2
+        assert result["remote_count"] == 2
+        assert result["in_sync_count"] == 1
+        assert result["missing_remote"] == ["file-2"]
+        assert result["extra_remote"] == ["file-3"]
+        assert result["fixed_count"] == 0
+        assert "local_file_map" not in result
+
+    @pytest.mark.asyncio
+    async def test_sync_state_include_details(self, tmp_outputs_dir: Path, mock_openwebui_client):
+        """Test local_file_map is only built when details are requested."""
+        site_name = "test_wiki"
+        current_dir = tmp_outputs_dir / site_name / "current"
+        current_dir.mkdir(parents=True)
+
+        upload_status = {
+            "site_name": site_name,
+            "knowledge_id": "kb-123",
+            "files": [{"url": "https://example.com/a", "filename": "a.md", "file_id": "file-1"}],
+        }
+        save_json_file(current_dir / "upload_status.json", upload_status)
+
+        mock_openwebui_client.get_knowledge_files = AsyncMock(return_value=[])
+
+        current_manager = CurrentDirectoryManager(tmp_outputs_dir, site_name)
+        state_mgr = StateManager(current_manager, mock_openwebui_client)
+
+        result = await state_mgr.sync_state(site_name, include_details=True)
+
+        assert result["missing_remote"] == ["file-1"]
+        assert result["local_file_map"]["file-1"]["filename"] == "a.md"
+
+    @pytest.mark.asyncio
+    async def test_sync_state_no_upload_status(self, tmp_outputs_dir: Path, mock_openwebui_client):
+        """Test sync fails cleanly without local upload state."""
+        current_manager = CurrentDirectoryManager(tmp_outputs_dir, "test_wiki")
+        state_mgr = StateManager(current_manager, mock_openwebui_client)
+
+        result = await state_mgr.sync_state("test_wiki")
+
+        assert result["success"] is False
+        assert "No upload status" in result["error"]
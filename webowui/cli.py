@@ -115,7 +115,7 @@ async def _scrape_site(site_config: SiteConfig, do_upload: bool = False):
         retention_mgr = RetentionManager(site_dir, site_config.retention_keep_backups)
 
         logger.info("Running retention cleanup...")
-        result = retention_mgr.apply_retention(dry_run=False)
+        result = retention_mgr.apply_retention(dry_run=False, include_current_source=False)
 
         if result["deleted"] > 0:
             console.print(f"\n[yellow]Retention:[/yellow] Deleted {result['deleted']} old backups")
@@ -305,129 +305,132 @@ async def _upload_scrape(
 
     # Create client and upload
     client = OpenWebUIClient(app_config.openwebui_base_url, app_config.openwebui_api_key)
+    # One pooled session for every request this command makes
+    async with client:
+        # Test connection
+        connected = await client.test_connection()
+        if not connected:
+            console.print("[red]Failed to connect to OpenWebUI API[/red]")
+            raise UploadError("Failed to connect to OpenWebUI API")
+
+        # Use StateManager for clean state detection and auto-rebuild
+        if from_timestamp is None:
+            state_manager = StateManager(current_manager, client)
+
+            needs_rebuild, effective_knowledge_id, rebuilt_status = (
+                await state_manager.detect_state_status(
+                    incremental,
+                    previous_file_map,
+                    knowledge_id,
+                    site_name,
+                    knowledge_name,
+                    min_confidence="medium",
+                )
+            )
 
-    # Test connection
-    connected = await client.test_connection()
-    if not connected:
-        console.print("[red]Failed to connect to OpenWebUI API[/red]")
-        raise UploadError("Failed to connect to OpenWebUI API")
+            if needs_rebuild:
+                if effective_knowledge_id and rebuilt_status:
+                    # Rebuild succeeded
+                    console.print(
+                        f"[green]✓ State rebuilt successfully ({rebuilt_status['files_uploaded']} files matched)[/green]\n"
+                    )
 
-    # Use StateManager for clean state detection and auto-rebuild
-    if from_timestamp is None:
-        state_manager = StateManager(current_manager, client)
+                    # Re-get upload info with rebuilt state
+                    upload_info = current_manager.get_files_for_upload(incremental=incremental)
+                    files_to_upload = cast(list[dict], upload_info.get("upload", []))
+                    files_to_delete = upload_info.get("delete", [])
+                    previous_file_map = upload_info.get("previous_file_map", {})
+                    knowledge_id = effective_knowledge_id
+                else:
+                    # Rebuild failed or no knowledge_id found
+                    if not effective_knowledge_id:
+                        console.print(
+                            "\n[yellow]⚠ No upload state found - unable to find existing knowledge base[/yellow]"
+                        )
+                    else:
+                        console.print(
+                            "\n[yellow]⚠ Auto-rebuild failed - proceeding with full upload[/yellow]"
+                        )
+                    console.print()
+
+        # Display what we're uploading to
+        if knowledge_id:
+            console.print(f"\n[blue]Uploading to existing knowledge (ID: {knowledge_id})...[/blue]")
+        else:
+            console.print(f"\n[blue]Uploading to knowledge: {knowledge_name}[/blue]")
 
-        needs_rebuild, effective_knowledge_id, rebuilt_status = (
-            await state_manager.detect_state_status(
-                incremental,
+        # Perform upload - use optimized incremental upload if available
+        if incremental:
+            # Ensure files_to_upload is not None (convert to empty list if needed)
+            safe_files_to_upload = files_to_upload if files_to_upload is not None else []
+
+            result = await client.upload_scrape_incrementally(
+                content_dir,
+                site_name,
+                knowledge_name,
+                safe_files_to_upload,
+                files_to_delete,
                 previous_file_map,
-                knowledge_id,
+                knowledge_description,
+                batch_size=10,
+                knowledge_id=knowledge_id,
+                keep_files=keep_files,
+                cleanup_untracked=cleanup_untracked,
+            )
+        else:
+            # Full upload - upload all files
+            result = await client.upload_scrape_to_knowledge(
+                content_dir,
                 site_name,
                 knowledge_name,
-                min_confidence="medium",
+                knowledge_description,
+                batch_size=10,
+                knowledge_id=knowledge_id,
+                specific_files=(
+                    [content_dir / f["filename"] for f in files_to_upload]
+                    if files_to_upload
+                    else None
+                ),
             )
-        )
 
-        if needs_rebuild:
-            if effective_knowledge_id and rebuilt_status:
-                # Rebuild succeeded
+        if "error" in result:
+            console.print(f"[red]Upload failed: {result['error']}[/red]")
+            raise UploadError(f"Upload failed: {result['error']}")
+
+        # Save upload status
+        if from_timestamp:
+            # Save to timestamp directory
+            tracker = MetadataTracker(app_config.outputs_dir, site_name)
+            tracker.save_upload_status(from_timestamp, result)
+        else:
+            # Save to current/ directory (StateManager already saved rebuild metadata if applicable)
+            current_manager = CurrentDirectoryManager(app_config.outputs_dir, site_name)
+            current_manager.save_upload_status(result)
+
+        # Print results
+        console.print("\n[green]✓ Upload complete![/green]")
+        console.print(f"  Source: {upload_source}")
+        console.print(f"  Knowledge: {result['knowledge_name']}")
+        console.print(f"  Knowledge ID: {result['knowledge_id']}")
+
+        # Display stats based on upload type
+        if "files_updated" in result:
+            # Incremental upload stats
+            console.print(f"  Files uploaded: {result.get('files_uploaded', 0)}")
+            console.print(f"  Files updated: {result.get('files_updated', 0)}")
+            console.print(f"  Files deleted: {result.get('files_deleted', 0)}")
+            if result.get("files_reuploaded", 0) > 0:
                 console.print(
-                    f"[green]✓ State rebuilt successfully ({rebuilt_status['files_uploaded']} files matched)[/green]\n"
+                    f"  Files re-uploaded: {result.get('files_reuploaded', 0)} [yellow](externally deleted)[/yellow]"
                 )
-
-                # Re-get upload info with rebuilt state
-                upload_info = current_manager.get_files_for_upload(incremental=incremental)
-                files_to_upload = cast(list[dict], upload_info.get("upload", []))
-                files_to_delete = upload_info.get("delete", [])
-                previous_file_map = upload_info.get("previous_file_map", {})
-                knowledge_id = effective_knowledge_id
-            else:
-                # Rebuild failed or no knowledge_id found
-                if not effective_knowledge_id:
-                    console.print(
-                        "\n[yellow]⚠ No upload state found - unable to find existing knowledge base[/yellow]"
-                    )
-                else:
-                    console.print(
-                        "\n[yellow]⚠ Auto-rebuild failed - proceeding with full upload[/yellow]"
-                    )
-                console.print()
-
-    # Display what we're uploading to
-    if knowledge_id:
-        console.print(f"\n[blue]Uploading to existing knowledge (ID: {knowledge_id})...[/blue]")
-    else:
-        console.print(f"\n[blue]Uploading to knowledge: {knowledge_name}[/blue]")
-
-    # Perform upload - use optimized incremental upload if available
-    if incremental:
-        # Ensure files_to_upload is not None (convert to empty list if needed)
-        safe_files_to_upload = files_to_upload if files_to_upload is not None else []
-
-        result = await client.upload_scrape_incrementally(
-            content_dir,
-            site_name,
-            knowledge_name,
-            safe_files_to_upload,
-            files_to_delete,
-            previous_file_map,
-            knowledge_description,
-            batch_size=10,
-            knowledge_id=knowledge_id,
-            keep_files=keep_files,
-            cleanup_untracked=cleanup_untracked,
-        )
-    else:
-        # Full upload - upload all files
-        result = await client.upload_scrape_to_knowledge(
-            content_dir,
-            site_name,
-            knowledge_name,
-            knowledge_description,
-            batch_size=10,
-            knowledge_id=knowledge_id,
-            specific_files=(
-                [content_dir / f["filename"] for f in files_to_upload] if files_to_upload else None
-            ),
-        )
-
-    if "error" in result:
-        console.print(f"[red]Upload failed: {result['error']}[/red]")
-        raise UploadError(f"Upload failed: {result['error']}")
-
-    # Save upload status
-    if from_timestamp:
-        # Save to timestamp directory
-        tracker = MetadataTracker(app_config.outputs_dir, site_name)
-        tracker.save_upload_status(from_timestamp, result)
-    else:
-        # Save to current/ directory (StateManager already saved rebuild metadata if applicable)
-        current_manager = CurrentDirectoryManager(app_config.outputs_dir, site_name)
-        current_manager.save_upload_status(result)
-
-    # Print results
-    console.print("\n[green]✓ Upload complete![/green]")
-    console.print(f"  Source: {upload_source}")
-    console.print(f"  Knowledge: {result['knowledge_name']}")
-    console.print(f"  Knowledge ID: {result['knowledge_id']}")
-
-    # Display stats based on upload type
-    if "files_updated" in result:
-        # Incremental upload stats
-        console.print(f"  Files uploaded: {result.get('files_uploaded', 0)}")
-        console.print(f"  Files updated: {result.get('files_updated', 0)}")
-        console.print(f"  Files deleted: {result.get('files_deleted', 0)}")
-        if result.get("files_reuploaded", 0) > 0:
-            console.print(
-                f"  Files re-uploaded: {result.get('files_reuploaded', 0)} [yellow](externally deleted)[/yellow]"
-            )
-        if result.get("files_deleted_untracked", 0) > 0:
-            console.print(
-                f"  Files cleaned up: {result.get('files_deleted_untracked', 0)} [dim](untracked in folder)[/dim]"
-            )
-    else:
-        # Full upload stats
-        console.print(f"  Files uploaded: {result.get('files_uploaded', 0)}")
-        console.print(f"  Files in knowledge: {result.get('files_added_to_knowledge', 0)}")
+            if result.get("files_deleted_untracked", 0) > 0:
+                console.print(
+                    f"  Files cleaned up: {result.get('files_deleted_untracked', 0)} [dim](untracked in folder)[/dim]"
+                )
+        else:
+            # Full upload stats
+            console.print(f"  Files uploaded: {result.get('files_uploaded', 0)}")
+            console.print(f"  Files in knowledge: {result.get('files_added_to_knowledge', 0)}")
 
 
 @cli.command(name="list")
@@ -698,7 +701,8 @@ def clean(site, clean_all, keep):
 @click.option("--site", required=True, help="Site name")
 @click.option("--timestamp", help="Specific timestamp to reclean (default: current)")
 @click.option("--profile", help="Cleaning profile to use (default: from site config)")
-def reclean(site, timestamp, profile):
+@click.option("--dry-run", is_flag=True, help="Report line counts without rewriting files")
+def reclean(site, timestamp, profile, dry_run):
     """
     Re-clean scraped content with updated cleaning profile.
 
@@ -736,7 +740,7 @@ def reclean(site, timestamp, profile):
     console.print(f"  Directory: {content_dir}")
     console.print(f"  Profile: {profile_name}")
 
-    reclean_directory(content_dir, profile_name)
+    reclean_directory(content_dir, profile_name, dry_run=dry_run)
 
 
 @cli.command()
@@ -868,7 +872,7 @@ def rebuild_current(site, timestamp, force):
       1. Reads files from timestamped backup (e.g., 2025-01-15_10-30-00/)
       2. Copies all content to current/ directory
       3. Creates metadata.json with file tracking
-      4. Initializes delta_log.json for change history
+      4. Initializes delta_log.jsonl for change history
       5. Updates current/ as the active upload source
 
     \b
@@ -1180,82 +1184,84 @@ async def _rebuild_state(
 
     # Create client
     client = OpenWebUIClient(app_config.openwebui_base_url, app_config.openwebui_api_key)
-
-    if not await client.test_connection():
-        console.print("[red]Failed to connect to OpenWebUI[/red]")
-        sys.exit(1)
-
-    if not target_kb_id:
-        console.print("\n[dim]Searching for knowledge base by content...[/dim]")
-        target_kb_id = await client.find_knowledge_by_content(site_name, site_config.knowledge_name)
+    async with client:
+        if not await client.test_connection():
+            console.print("[red]Failed to connect to OpenWebUI[/red]")
+            sys.exit(1)
 
         if not target_kb_id:
-            console.print("[red]Could not find knowledge base[/red]")
-            console.print("  Either:")
-            console.print("  - Specify --knowledge-id <id>")
-            console.print("  - Set knowledge_id in site config")
-            console.print("  - Ensure site files exist in OpenWebUI")
-            sys.exit(1)
+            console.print("\n[dim]Searching for knowledge base by content...[/dim]")
+            target_kb_id = await client.find_knowledge_by_content(
+                site_name, site_config.knowledge_name
+            )
 
-        console.print(f"[green]✓ Found knowledge base: {target_kb_id}[/green]")
+            if not target_kb_id:
+                console.print("[red]Could not find knowledge base[/red]")
+                console.print("  Either:")
+                console.print("  - Specify --knowledge-id <id>")
+                console.print("  - Set knowledge_id in site config")
+                console.print("  - Ensure site files exist in OpenWebUI")
+                sys.exit(1)
 
-    console.print(f"\nKnowledge ID: {target_kb_id}")
-    console.print(f"Site folder: {site_name}/")
-    console.print(f"Minimum confidence: {min_confidence}\n")
+            console.print(f"[green]✓ Found knowledge base: {target_kb_id}[/green]")
 
-    # Perform rebuild
-    console.print("[dim]Matching local files with OpenWebUI state...[/dim]")
-    console.print("[dim]This may take a moment for large knowledge bases...[/dim]\n")
+        console.print(f"\nKnowledge ID: {target_kb_id}")
+        console.print(f"Site folder: {site_name}/")
+        console.print(f"Minimum confidence: {min_confidence}\n")
 
-    # Use StateManager for rebuild
-    state_manager = StateManager(current_manager, client)
-    success, rebuilt_status, rebuild_error = await state_manager.rebuild_from_remote(
-        target_kb_id,
-        site_name,
-        min_confidence=min_confidence,
-        auto_save=True,
-    )
+        # Perform rebuild
+        console.print("[dim]Matching local files with OpenWebUI state...[/dim]")
+        console.print("[dim]This may take a moment for large knowledge bases...[/dim]\n")
 
-    if not success or not rebuilt_status:
-        console.print(f"\n[red]✗ Rebuild failed: {rebuild_error}[/red]")
-        console.print("  Possible reasons:")
-        console.print("  - Match confidence below threshold")
-        console.print("  - Too few files matched")
-        console.print("  - Remote state unavailable")
-        console.print("\n[yellow]Try:[/yellow]")
-        console.print(
-            f"  - Lower confidence: [blue]webowui rebuild-state --site {site_name} --min-confidence low[/blue]"
-        )
-        console.print(
-            f"  - Check state health: [blue]webowui check-state --site {site_name}[/blue]"
-        )
-        console.print(
-            f"  - Verify knowledge ID: [blue]webowui check-state --site {site_name} --knowledge-id <id>[/blue]"
+        # Use StateManager for rebuild
+        state_manager = StateManager(current_manager, client)
+        success, rebuilt_status, rebuild_error = await state_manager.rebuild_from_remote(
+            target_kb_id,
+            site_name,
+            min_confidence=min_confidence,
+            auto_save=True,
         )
-        sys.exit(1)
 
-    # Display results
-    console.print("\n[green]✓ State rebuilt successfully![/green]")
-    console.print(f"  Knowledge ID: {rebuilt_status['knowledge_id']}")
-    console.print(f"  Files matched: {rebuilt_status['files_uploaded']}")
-    console.print(f"  Confidence: {rebuilt_status['rebuild_confidence']}")
-    console.print(f"  Match rate: {rebuilt_status['rebuild_match_rate']*100:.1f}%")
-
-    # Additional guidance based on confidence
-    confidence = rebuilt_status.get("rebuild_confidence")
-    if confidence in ["low", "very_low"]:
-        console.print("\n[yellow]⚠ Low confidence rebuild[/yellow]")
-        console.print("  Some files may have mismatched hashes (content changed)")
-        console.print(f"  Verify with: [blue]webowui check-state --site {site_name}[/blue]")
-        console.print(
-            f"  Then upload: [blue]webowui upload --site {site_name} --incremental[/blue]"
-        )
-        console.print("  (Incremental upload will detect and update changed files)")
-    else:
-        console.print("\n[green]Ready to upload:[/green]")
-        console.print(f"  [blue]webowui upload --site {site_name} --incremental[/blue]")
+        if not success or not rebuilt_status:
+            console.print(f"\n[red]✗ Rebuild failed: {rebuild_error}[/red]")
+            console.print("  Possible reasons:")
+            console.print("  - Match confidence below threshold")
+            console.print("  - Too few files matched")
+            console.print("  - Remote state unavailable")
+            console.print("\n[yellow]Try:[/yellow]")
+            console.print(
+                f"  - Lower confidence: [blue]webowui rebuild-state --site {site_name} --min-confidence low[/blue]"
+            )
+            console.print(
+                f"  - Check state health: [blue]webowui check-state --site {site_name}[/blue]"
+            )
+            console.print(
+                f"  - Verify knowledge ID: [blue]webowui check-state --site {site_name} --knowledge-id <id>[/blue]"
+            )
+            sys.exit(1)
 
-    console.print()
+        # Display results
+        console.print("\n[green]✓ State rebuilt successfully![/green]")
+        console.print(f"  Knowledge ID: {rebuilt_status['knowledge_id']}")
+        console.print(f"  Files matched: {rebuilt_status['files_uploaded']}")
+        console.print(f"  Confidence: {rebuilt_status['rebuild_confidence']}")
+        console.print(f"  Match rate: {rebuilt_status['rebuild_match_rate']*100:.1f}%")
+
+        # Additional guidance based on confidence
+        confidence = rebuilt_status.get("rebuild_confidence")
+        if confidence in ["low", "very_low"]:
+            console.print("\n[yellow]⚠ Low confidence rebuild[/yellow]")
+            console.print("  Some files may have mismatched hashes (content changed)")
+            console.print(f"  Verify with: [blue]webowui check-state --site {site_name}[/blue]")
+            console.print(
+                f"  Then upload: [blue]webowui upload --site {site_name} --incremental[/blue]"
+            )
+            console.print("  (Incremental upload will detect and update changed files)")
+        else:
+            console.print("\n[green]Ready to upload:[/green]")
+            console.print(f"  [blue]webowui upload --site {site_name} --incremental[/blue]")
+
+        console.print()
 
 
 async def _check_state(site_name: str, knowledge_id: str | None):
@@ -1278,54 +1284,55 @@ async def _check_state(site_name: str, knowledge_id: str | None):
     # Setup components
     current_manager = CurrentDirectoryManager(app_config.outputs_dir, site_name)
     client = OpenWebUIClient(app_config.openwebui_base_url, app_config.openwebui_api_key)
-    state_manager = StateManager(current_manager, client)
+    async with client:
+        state_manager = StateManager(current_manager, client)
 
-    if not await client.test_connection():
-        console.print("[red]Failed to connect to OpenWebUI[/red]")
-        sys.exit(1)
+        if not await client.test_connection():
+            console.print("[red]Failed to connect to OpenWebUI[/red]")
+            sys.exit(1)
 
-    # Determine knowledge ID
-    target_kb_id = knowledge_id
-    if not target_kb_id:
-        upload_status = current_manager.get_upload_status()
-        if upload_status:
-            target_kb_id = upload_status.get("knowledge_id")
-        else:
-            target_kb_id = site_config.knowledge_id
+        # Determine knowledge ID
+        target_kb_id = knowledge_id
+        if not target_kb_id:
+            upload_status = current_manager.get_upload_status()
+            if upload_status:
+                target_kb_id = upload_status.get("knowledge_id")
+            else:
+                target_kb_id = site_config.knowledge_id
 
-    if not target_kb_id:
-        console.print("[red]No knowledge ID found. Cannot check state.[/red]")
-        console.print("  Please specify --knowledge-id or configure it in site config.")
-        sys.exit(1)
+        if not target_kb_id:
+            console.print("[red]No knowledge ID found. Cannot check state.[/red]")
+            console.print("  Please specify --knowledge-id or configure it in site config.")
+            sys.exit(1)
 
-    # Run check
-    console.print(f"\n[blue]Checking state health for {site_name}...[/blue]")
-    console.print(f"  Knowledge ID: {target_kb_id}")
+        # Run check
+        console.print(f"\n[blue]Checking state health for {site_name}...[/blue]")
+        console.print(f"  Knowledge ID: {target_kb_id}")
 
-    health = await state_manager.check_health(target_kb_id, site_name)
+        health = await state_manager.check_health(target_kb_id, site_name)
 
-    # Display results
-    status_color = {
-        "healthy": "green",
-        "degraded": "yellow",
-        "corrupted": "red",
-        "missing": "red",
-        "error": "red",
-    }.get(health["status"], "white")
-
-    console.print(f"\nStatus: [{status_color}]{health['status'].upper()}[/{status_color}]")
-    console.print(f"  Local files: {health['local_file_count']}")
-    console.print(f"  Remote files: {health['remote_file_count']}")
-
-    if health["issues"]:
-        console.print("\n[yellow]Issues Found:[/yellow]")
-        for issue in health["issues"]:
-            console.print(f"  • {issue}")
-
-    if health.get("recommendation"):
-        console.print(f"\n[blue]Recommendation:[/blue] {health['recommendation']}")
+        # Display results
+        status_color = {
+            "healthy": "green",
+            "degraded": "yellow",
+            "corrupted": "red",
+            "missing": "red",
+            "error": "red",
+        }.get(health["status"], "white")
 
-    console.print()
+        console.print(f"\nStatus: [{status_color}]{health['status'].upper()}[/{status_color}]")
+        console.print(f"  Local files: {health['local_file_count']}")
+        console.print(f"  Remote files: {health['remote_file_count']}")
+
+        if health["issues"]:
+            console.print("\n[yellow]Issues Found:[/yellow]")
+            for issue in health["issues"]:
+                console.print(f"  • {issue}")
+
+        if health.get("recommendation"):
+            console.print(f"\n[blue]Recommendation:[/blue] {health['recommendation']}")
+
+        console.print()
 
 
 async def _sync_site(site_name: str, auto_fix: bool, knowledge_id: str | None):
@@ -1339,62 +1346,64 @@ async def _sync_site(site_name: str, auto_fix: bool, knowledge_id: str | None):
         sys.exit(1)
 
     client = OpenWebUIClient(app_config.openwebui_base_url, app_config.openwebui_api_key)
+    async with client:
+        if not await client.test_connection():
+            console.print("[red]Failed to connect to OpenWebUI[/red]")
+            sys.exit(1)
 
-    if not await client.test_connection():
-        console.print("[red]Failed to connect to OpenWebUI[/red]")
-        sys.exit(1)
-
-    # Setup StateManager
-    current_manager = CurrentDirectoryManager(app_config.outputs_dir, site_name)
-    state_manager = StateManager(current_manager, client)
-
-    # Run sync via StateManager
-    result = await state_manager.sync_state(site_name, knowledge_id, auto_fix)
+        # Setup StateManager
+        current_manager = CurrentDirectoryManager(app_config.outputs_dir, site_name)
+        state_manager = StateManager(current_manager, client)
 
-    if not result["success"]:
-        console.print(f"[red]Sync failed: {result.get('error', 'Unknown error')}[/red]")
-        sys.exit(1)
+        # Run sync via StateManager
+        result = await state_manager.sync_state(
+            site_name, knowledge_id, auto_fix, include_details=True
+        )
 
-    # Display findings
-    console.print("[bold]Sync Results:[/bold]\n")
-    console.print(f"  Local files: {result['local_count']}")
-    console.print(f"  Remote files: {result['remote_count']}")
-    console.print(f"  ✓ In sync: {result['in_sync_count']}")
+        if not result["success"]:
+            console.print(f"[red]Sync failed: {result.get('error', 'Unknown error')}[/red]")
+            sys.exit(1)
 
-    missing_remote = result["missing_remote"]
-    extra_remote = result["extra_remote"]
-    local_file_map = result.get("local_file_map", {})
-    remote_files = result.get("remote_files", [])
+        # Display findings
+        console.print("[bold]Sync Results:[/bold]\n")
+        console.print(f"  Local files: {result['local_count']}")
+        console.print(f"  Remote files: {result['remote_count']}")
+        console.print(f"  ✓ In sync: {result['in_sync_count']}")
 
-    if missing_remote:
-        console.print(
-            f"\n[yellow]⚠ Files in local state but missing from OpenWebUI: {len(missing_remote)}[/yellow]"
-        )
-        for file_id in list(missing_remote)[:10]:
-            file_info = local_file_map.get(file_id, {})
-            console.print(f"  • {file_info.get('filename', 'unknown')} ({file_id})")
-        if len(missing_remote) > 10:
-            console.print(f"  ... and {len(missing_remote) - 10} more")
+        missing_remote = result["missing_remote"]
+        extra_remote = result["extra_remote"]
+        local_file_map = result.get("local_file_map", {})
+        remote_files = result.get("remote_files", [])
 
-        if result.get("fixed_count", 0) > 0:
+        if missing_remote:
             console.print(
-                f"\n[green]✓ Fixed: Removed {result['fixed_count']} files from local state[/green]"
+                f"\n[yellow]⚠ Files in local state but missing from OpenWebUI: {len(missing_remote)}[/yellow]"
             )
+            for file_id in list(missing_remote)[:10]:
+                file_info = local_file_map.get(file_id, {})
+                console.print(f"  • {file_info.get('filename', 'unknown')} ({file_id})")
+            if len(missing_remote) > 10:
+                console.print(f"  ... and {len(missing_remote) - 10} more")
 
-    if extra_remote:
-        console.print(
-            f"\n[yellow]⚠ Files in OpenWebUI but not in local state: {len(extra_remote)}[/yellow]"
-        )
-        console.print("  (This can happen if knowledge base is shared with other sites)")
-        for file_id in list(extra_remote)[:10]:
-            # Find file info from remote
-            file_info = next((f for f in remote_files if f["id"] == file_id), {})
-            filename = file_info.get("filename") if isinstance(file_info, dict) else file_id
-            console.print(f"  • {filename}")
-        if len(extra_remote) > 10:
-            console.print(f"  ... and {len(extra_remote) - 10} more")
-
-    if not missing_remote and not extra_remote:
-        console.print("\n[green]✓ Local and remote states are in sync![/green]")
+            if result.get("fixed_count", 0) > 0:
+                console.print(
+                    f"\n[green]✓ Fixed: Removed {result['fixed_count']} files from local state[/green]"
+                )
 
-    console.print()
+        if extra_remote:
+            console.print(
+                f"\n[yellow]⚠ Files in OpenWebUI but not in local state: {len(extra_remote)}[/yellow]"
+            )
+            console.print("  (This can happen if knowledge base is shared with other sites)")
+            for file_id in list(extra_remote)[:10]:
+                # Find file info from remote
+                file_info = next((f for f in remote_files if f["id"] == file_id), {})
+                filename = file_info.get("filename") if isinstance(file_info, dict) else file_id
+                console.print(f"  • {filename}")
+            if len(extra_remote) > 10:
+                console.print(f"  ... and {len(extra_remote) - 10} more")
+
+        if not missing_remote and not extra_remote:
+            console.print("\n[green]✓ Local and remote states are in sync![/green]")
+
+        console.print()
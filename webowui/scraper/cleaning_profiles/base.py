@@ -2,13 +2,35 @@
 Base abstract class for content cleaning profiles.
 """
 
+import re
 from abc import ABC, abstractmethod
 from typing import Any
 
 
+def compile_any(patterns: list[str], flags: int = 0) -> re.Pattern[str]:
+    """
+    Compile regex patterns into a single alternation.
+
+    The result matches (or searches) wherever any one of the patterns would,
+    so a line is scanned once instead of once per pattern.
+
+    Args:
+        patterns: Regex patterns without inline global flags
+        flags: re flags applied to every pattern
+
+    Returns:
+        Compiled pattern
+    """
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns), flags)
+
+
 class BaseCleaningProfile(ABC):
     """Base class for content cleaning profiles."""
 
+    # Bump whenever a change to clean() alters its output. Scrapes only reuse a
+    # page's earlier output while this (and the raw page) is unchanged.
+    CLEANING_VERSION: int = 1
+
     def __init__(self, config: dict[str, Any] | None = None):
         """
         Initialize with optional configuration.
@@ -6,8 +6,68 @@ Extends MediaWikiProfile with Fandom-specific cleaning.
 import re
 from typing import Any
 
+from webowui.scraper.cleaning_profiles.base import compile_any
 from webowui.scraper.cleaning_profiles.builtin_profiles.mediawiki_profile import MediaWikiProfile
 
+# Advertising placeholders
+_AD_RE = compile_any(
+    [
+        r"^Advertisement\s*$",
+        r"^\s*\[Ad\]\s*$",
+    ],
+    re.IGNORECASE,
+)
+
+# Fandom branding and cross-promotions
+_PROMOTION_RE = compile_any(
+    [
+        r"FANDOM powered by",
+        r"More Fandom",
+        r"Fan Central",
+        r"Fandom Apps",
+        r"Explore.*[Ff]andom",
+        r"What is Fandom\?",
+        r"Explore properties",
+    ]
+)
+
+# Community sections - content is truncated here
+_COMMUNITY_RE = compile_any(
+    [
+        r"^##\s+.*Discord\s*$",  # Discord widget sections
+        r"^##\s+Community\s*$",
+        r"^##\s+Discussions?\s*$",
+        r"^##\s+Comments?\s*$",
+        r"^##\s+Recent\s+Images\s*$",  # Recent activity widgets
+        r"Community content is available",
+        r"\*\*\d+\*\*\s+Users\s+Online",  # Discord user count
+    ],
+    re.IGNORECASE,
+)
+
+# Related wiki sections - content is truncated here
+_RELATED_WIKIS_RE = compile_any(
+    [
+        r"^##\s+Related\s+[Ww]ikis?\s*$",
+        r"See also.*other wikis",
+        r"More from Fandom",
+    ]
+)
+
+# Fandom corporate footer - content is truncated here
+_FOOTER_RE = compile_any(
+    [
+        r"###\s+Follow\s+Us",
+        r"###\s+Overview",
+        r"###\s+Advertise",
+        r"Fandom.*Inc\.",
+        r"View Mobile Site",
+        r"is a Fandom\s+(Games|TV|Movies|Comics|Books)\s+Community",
+    ]
+)
+
+_BLANK_RUN_RE = re.compile(r"\n{3,}")
+
 
 class FandomWikiProfile(MediaWikiProfile):
     """
@@ -67,7 +127,7 @@ class FandomWikiProfile(MediaWikiProfile):
             content = self._remove_fandom_footer(content)
 
         # Final cleanup
-        content = re.sub(r"\n{3,}", "\n\n", content)
+        content = _BLANK_RUN_RE.sub("\n\n", content)
         content = content.strip()
 
         return content
@@ -85,25 +145,8 @@ class FandomWikiProfile(MediaWikiProfile):
         Returns:
             Content with ad markers removed
         """
-        ad_patterns = [
-            r"^Advertisement\s*$",
-            r"^\s*\[Ad\]\s*$",
-        ]
-
         lines = content.split("\n")
-        cleaned_lines = []
-
-        for line in lines:
-            should_skip = False
-            for pattern in ad_patterns:
-                if re.match(pattern, line, re.IGNORECASE):
-                    should_skip = True
-                    break
-
-            if not should_skip:
-                cleaned_lines.append(line)
-
-        return "\n".join(cleaned_lines)
+        return "\n".join(line for line in lines if not _AD_RE.match(line))
 
     def _remove_fandom_promotions(self, content: str) -> str:
         """
@@ -121,30 +164,8 @@ class FandomWikiProfile(MediaWikiProfile):
         Returns:
             Content with promotions removed
         """
-        promotion_patterns = [
-            r"FANDOM powered by",
-            r"More Fandom",
-            r"Fan Central",
-            r"Fandom Apps",
-            r"Explore.*[Ff]andom",
-            r"What is Fandom\?",
-            r"Explore properties",
-        ]
-
         lines = content.split("\n")
-        cleaned_lines = []
-
-        for line in lines:
-            should_skip = False
-            for pattern in promotion_patterns:
-                if re.search(pattern, line):
-                    should_skip = True
-                    break
-
-            if not should_skip:
-                cleaned_lines.append(line)
-
-        return "\n".join(cleaned_lines)
+        return "\n".join(line for line in lines if not _PROMOTION_RE.search(line))
 
     def _remove_community_content(self, content: str) -> str:
         """
@@ -162,26 +183,7 @@ class FandomWikiProfile(MediaWikiProfile):
         Returns:
             Content with community sections removed
         """
-        # Section headers to truncate at
-        community_patterns = [
-            r"^##\s+.*Discord\s*$",  # Discord widget sections
-            r"^##\s+Community\s*$",
-            r"^##\s+Discussions?\s*$",
-            r"^##\s+Comments?\s*$",
-            r"^##\s+Recent\s+Images\s*$",  # Recent activity widgets
-            r"Community content is available",
-            r"\*\*\d+\*\*\s+Users\s+Online",  # Discord user count
-        ]
-
-        lines = content.split("\n")
-
-        for i, line in enumerate(lines):
-            for pattern in community_patterns:
-                if re.search(pattern, line, re.IGNORECASE):
-                    # Truncate content here
-                    return "\n".join(lines[:i]).rstrip()
-
-        return content
+        return self._truncate_at_first(content, _COMMUNITY_RE)
 
     def _remove_related_wikis(self, content: str) -> str:
         """
@@ -198,20 +200,7 @@ class FandomWikiProfile(MediaWikiProfile):
         Returns:
             Content with related wiki sections removed
         """
-        related_patterns = [
-            r"^##\s+Related\s+[Ww]ikis?\s*$",
-            r"See also.*other wikis",
-            r"More from Fandom",
-        ]
-
-        lines = content.split("\n")
-
-        for i, line in enumerate(lines):
-            for pattern in related_patterns:
-                if re.search(pattern, line):
-                    return "\n".join(lines[:i]).rstrip()
-
-        return content
+        return self._truncate_at_first(content, _RELATED_WIKIS_RE)
 
     def _remove_fandom_footer(self, content: str) -> str:
         """
@@ -231,21 +220,25 @@ class FandomWikiProfile(MediaWikiProfile):
         Returns:
             Content with Fandom footer removed
         """
-        footer_patterns = [
-            r"###\s+Follow\s+Us",
-            r"###\s+Overview",
-            r"###\s+Advertise",
-            r"Fandom.*Inc\.",
-            r"View Mobile Site",
-            r"is a Fandom\s+(Games|TV|Movies|Comics|Books)\s+Community",
-        ]
+        return self._truncate_at_first(content, _FOOTER_RE)
 
+    def _truncate_at_first(self, content: str, marker_re: re.Pattern[str]) -> str:
+        """
+        Truncate content at the first line containing a match for marker_re.
+
+        Args:
+            content: Content to truncate
+            marker_re: Pattern searched for in each line
+
+        Returns:
+            Content before the matching line, or content unchanged
+        """
         lines = content.split("\n")
 
         for i, line in enumerate(lines):
-            for pattern in footer_patterns:
-                if re.search(pattern, line):
-                    return "\n".join(lines[:i]).rstrip()
+            if marker_re.search(line):
+                # Truncate content here
+                return "\n".join(lines[:i]).rstrip()
 
         return content
 
@@ -5,7 +5,110 @@ Cleaning profile for MediaWiki-based sites.
 import re
 from typing import Any
 
-from webowui.scraper.cleaning_profiles.base import BaseCleaningProfile
+from webowui.scraper.cleaning_profiles.base import BaseCleaningProfile, compile_any
+
+# Patterns are compiled once at import; each list becomes a single alternation
+# so a line is scanned once rather than once per pattern.
+
+# Media sections (Gallery, Images, Videos) - content is truncated here
+_MEDIA_SECTION_RE = compile_any(
+    [
+        r"^##\s+Media\s*$",
+        r"^##\s+Gallery\s*$",
+        r"^##\s+Images\s*$",
+        r"^##\s+Videos\s*$",
+    ]
+)
+
+# References/Notes sections - content is truncated here
+_REFERENCES_SECTION_RE = compile_any(
+    [
+        r"^##\s+References\s*$",
+        r"^##\s+Notes\s*$",
+        r"^##\s+Footnotes\s*$",
+    ]
+)
+
+# External links / See also sections - content is truncated here
+_EXTERNAL_LINKS_SECTION_RE = compile_any(
+    [
+        r"^##\s+External\s+[Ll]inks?\s*$",
+        r"^##\s+See\s+[Aa]lso\s*$",
+        r"^##\s+Further\s+[Rr]eading\s*$",
+        r"^##\s+External\s+[Rr]esources\s*$",
+    ]
+)
+
+# Header navigation lines to skip at the start of the file
+_HEADER_NAV_RE = compile_any(
+    [
+        r"^##\s+Anonymous\s*$",
+        r"^###\s+Not\s+logged\s+in\s*$",
+        r"^###\s+Search\s*$",
+        r"^###\s+Namespaces\s*$",
+        r"^###\s+Page\s+actions\s*$",
+        r"^###\s+More\s*$",
+        r"^[\*\-]?\s*\[Create\s+account\]",
+        r"^[\*\-]?\s*\[Log\s+in\]",
+        r"^[\*\-]?\s*\[Page\]",
+        r"^[\*\-]?\s*\[Read\]",
+        r"^[\*\-]?\s*\[View\s+source\]",
+        r"^[\*\-]?\s*\[History\]",
+        r"^[\*\-]?\s*\[Main\s+Page\]",
+        r"^[\*\-]?\s*\[Discussion\]",
+        r"^[\*\-]?\s*More\s*$",
+        r"^You can view its source",
+        r"^###\s+Quick\s+Access\s*$",
+        r"^###\s+Sister\s+Sites\s*$",
+        r"^##\s+Wiki\s+tools\s*$",
+        r"^###\s+Wiki\s+tools\s*$",
+        r"^##\s+Page\s+tools\s*$",
+        r"^###\s+Page\s+tools\s*$",
+        r"^###\s+User\s+page\s+tools\s*$",
+        r"^##\s+Navigation\s*$",
+        r"^###\s+Navigation\s*$",
+        r"^##\s+Content\s+by\s+Game\s*$",
+        r"^###\s+Legacy\s+Games\s*$",
+        r"^##\s+Content\s+by\s+Topic\s*$",
+    ]
+)
+
+# A line that is just a link (optionally a list item)
+_LINK_ONLY_RE = re.compile(r"^[\*\-]?\s*\[.*?\]\(.*?\)\s*$")
+
+# Table of contents header and its numbered entries, e.g. "1. [Link](#anchor)"
+_TOC_HEADER_RE = re.compile(r"^##\s+Contents?\s*$")
+_TOC_ENTRY_RE = re.compile(r"^\s*\d+\.\s+\[.*?\]\(#.*?\)")
+
+# Version history section - content is truncated here
+_VERSION_HISTORY_RE = re.compile(r"^##\s+Version\s+[Hh]istory\s*$")
+
+# Wiki meta messages and help banners
+_WIKI_META_RE = compile_any(
+    [
+        r"[Ww]iki.*work in progress",
+        r"[Pp]lease.*contribute",
+        r"[Hh]elp.*expand this",
+        r"[Ss]tub.*article",
+        r"[Ii]ncomplete.*expand",
+    ]
+)
+
+# Template editing links, applied in order:
+# individual [v], [t], or [e], then any left with a bullet separator
+_TEMPLATE_LINK_PATTERNS = [
+    re.compile(r"\[\s*[vte]\s*\]"),
+    re.compile(r"\[\s*[vte]\s*\]\s*•\s*"),
+]
+
+# Wiki-specific footer lines
+_WIKI_FOOTER_LINE_RE = compile_any([r"From .* Wiki$", r"Retrieved from"])
+
+# Dead links: [text](url&redlink=1 "title (page does not exist)")
+_DEAD_LINK_RE = re.compile(r'\[[^\]]+\]\([^"]*&redlink=1[^"]*"[^"]*"\)')
+_EMPTY_LIST_ITEM_RE = re.compile(r"^\s*\*\s*$", re.MULTILINE)
+
+_BLANK_RUN_RE = re.compile(r"\n{3,}")
 
 
 class MediaWikiProfile(BaseCleaningProfile):
@@ -89,7 +192,7 @@ class MediaWikiProfile(BaseCleaningProfile):
             content = self._remove_dead_links(content)
 
         # Step 13: Clean up excessive blank lines (existing logic)
-        content = re.sub(r"\n{3,}", "\n\n", content)
+        content = _BLANK_RUN_RE.sub("\n\n", content)
         content = content.strip()
 
         return content
@@ -104,21 +207,25 @@ class MediaWikiProfile(BaseCleaningProfile):
         Returns:
             Content with media sections removed
         """
-        # Section headers to truncate at or remove
         # We truncate because these are usually at the bottom
-        section_patterns = [
-            r"^##\s+Media\s*$",
-            r"^##\s+Gallery\s*$",
-            r"^##\s+Images\s*$",
-            r"^##\s+Videos\s*$",
-        ]
+        return self._truncate_at(content, _MEDIA_SECTION_RE)
+
+    def _truncate_at(self, content: str, section_re: re.Pattern[str]) -> str:
+        """
+        Truncate content at the first line whose stripped text matches section_re.
 
+        Args:
+            content: Content to truncate
+            section_re: Section header pattern
+
+        Returns:
+            Content before the matching line, or content unchanged
+        """
         lines = content.split("\n")
         for i, line in enumerate(lines):
-            for pattern in section_patterns:
-                if re.match(pattern, line.strip()):
-                    # Truncate content here
-                    return "\n".join(lines[:i]).rstrip()
+            if section_re.match(line.strip()):
+                # Truncate content here
+                return "\n".join(lines[:i]).rstrip()
 
         return content
 
@@ -132,20 +239,7 @@ class MediaWikiProfile(BaseCleaningProfile):
         Returns:
             Content with references section removed
         """
-        section_patterns = [
-            r"^##\s+References\s*$",
-            r"^##\s+Notes\s*$",
-            r"^##\s+Footnotes\s*$",
-        ]
-
-        lines = content.split("\n")
-        for i, line in enumerate(lines):
-            for pattern in section_patterns:
-                if re.match(pattern, line.strip()):
-                    # Truncate content here
-                    return "\n".join(lines[:i]).rstrip()
-
-        return content
+        return self._truncate_at(content, _REFERENCES_SECTION_RE)
 
     def _remove_infoboxes(self, content: str) -> str:
         """
@@ -224,23 +318,7 @@ class MediaWikiProfile(BaseCleaningProfile):
         Returns:
             Content with external links section removed
         """
-        # Section headers to truncate at
-        section_patterns = [
-            r"^##\s+External\s+[Ll]inks?\s*$",
-            r"^##\s+See\s+[Aa]lso\s*$",
-            r"^##\s+Further\s+[Rr]eading\s*$",
-            r"^##\s+External\s+[Rr]esources\s*$",
-        ]
-
-        lines = content.split("\n")
-
-        for i, line in enumerate(lines):
-            for pattern in section_patterns:
-                if re.match(pattern, line.strip()):
-                    # Truncate content here
-                    return "\n".join(lines[:i]).rstrip()
-
-        return content
+        return self._truncate_at(content, _EXTERNAL_LINKS_SECTION_RE)
 
     def _remove_header_navigation(
         self, content: str, custom_patterns: list[str] | None = None
@@ -258,40 +336,8 @@ class MediaWikiProfile(BaseCleaningProfile):
         lines = content.split("\n")
         cleaned_lines = []
 
-        # Patterns to skip at the start of the file
-        skip_patterns = [
-            r"^##\s+Anonymous\s*$",
-            r"^###\s+Not\s+logged\s+in\s*$",
-            r"^###\s+Search\s*$",
-            r"^###\s+Namespaces\s*$",
-            r"^###\s+Page\s+actions\s*$",
-            r"^###\s+More\s*$",
-            r"^[\*\-]?\s*\[Create\s+account\]",
-            r"^[\*\-]?\s*\[Log\s+in\]",
-            r"^[\*\-]?\s*\[Page\]",
-            r"^[\*\-]?\s*\[Read\]",
-            r"^[\*\-]?\s*\[View\s+source\]",
-            r"^[\*\-]?\s*\[History\]",
-            r"^[\*\-]?\s*\[Main\s+Page\]",
-            r"^[\*\-]?\s*\[Discussion\]",
-            r"^[\*\-]?\s*More\s*$",
-            r"^You can view its source",
-            r"^###\s+Quick\s+Access\s*$",
-            r"^###\s+Sister\s+Sites\s*$",
-            r"^##\s+Wiki\s+tools\s*$",
-            r"^###\s+Wiki\s+tools\s*$",
-            r"^##\s+Page\s+tools\s*$",
-            r"^###\s+Page\s+tools\s*$",
-            r"^###\s+User\s+page\s+tools\s*$",
-            r"^##\s+Navigation\s*$",
-            r"^###\s+Navigation\s*$",
-            r"^##\s+Content\s+by\s+Game\s*$",
-            r"^###\s+Legacy\s+Games\s*$",
-            r"^##\s+Content\s+by\s+Topic\s*$",
-        ]
-
-        if custom_patterns:
-            skip_patterns.extend(custom_patterns)
+        # Custom patterns are compiled separately: they may carry inline flags
+        custom_res = [re.compile(pattern) for pattern in custom_patterns or []]
 
         # Also skip lines that are just a single link at the start (navigation menus)
         # e.g. [Armor](...)
@@ -300,18 +346,14 @@ class MediaWikiProfile(BaseCleaningProfile):
             # Check if line matches skip patterns
             # We check this for all lines in the first 100 lines to catch nav
             # that appears after the page title
-            should_skip = False
-            if i < 100:
-                for pattern in skip_patterns:
-                    if re.match(pattern, line.strip()):
-                        should_skip = True
-                        break
-
-            if should_skip:
+            stripped = line.strip()
+            if i < 100 and (
+                _HEADER_NAV_RE.match(stripped) or any(p.match(stripped) for p in custom_res)
+            ):
                 continue
 
             # If line is empty, skip
-            if not line.strip():
+            if not stripped:
                 cleaned_lines.append(line)  # Preserve blank lines between header and content
                 continue
 
@@ -319,7 +361,7 @@ class MediaWikiProfile(BaseCleaningProfile):
             # But be careful not to skip the main title or intro text
             # Heuristic: If it's a link and we haven't seen a header or long text yet
             # Also handle list items that are just links
-            if re.match(r"^[\*\-]?\s*\[.*?\]\(.*?\)\s*$", line.strip()):
+            if _LINK_ONLY_RE.match(stripped):
                 # It's a single link. Is it navigation?
                 # If it's followed by "Equipment ▼" or similar, it's nav.
                 if "▼" in line or "Equipment" in line or "Items" in line or "Locales" in line:
@@ -352,14 +394,14 @@ class MediaWikiProfile(BaseCleaningProfile):
 
         for line in lines:
             # Detect TOC start
-            if re.match(r"^##\s+Contents?\s*$", line.strip()):
+            if _TOC_HEADER_RE.match(line.strip()):
                 in_toc = True
                 continue
 
             # If in TOC, skip numbered list items
             if in_toc:
                 # TOC typically has numbered lists like "1. [Link](#anchor)"
-                if re.match(r"^\s*\d+\.\s+\[.*?\]\(#.*?\)", line):
+                if _TOC_ENTRY_RE.match(line):
                     continue
                 # End of TOC when we hit non-list content
                 elif line.strip() and not line.strip().startswith("*"):
@@ -383,15 +425,7 @@ class MediaWikiProfile(BaseCleaningProfile):
             Content with version history removed
         """
         # Truncate at version history section
-        pattern = r"^##\s+Version\s+[Hh]istory\s*$"
-
-        lines = content.split("\n")
-        for i, line in enumerate(lines):
-            if re.match(pattern, line.strip()):
-                # Truncate content here
-                return "\n".join(lines[:i]).rstrip()
-
-        return content
+        return self._truncate_at(content, _VERSION_HISTORY_RE)
 
     def _remove_wiki_meta(self, content: str) -> str:
         """
@@ -406,29 +440,8 @@ class MediaWikiProfile(BaseCleaningProfile):
         Returns:
             Content with meta messages removed
         """
-        # Common wiki meta message patterns
-        patterns = [
-            r".*[Ww]iki.*work in progress.*",
-            r".*[Pp]lease.*contribute.*",
-            r".*[Hh]elp.*expand this.*",
-            r".*[Ss]tub.*article.*",
-            r".*[Ii]ncomplete.*expand.*",
-        ]
-
         lines = content.split("\n")
-        cleaned_lines = []
-
-        for line in lines:
-            should_skip = False
-            for pattern in patterns:
-                if re.search(pattern, line):
-                    should_skip = True
-                    break
-
-            if not should_skip:
-                cleaned_lines.append(line)
-
-        return "\n".join(cleaned_lines)
+        return "\n".join(line for line in lines if not _WIKI_META_RE.search(line))
 
     def _remove_navigation_boilerplate(self, content: str) -> str:
         """
@@ -478,13 +491,8 @@ class MediaWikiProfile(BaseCleaningProfile):
         """
         # Pattern: [v], [t], [e] links at end of lines or in isolation
         # Often appear as: "[v] • [t] • [e]" or "\n[v]\n"
-        patterns = [
-            r"\[\s*[vte]\s*\]",  # Individual [v], [t], or [e]
-            r"\[\s*[vte]\s*\]\s*•\s*",  # With bullet separator
-        ]
-
-        for pattern in patterns:
-            content = re.sub(pattern, "", content)
+        for pattern in _TEMPLATE_LINK_PATTERNS:
+            content = pattern.sub("", content)
 
         return content
 
@@ -529,12 +537,7 @@ class MediaWikiProfile(BaseCleaningProfile):
                 break
 
             # Wiki-specific patterns
-            skip_patterns = [
-                r"From .* Wiki$",
-                r"Retrieved from",
-            ]
-
-            if any(re.search(p, line) for p in skip_patterns):
+            if _WIKI_FOOTER_LINE_RE.search(line):
                 continue
 
             # Add line to content (preserve original formatting)
@@ -553,14 +556,11 @@ class MediaWikiProfile(BaseCleaningProfile):
         Returns:
             Content with dead links removed
         """
-        # Match dead links
-        pattern = r'\[[^\]]+\]\([^"]*&redlink=1[^"]*"[^"]*"\)'
-
         # Remove the links
-        cleaned = re.sub(pattern, "", text)
+        cleaned = _DEAD_LINK_RE.sub("", text)
 
         # Remove empty list items left behind
-        cleaned = re.sub(r"^\s*\*\s*$", "", cleaned, flags=re.MULTILINE)
+        cleaned = _EMPTY_LIST_ITEM_RE.sub("", cleaned)
 
         # Remove lines that now only have whitespace
         lines = cleaned.split("\n")
@@ -5,12 +5,16 @@ This module provides a clean abstraction layer for state detection, rebuilding,
 and validation, eliminating duplicate code and improving maintainability.
 """
 
-import json
 import logging
 from typing import cast
 
+from .utils.json_io import load_json
+
 logger = logging.getLogger(__name__)
 
+# Confidence hierarchy, lowest first
+_CONFIDENCE_RANK = {"very_low": 0, "low": 1, "medium": 2, "high": 3}
+
 
 class StateManager:
     """
@@ -140,8 +144,7 @@ class StateManager:
             return (False, None, "Current directory metadata not found")
 
         try:
-            with open(metadata_file) as f:
-                local_metadata = json.load(f)
+            local_metadata = load_json(metadata_file)
         except Exception as e:
             return (False, None, f"Failed to load metadata: {e}")
 
@@ -196,15 +199,7 @@ class StateManager:
         match_rate = rebuilt_status.get("rebuild_match_rate", 0.0)
         files_matched = rebuilt_status.get("files_uploaded", 0)
 
-        # Confidence hierarchy
-        confidence_levels = ["very_low", "low", "medium", "high"]
-
-        min_idx = (
-            confidence_levels.index(min_confidence) if min_confidence in confidence_levels else 1
-        )
-        actual_idx = confidence_levels.index(confidence) if confidence in confidence_levels else 0
-
-        if actual_idx < min_idx:
+        if _CONFIDENCE_RANK.get(confidence, 0) < _CONFIDENCE_RANK.get(min_confidence, 1):
             return (
                 False,
                 f"Confidence '{confidence}' ({match_rate*100:.1f}%, {files_matched} files) "
@@ -243,8 +238,7 @@ class StateManager:
             metadata_file = self.current_manager.metadata_file
             if metadata_file.exists():
                 try:
-                    with open(metadata_file) as f:
-                        local_metadata = json.load(f)
+                    local_metadata = load_json(metadata_file)
                 except Exception as e:
                     logger.error(f"Failed to load metadata: {e}")
                     local_metadata = None
@@ -274,7 +268,11 @@ class StateManager:
         return upload_status is not None and len(upload_status.get("files", [])) > 0
 
     async def sync_state(
-        self, site_name: str, knowledge_id: str | None = None, auto_fix: bool = False
+        self,
+        site_name: str,
+        knowledge_id: str | None = None,
+        auto_fix: bool = False,
+        include_details: bool = False,
     ) -> dict:
         """
         Reconcile local state with OpenWebUI remote state.
@@ -283,6 +281,7 @@ class StateManager:
             site_name: Site name for folder filtering
             knowledge_id: Optional knowledge ID (uses local state if not provided)
             auto_fix: Whether to automatically fix discrepancies
+            include_details: Whether to include the file_id -> file_info map for reporting
 
         Returns:
             Dict with sync results:
@@ -293,6 +292,7 @@ class StateManager:
             - missing_remote: list of file_ids
             - extra_remote: list of file_ids
             - fixed_count: int (if auto_fix=True)
+            - local_file_map: dict of file_id -> file_info (if include_details=True)
             - error: str (if failed)
         """
         # Get local state
@@ -315,39 +315,47 @@ class StateManager:
         # Build remote file_id set
         remote_file_ids = {f["id"] for f in remote_files}
 
-        # Build local file_id map
-        local_file_map = {}  # file_id -> file_info
-        for file_info in upload_status.get("files", []):
-            if "file_id" in file_info:
-                local_file_map[file_info["file_id"]] = file_info
-
-        local_file_ids = set(local_file_map.keys())
-
-        # Calculate differences
-        missing_remote = local_file_ids - remote_file_ids  # In local but not remote
-        extra_remote = remote_file_ids - local_file_ids  # In remote but not local
+        # Build local file_id set (and the full file_id -> file_info map only when
+        # the caller wants per-file reporting details)
+        local_files = upload_status.get("files", [])
+        local_file_ids = {f["file_id"] for f in local_files if "file_id" in f}
+
+        # Calculate differences in a single pass over each side instead of
+        # allocating three intermediate sets (local - remote, remote - local, local & remote)
+        missing_remote = []  # In local but not remote
+        in_sync_count = 0
+        for fid in local_file_ids:
+            if fid in remote_file_ids:
+                in_sync_count += 1
+            else:
+                missing_remote.append(fid)
+        # In remote but not local
+        extra_remote = [fid for fid in remote_file_ids if fid not in local_file_ids]
 
         result = {
             "success": True,
             "local_count": len(local_file_ids),
             "remote_count": len(remote_file_ids),
-            "in_sync_count": len(local_file_ids & remote_file_ids),
-            "missing_remote": list(missing_remote),
-            "extra_remote": list(extra_remote),
+            "in_sync_count": in_sync_count,
+            "missing_remote": missing_remote,
+            "extra_remote": extra_remote,
             "fixed_count": 0,
-            "local_file_map": local_file_map,  # Include map for reporting details
             "remote_files": remote_files,  # Include remote files for reporting details
         }
 
+        if include_details:
+            # Include map for reporting details
+            result["local_file_map"] = {f["file_id"]: f for f in local_files if "file_id" in f}
+
         # Auto-fix if requested
         if auto_fix and missing_remote:
             logger.info(f"Fixing: Removing {len(missing_remote)} deleted files from local state...")
             # Remove from upload_status
+            missing_remote_ids = set(missing_remote)
             updated_files = [
-                f for f in upload_status["files"] if f.get("file_id") not in missing_remote
+                f for f in upload_status["files"] if f.get("file_id") not in missing_remote_ids
             ]
-            upload_status["files"] = updated_files
-            self.current_manager.save_upload_status(upload_status)
+            self.current_manager.save_upload_status({**upload_status, "files": updated_files})
             result["fixed_count"] = len(missing_remote)
             logger.info(f"Removed {len(missing_remote)} files from local state")
 
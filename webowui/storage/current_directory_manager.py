@@ -2,17 +2,117 @@
 Current directory manager for maintaining up-to-date content state.
 """
 
+import copy
 import json
 import logging
+import mmap
+import os
 import shutil
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 from typing import cast
 
+from ..utils.file_copy import fast_copy
+from ..utils.json_io import atomic_write_bytes, dump_json, load_json
 from .metadata_tracker import MetadataTracker
 
 logger = logging.getLogger(__name__)
 
+# Copies are I/O bound, so overlap their syscall latency across a bounded pool
+_COPY_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Size past which the next append first moves the older half of delta_log.jsonl
+# to delta_log_old.jsonl; checked with a stat, so appends never read the log
+_DELTA_LOG_ROTATE_BYTES = 1024 * 1024
+
+
+def _same_contents(a: Path, b: Path, size: int) -> bool:
+    """Byte-compare two files of the given equal size through read-only mmaps."""
+    if size == 0:
+        return True
+    with (
+        open(a, "rb") as fa,
+        open(b, "rb") as fb,
+        mmap.mmap(fa.fileno(), 0, access=mmap.ACCESS_READ) as ma,
+        mmap.mmap(fb.fileno(), 0, access=mmap.ACCESS_READ) as mb,
+        memoryview(ma) as va,
+        memoryview(mb) as vb,
+    ):
+        return va == vb
+
+
+def _copy_one(job: tuple[Path, Path]) -> bool:
+    """Copy a (source, destination) pair if the source exists."""
+    source_file, dest_file = job
+    if not source_file.exists():
+        return False
+    fast_copy(source_file, dest_file)
+    return True
+
+
+def _stat_key(path: Path) -> tuple[int, int, int]:
+    """Identify a file version by (inode, size, mtime_ns); atomic rewrites change the inode."""
+    stat = path.stat()
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+def _diff_file_maps(
+    new_files: dict[str, dict], old_files: dict[str, dict]
+) -> tuple[set[str], set[str], set[str]]:
+    """
+    Diff two url -> file info maps by checksum.
+
+    Uses set operations on the dict key views, so the per-URL work stays in C
+    except for the checksum compare on URLs present on both sides.
+
+    Returns:
+        Tuple of (added, modified, removed) URL sets
+    """
+    added = new_files.keys() - old_files.keys()
+    removed = old_files.keys() - new_files.keys()
+    modified = {
+        url
+        for url in new_files.keys() & old_files.keys()
+        if new_files[url]["checksum"] != old_files[url]["checksum"]
+    }
+    return added, modified, removed
+
+
+def _make_dirs(directories: set[Path]) -> None:
+    """Create each directory once, shallowest first so parents already exist."""
+    for directory in sorted(directories, key=lambda d: len(d.parts)):
+        directory.mkdir(parents=True, exist_ok=True)
+
+
+def _iter_md_entries(root: Path) -> Iterator[tuple[str, os.DirEntry]]:
+    """
+    Yield (relative_path, DirEntry) for every markdown file under root.
+
+    Walks with os.scandir so type checks use the cached dirent type and callers
+    can reuse DirEntry.stat() instead of stat'ing each path again.
+    Relative paths use forward slashes to match metadata filenames.
+    """
+    stack = [("", str(root))]
+    while stack:
+        prefix, path = stack.pop()
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((f"{prefix}{entry.name}/", entry.path))
+                    elif entry.name.endswith(".md") and entry.is_file(follow_symlinks=False):
+                        yield f"{prefix}{entry.name}", entry
+        except FileNotFoundError:
+            continue
+
+
+def _delta_line(entry: dict) -> str:
+    """Serialize a delta entry as a single JSON Lines record."""
+    return json.dumps(entry, separators=(",", ":")) + "\n"
+
 
 class CurrentDirectoryManager:
     """Manages the current/ directory containing latest file versions."""
@@ -31,7 +131,28 @@ class CurrentDirectoryManager:
         self.current_dir = self.site_dir / "current"
         self.content_dir = self.current_dir / "content"
         self.metadata_file = self.current_dir / "metadata.json"
-        self.delta_log_file = self.current_dir / "delta_log.json"
+        self.upload_status_file = self.current_dir / "upload_status.json"
+        self.delta_log_file = self.current_dir / "delta_log.jsonl"
+        self.delta_log_old_file = self.current_dir / "delta_log_old.jsonl"
+
+        # Parsed metadata.json, reused while the file's (inode, size, mtime_ns) is unchanged
+        self._metadata_cache: dict | None = None
+        self._metadata_cache_key: tuple[int, int, int] | None = None
+        # Parsed upload_status.json, cached the same way
+        self._upload_status_cache: dict | None = None
+        self._upload_status_cache_key: tuple[int, int, int] | None = None
+        # url -> file entry index for the metadata dict it was built from
+        self._files_by_url_cache: dict[str, dict] | None = None
+        self._files_by_url_source: dict | None = None
+
+    def refresh(self):
+        """Drop cached metadata and upload status so the next access re-reads disk."""
+        self._metadata_cache = None
+        self._metadata_cache_key = None
+        self._upload_status_cache = None
+        self._upload_status_cache_key = None
+        self._files_by_url_cache = None
+        self._files_by_url_source = None
 
     def update_from_scrape(self, scrape_timestamp: str, metadata_tracker: MetadataTracker) -> dict:
         """
@@ -39,7 +160,7 @@ class CurrentDirectoryManager:
 
         Args:
             scrape_timestamp: Timestamp of the new scrape
-            metadata_tracker: MetadataTracker instance for comparison
+            metadata_tracker: MetadataTracker instance for loading scrape metadata
 
         Returns:
             Summary of changes applied
@@ -64,46 +185,49 @@ class CurrentDirectoryManager:
             logger.warning("Current metadata corrupted, rebuilding")
             return self.rebuild_from_timestamp(scrape_timestamp)
 
-        # Get previous scrape for comparison
+        # Previous source missing (e.g. pruned by retention) - rebuild from the new scrape
         previous_timestamp = current_metadata["current_state"]["source_timestamp"]
-        previous_scrape = metadata_tracker.get_scrape_by_timestamp(previous_timestamp)
-
-        if not previous_scrape:
-            # Previous source missing, rebuild
+        if not (self.site_dir / previous_timestamp / "metadata.json").exists():
             logger.warning(f"Previous source {previous_timestamp} not found, rebuilding")
             return self.rebuild_from_timestamp(scrape_timestamp)
 
-        # Compare scrapes to find changes
-        comparison = metadata_tracker.compare_scrapes(previous_timestamp, scrape_timestamp)
-
-        changes = comparison["changes"]
+        # Diff current/ against the new scrape in one pass of set operations on the
+        # URL key views; current/ already reflects the previous source
+        old_files = self._files_by_url(current_metadata)
         new_files = {f["url"]: f for f in new_scrape.get("files", [])}
+        added, modified, removed = _diff_file_maps(new_files, old_files)
 
-        # Apply changes
-        added_count = 0
-        modified_count = 0
-        removed_count = 0
+        added_to_copy = [new_files[url] for url in added]
+        modified_to_copy = [new_files[url] for url in modified]
 
-        # Add new files
-        for url in changes["added"]:
-            file_info = new_files[url]
-            if self._copy_file_to_current(scrape_timestamp, file_info):
-                added_count += 1
+        # Create each destination directory once instead of per file
+        _make_dirs(
+            {
+                (self.content_dir / file_info["filename"]).parent
+                for file_info in added_to_copy + modified_to_copy
+            }
+        )
 
-        # Update modified files
-        for url in changes["modified"]:
-            file_info = new_files[url]
-            if self._copy_file_to_current(scrape_timestamp, file_info):
-                modified_count += 1
+        # Apply changes: add new files and update modified files concurrently
+        copy_to_current = partial(self._copy_file_to_current, scrape_timestamp)
+        with ThreadPoolExecutor(max_workers=_COPY_WORKERS) as executor:
+            added_results = executor.map(copy_to_current, added_to_copy)
+            modified_results = executor.map(copy_to_current, modified_to_copy)
+            added_count = sum(added_results)
+            modified_count = sum(modified_results)
 
         # Remove deleted files
-        old_files = {f["url"]: f for f in current_metadata.get("files", [])}
-        for url in changes["removed"]:
-            if url in old_files and self._remove_file_from_current(old_files[url]):
+        removed_count = 0
+        removed_parents = set()
+        for url in removed:
+            file_info = old_files[url]
+            if self._remove_file_from_current(file_info):
                 removed_count += 1
+                removed_parents.add((self.content_dir / file_info["filename"]).parent)
+        self._prune_empty_dirs(removed_parents)
 
         # Update metadata
-        self._update_metadata(scrape_timestamp, new_scrape)
+        self._update_metadata(scrape_timestamp, new_scrape, current_metadata)
 
         # Append to delta log
         delta_entry = {
@@ -111,9 +235,9 @@ class CurrentDirectoryManager:
             "operation": "update",
             "changes": {"added": added_count, "modified": modified_count, "removed": removed_count},
             "details": {
-                "added": list(changes["added"]),
-                "modified": list(changes["modified"]),
-                "removed": list(changes["removed"]),
+                "added": list(added),
+                "modified": list(modified),
+                "removed": list(removed),
             },
         }
         self._append_delta_log(delta_entry)
@@ -149,8 +273,7 @@ class CurrentDirectoryManager:
             return {"error": f"Scrape not found: {timestamp}"}
 
         try:
-            with open(metadata_file) as f:
-                scrape_metadata = json.load(f)
+            scrape_metadata = load_json(metadata_file)
         except Exception as e:
             return {"error": f"Failed to load metadata: {e}"}
 
@@ -164,15 +287,16 @@ class CurrentDirectoryManager:
 
         # Copy all files
         source_content_dir = scrape_dir / "content"
-        files_copied = 0
+        copy_jobs = [
+            (source_content_dir / file_info["filename"], self.content_dir / file_info["filename"])
+            for file_info in scrape_metadata.get("files", [])
+        ]
 
-        for file_info in scrape_metadata.get("files", []):
-            source_file = source_content_dir / file_info["filename"]
-            if source_file.exists():
-                dest_file = self.content_dir / file_info["filename"]
-                dest_file.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(source_file, dest_file)
-                files_copied += 1
+        # Create each destination directory once instead of per file
+        _make_dirs({dest_file.parent for _, dest_file in copy_jobs})
+
+        with ThreadPoolExecutor(max_workers=_COPY_WORKERS) as executor:
+            files_copied = sum(executor.map(_copy_one, copy_jobs))
 
         # Create metadata
         self._create_initial_metadata(timestamp, scrape_metadata)
@@ -211,7 +335,10 @@ class CurrentDirectoryManager:
             return None
 
         # Calculate actual size
-        total_size = sum(f.stat().st_size for f in self.content_dir.rglob("*.md") if f.is_file())
+        total_size = sum(
+            entry.stat(follow_symlinks=False).st_size
+            for _, entry in _iter_md_entries(self.content_dir)
+        )
 
         return {
             "exists": True,
@@ -219,7 +346,7 @@ class CurrentDirectoryManager:
             "last_updated": metadata["current_state"]["last_updated"],
             "total_files": len(metadata.get("files", [])),
             "total_size": total_size,
-            "site": metadata["site"],
+            "site": copy.deepcopy(metadata["site"]),
         }
 
     def get_current_source(self) -> str | None:
@@ -256,12 +383,17 @@ class CurrentDirectoryManager:
             issues.append("Metadata file corrupted")
             return issues
 
-        # Check all files in metadata exist
-        missing_files = []
-        for file_info in metadata.get("files", []):
-            file_path = self.content_dir / file_info["filename"]
-            if not file_path.exists():
-                missing_files.append(file_info["filename"])
+        # One scandir sweep serves both checks as set differences
+        metadata_files = {f["filename"] for f in metadata.get("files", [])}
+        actual_files = {rel_path for rel_path, _ in _iter_md_entries(self.content_dir)}
+
+        # Check all files in metadata exist (the sweep only collects .md files,
+        # so anything else is stat'ed individually)
+        missing_files = {
+            filename
+            for filename in metadata_files - actual_files
+            if filename.endswith(".md") or not (self.content_dir / filename).exists()
+        }
 
         if missing_files:
             issues.append(
@@ -269,72 +401,129 @@ class CurrentDirectoryManager:
             )
 
         # Check for orphaned files (in filesystem but not in metadata)
-        metadata_files = {f["filename"] for f in metadata.get("files", [])}
-        actual_files = set()
-        for file_path in self.content_dir.rglob("*.md"):
-            rel_path = file_path.relative_to(self.content_dir)
-            actual_files.add(str(rel_path))
-
         orphaned = actual_files - metadata_files
         if orphaned:
             issues.append(f"{len(orphaned)} orphaned files in filesystem not in metadata")
 
-        # Verify delta log
-        if not self.delta_log_file.exists():
+        # Verify delta log (a legacy delta_log.json is migrated on the next append)
+        if not self.delta_log_file.exists() and not (self.current_dir / "delta_log.json").exists():
             issues.append("Delta log missing")
 
         return issues
 
     def _copy_file_to_current(self, scrape_timestamp: str, file_info: dict) -> bool:
-        """Copy a file from scrape to current directory."""
+        """Copy a file from scrape to current directory (parent directory must exist)."""
         try:
             source_file = self.site_dir / scrape_timestamp / file_info["filepath"]
             dest_file = self.content_dir / file_info["filename"]
 
-            # Create parent directory if needed
-            dest_file.parent.mkdir(parents=True, exist_ok=True)
+            # Skip the copy when dest already holds this source's bytes. Size
+            # and mtime can match for an in-place edit within one mtime tick,
+            # so equal sizes are always confirmed by comparing the bytes
+            src_size = source_file.stat().st_size
+            try:
+                dest_size = dest_file.stat().st_size
+            except FileNotFoundError:
+                pass
+            else:
+                if dest_size == src_size and _same_contents(source_file, dest_file, src_size):
+                    return True
 
-            # Copy file
-            shutil.copy2(source_file, dest_file)
+            # Copy file (caller has already created the parent directory)
+            fast_copy(source_file, dest_file)
             return True
         except Exception as e:
             logger.error(f"Failed to copy {file_info['filename']}: {e}")
             return False
 
     def _remove_file_from_current(self, file_info: dict) -> bool:
-        """Remove a file from current directory."""
+        """Remove a file from current directory (see _prune_empty_dirs for cleanup)."""
         try:
             file_path = self.content_dir / file_info["filename"]
             if file_path.exists():
                 file_path.unlink()
-
-                # Remove empty parent directories
-                parent = file_path.parent
-                while parent != self.content_dir:
-                    if not any(parent.iterdir()):
-                        parent.rmdir()
-                        parent = parent.parent
-                    else:
-                        break
-
                 return True
             return False
         except Exception as e:
             logger.error(f"Failed to remove {file_info['filename']}: {e}")
             return False
 
+    def _prune_empty_dirs(self, directories: set[Path]):
+        """
+        Remove directories left empty by file removals, up to content_dir.
+
+        Deepest directories go first so emptied parents can be removed in turn.
+        rmdir() itself refuses non-empty directories, so no listing is needed.
+        """
+        for directory in sorted(directories, key=lambda d: len(d.parts), reverse=True):
+            while directory != self.content_dir:
+                try:
+                    directory.rmdir()
+                except OSError:
+                    break
+                directory = directory.parent
+
     def _load_metadata(self) -> dict | None:
-        """Load current metadata."""
-        if not self.metadata_file.exists():
+        """
+        Load current metadata, parsing metadata.json on first use.
+
+        The parsed dict is cached and returned as-is while metadata.json is
+        unchanged on disk, so it must not leave this class: public methods
+        hand out copies. Only _update_metadata mutates it, and it always
+        writes the result back.
+        """
+        try:
+            key = _stat_key(self.metadata_file)
+        except FileNotFoundError:
             return None
+        except Exception as e:
+            logger.error(f"Failed to load metadata: {e}")
+            return None
+
+        if self._metadata_cache is not None and key == self._metadata_cache_key:
+            return self._metadata_cache
 
         try:
-            with open(self.metadata_file) as f:
-                return cast(dict | None, json.load(f))
+            metadata = cast(dict | None, load_json(self.metadata_file))
         except Exception as e:
             logger.error(f"Failed to load metadata: {e}")
+            self._metadata_cache = None
+            self._metadata_cache_key = None
             return None
 
+        self._metadata_cache = metadata
+        self._metadata_cache_key = key
+        return metadata
+
+    def _files_by_url(self, metadata: dict) -> dict[str, dict]:
+        """
+        Return a url -> file entry index for metadata.
+
+        The index is kept until metadata is replaced or rewritten, so repeated
+        lookups against the same metadata don't rebuild it. Entries are shared
+        with metadata, not copied.
+        """
+        if self._files_by_url_cache is None or self._files_by_url_source is not metadata:
+            self._files_by_url_cache = {f["url"]: f for f in metadata.get("files", [])}
+            self._files_by_url_source = metadata
+        return self._files_by_url_cache
+
+    def _write_metadata(self, metadata: dict):
+        """Write metadata.json and keep the in-memory copy in sync."""
+        # Files may have been added or dropped, so the url index is rebuilt on next use
+        self._files_by_url_cache = None
+        self._files_by_url_source = None
+        try:
+            dump_json(metadata, self.metadata_file)
+            key = _stat_key(self.metadata_file)
+        except Exception:
+            self._metadata_cache = None
+            self._metadata_cache_key = None
+            raise
+
+        self._metadata_cache = metadata
+        self._metadata_cache_key = key
+
     def _create_initial_metadata(self, timestamp: str, scrape_metadata: dict):
         """Create initial metadata for current directory."""
         metadata = {
@@ -351,12 +540,14 @@ class CurrentDirectoryManager:
             ],
         }
 
-        with open(self.metadata_file, "w") as f:
-            json.dump(metadata, f, indent=2)
+        self._write_metadata(metadata)
 
-    def _update_metadata(self, timestamp: str, scrape_metadata: dict):
+    def _update_metadata(
+        self, timestamp: str, scrape_metadata: dict, current_metadata: dict | None = None
+    ):
         """Update metadata after applying changes."""
-        current_metadata = self._load_metadata()
+        if current_metadata is None:
+            current_metadata = self._load_metadata()
 
         # Add None check
         if not current_metadata:
@@ -364,7 +555,7 @@ class CurrentDirectoryManager:
             return
 
         # Create lookup of current files
-        current_files = {f["url"]: f for f in current_metadata.get("files", [])}
+        current_files = self._files_by_url(current_metadata)
 
         # Update with new scrape files
         new_files = []
@@ -391,59 +582,67 @@ class CurrentDirectoryManager:
         }
         current_metadata["files"] = new_files
 
-        with open(self.metadata_file, "w") as f:
-            json.dump(current_metadata, f, indent=2)
+        self._write_metadata(current_metadata)
+
+    def _migrate_legacy_delta_log(self):
+        """Convert legacy delta_log.json / delta_log_old.json files to JSON Lines once."""
+        for legacy_name, jsonl_file in (
+            ("delta_log.json", self.delta_log_file),
+            ("delta_log_old.json", self.delta_log_old_file),
+        ):
+            legacy_file = self.current_dir / legacy_name
+            if not legacy_file.exists() or jsonl_file.exists():
+                continue
+
+            try:
+                deltas = load_json(legacy_file).get("deltas", [])
+                atomic_write_bytes(jsonl_file, "".join(map(_delta_line, deltas)).encode())
+                legacy_file.unlink()
+                logger.info(f"Migrated {legacy_name} to {jsonl_file.name} ({len(deltas)} entries)")
+            except Exception as e:
+                logger.warning(f"Failed to migrate {legacy_name}: {e}")
 
     def _create_delta_log(self, initial_entry: dict):
         """Create new delta log with initial entry."""
-        delta_log = {"deltas": [initial_entry]}
-
-        with open(self.delta_log_file, "w") as f:
-            json.dump(delta_log, f, indent=2)
+        atomic_write_bytes(self.delta_log_file, _delta_line(initial_entry).encode())
 
     def _append_delta_log(self, delta_entry: dict):
-        """Append entry to delta log with simple rotation."""
-
-        if not self.delta_log_file.exists():
-            self._create_delta_log(delta_entry)
-            return
+        """Append entry to delta log, rotating it once it grows past _DELTA_LOG_ROTATE_BYTES."""
+        self._migrate_legacy_delta_log()
 
         try:
-            with open(self.delta_log_file) as f:
-                delta_log = json.load(f)
-        except Exception as e:
-            logger.error(f"Failed to load delta log: {e}")
+            size = self.delta_log_file.stat().st_size
+        except FileNotFoundError:
             self._create_delta_log(delta_entry)
             return
 
-        deltas = delta_log.get("deltas", [])
-
-        # Rotate log if it exceeds 100 entries
-        if len(deltas) > 100:
-            # Archive oldest entries to delta_log_old.json
-            old_file = self.current_dir / "delta_log_old.json"
-            old_deltas = []
-            if old_file.exists():
-                try:
-                    with open(old_file) as f:
-                        old_deltas = json.load(f).get("deltas", [])
-                except Exception:
-                    old_deltas = []
-
-            # Move oldest 50 entries to archive
-            old_deltas.extend(deltas[:50])
-            with open(old_file, "w") as f:
-                json.dump({"deltas": old_deltas}, f, indent=2)
-
-            # Retain only the most recent 50 entries in the active log
-            delta_log["deltas"] = deltas[50:]
-            logger.info("Delta log rotated: moved 50 old entries to delta_log_old.json")
+        # Only a rotation reads the log; a plain append never does
+        if size > _DELTA_LOG_ROTATE_BYTES:
+            self._rotate_delta_log()
+
+        with open(self.delta_log_file, "ab+") as f:
+            # Terminate any partial line left by an interrupted write
+            if f.seek(0, os.SEEK_END):
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+            f.write(_delta_line(delta_entry).encode())
+
+    def _rotate_delta_log(self):
+        """Move the older half of the delta log's entries to delta_log_old.jsonl."""
+        with open(self.delta_log_file, "rb") as f:
+            lines = f.readlines()
+
+        archived = len(lines) // 2
+        if not archived:
+            return
 
-        # Append new entry
-        delta_log["deltas"].append(delta_entry)
+        with open(self.delta_log_old_file, "ab") as f:
+            f.writelines(lines[:archived])
 
-        with open(self.delta_log_file, "w") as f:
-            json.dump(delta_log, f, indent=2)
+        # Retain only the most recent entries in the active log
+        atomic_write_bytes(self.delta_log_file, b"".join(lines[archived:]))
+        logger.info(f"Delta log rotated: moved {archived} old entries to delta_log_old.jsonl")
 
     def get_files_for_upload(self, incremental: bool = True) -> dict:
         """
@@ -462,66 +661,53 @@ class CurrentDirectoryManager:
         if not metadata:
             return {"error": "Failed to load metadata"}
 
-        current_files = {f["url"]: f for f in metadata.get("files", [])}
+        current_files = self._files_by_url(metadata)
 
         if not incremental:
             # Full upload - return all current files
             return {
-                "upload": list(current_files.values()),
+                "upload": [dict(f) for f in current_files.values()],
                 "delete": [],
                 "previous_file_map": {},
                 "summary": f"Full upload: {len(current_files)} files",
             }
 
         # Incremental upload - compare with last upload
-        upload_status_file = self.current_dir / "upload_status.json"
-
-        if not upload_status_file.exists():
+        if not self.upload_status_file.exists():
             # First upload - all files are new
             return {
-                "upload": list(current_files.values()),
+                "upload": [dict(f) for f in current_files.values()],
                 "delete": [],
                 "previous_file_map": {},
                 "summary": f"Initial upload: {len(current_files)} files",
             }
 
-        try:
-            with open(upload_status_file) as f:
-                upload_status = json.load(f)
-        except Exception as e:
-            logger.error(f"Failed to load upload status: {e}")
+        upload_status = self._load_upload_status()
+        if upload_status is None:
             # If can't read upload status, do full upload
             return {
-                "upload": list(current_files.values()),
+                "upload": [dict(f) for f in current_files.values()],
                 "delete": [],
                 "previous_file_map": {},
                 "summary": f"Full upload (status corrupt): {len(current_files)} files",
             }
 
-        # Build file_id_map and checksum map from previous upload
+        # Build file_id_map and url -> file map from previous upload
         previous_file_map = {}  # URL -> file_id
-        last_uploaded = {}  # URL -> checksum
+        uploaded_files = {}  # URL -> uploaded file info (carries its checksum)
 
         for file_info in upload_status.get("files", []):
             url = file_info["url"]
-            last_uploaded[url] = file_info["checksum"]
+            uploaded_files[url] = file_info
             if "file_id" in file_info:
                 previous_file_map[url] = file_info["file_id"]
 
-        # Find files to upload (new or modified)
-        to_upload = []
-        for url, file_info in current_files.items():
-            if url not in last_uploaded:
-                # New file
-                to_upload.append(file_info)
-            elif file_info["checksum"] != last_uploaded[url]:
-                # Modified file
-                to_upload.append(file_info)
-
-        # Find files to delete (in last upload but not in current)
-        current_urls = set(current_files.keys())
-        last_urls = set(last_uploaded.keys())
-        to_delete_urls = list(last_urls - current_urls)
+        # Same diff as update_from_scrape: new or modified files are uploaded,
+        # files only in the last upload are deleted
+        added, modified, removed = _diff_file_maps(current_files, uploaded_files)
+        changed = added | modified
+        to_upload = [dict(file_info) for url, file_info in current_files.items() if url in changed]
+        to_delete_urls = list(removed)
 
         # Get knowledge_id from previous upload
         knowledge_id = upload_status.get("knowledge_id")
@@ -554,7 +740,7 @@ class CurrentDirectoryManager:
         file_id_map = upload_result.get("file_id_map", {})
 
         # BUGFIX: Load previous upload_status to check for rebuild metadata and checksums
-        previous_upload_status = self.get_upload_status()
+        previous_upload_status = self._load_upload_status()
         was_rebuild = previous_upload_status and previous_upload_status.get(
             "rebuilt_from_remote", False
         )
@@ -563,6 +749,20 @@ class CurrentDirectoryManager:
         # This is critical for the FIRST save after rebuild
         is_current_rebuild = upload_result.get("rebuilt_from_remote", False)
 
+        # Index checksums by URL once instead of scanning both file lists per file.
+        # setdefault keeps the first entry carrying a checksum, as the scans did.
+        rebuilt_checksums: dict[str, str] = {}
+        if is_current_rebuild:
+            for result_file in upload_result.get("files", []):
+                if "url" in result_file and "checksum" in result_file:
+                    rebuilt_checksums.setdefault(result_file["url"], result_file["checksum"])
+
+        previous_checksums: dict[str, str] = {}
+        if was_rebuild and previous_upload_status:
+            for prev_file in previous_upload_status.get("files", []):
+                if "url" in prev_file and "checksum" in prev_file:
+                    previous_checksums.setdefault(prev_file["url"], prev_file["checksum"])
+
         # Enhance file metadata with file_ids
         files_with_ids = []
         for file_info in metadata.get("files", []):
@@ -575,27 +775,17 @@ class CurrentDirectoryManager:
 
             # BUGFIX #2: If THIS is a current rebuild, DO NOT overwrite the checksums!
             # The checksums in upload_result may belong to uploaded remote hashes.
-            if is_current_rebuild:
-                # Check if this file was in the upload_result files with checksum
-                for result_file in upload_result.get("files", []):
-                    if result_file.get("url") == url and "checksum" in result_file:
-                        # Use checksum from rebuilt state (may be remote hash)
-                        file_entry["checksum"] = result_file["checksum"]
-                        logger.debug(f"Preserving rebuilt checksum for {file_info.get('filename')}")
-                        break
+            if url in rebuilt_checksums:
+                # Use checksum from rebuilt state (may be remote hash)
+                file_entry["checksum"] = rebuilt_checksums[url]
+                logger.debug(f"Preserving rebuilt checksum for {file_info.get('filename')}")
 
             # BUGFIX (continued): If previous upload was a rebuild and no remote checksum for this file,
             # fallback to preserving the remote hash from the previous
             # rebuild.
-            if was_rebuild and previous_upload_status:
-                for prev_file in previous_upload_status.get("files", []):
-                    if prev_file["url"] == url and "checksum" in prev_file:
-                        if url not in file_id_map:
-                            file_entry["checksum"] = prev_file["checksum"]
-                            logger.debug(
-                                f"Falling back to previous checksum for {file_info.get('filename')}"
-                            )
-                        break
+            if url in previous_checksums and url not in file_id_map:
+                file_entry["checksum"] = previous_checksums[url]
+                logger.debug(f"Falling back to previous checksum for {file_info.get('filename')}")
 
             files_with_ids.append(file_entry)
 
@@ -622,15 +812,17 @@ class CurrentDirectoryManager:
                 f"match_rate={upload_status['rebuild_match_rate']}"
             )
 
-        upload_status_file = self.current_dir / "upload_status.json"
-
         try:
-            with open(upload_status_file, "w") as f:
-                json.dump(upload_status, f, indent=2)
+            dump_json(upload_status, self.upload_status_file)
+            self._upload_status_cache = upload_status
+            self._upload_status_cache_key = _stat_key(self.upload_status_file)
             logger.info(
-                f"Saved upload status with {len(files_with_ids)} file IDs to {upload_status_file}"
+                f"Saved upload status with {len(files_with_ids)} file IDs "
+                f"to {self.upload_status_file}"
             )
         except Exception as e:
+            self._upload_status_cache = None
+            self._upload_status_cache_key = None
             logger.error(f"Failed to save upload status: {e}")
 
     def get_upload_status(self) -> dict | None:
@@ -638,16 +830,38 @@ class CurrentDirectoryManager:
         Get last upload status.
 
         Returns:
-            Upload status dictionary or None if never uploaded
+            Upload status dictionary or None if never uploaded (or unreadable);
+            a copy, so callers are free to modify it
         """
-        upload_status_file = self.current_dir / "upload_status.json"
+        upload_status = self._load_upload_status()
+        return copy.deepcopy(upload_status) if upload_status is not None else None
 
-        if not upload_status_file.exists():
+    def _load_upload_status(self) -> dict | None:
+        """
+        Load upload_status.json, parsing it on first use.
+
+        The parsed dict is cached while upload_status.json is unchanged on disk
+        and is shared, so it must not be modified or leave this class.
+        """
+        try:
+            key = _stat_key(self.upload_status_file)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.error(f"Failed to load upload status: {e}")
             return None
 
+        if self._upload_status_cache is not None and key == self._upload_status_cache_key:
+            return self._upload_status_cache
+
         try:
-            with open(upload_status_file) as f:
-                return cast(dict | None, json.load(f))
+            upload_status = cast(dict | None, load_json(self.upload_status_file))
         except Exception as e:
             logger.error(f"Failed to load upload status: {e}")
+            self._upload_status_cache = None
+            self._upload_status_cache_key = None
             return None
+
+        self._upload_status_cache = upload_status
+        self._upload_status_cache_key = key
+        return upload_status
@@ -2,15 +2,111 @@
 Metadata tracker for managing scrape history and incremental updates.
 """
 
-import json
+import copy
+import hashlib
 import logging
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
 from typing import cast
 
+from ..utils.json_io import dump_json, load_json
+
 logger = logging.getLogger(__name__)
 
 
+# Parsed metadata.json files a tracker keeps, newest scrapes first; the latest
+# scrape and its predecessor are what diffs and page reuse read repeatedly
+_METADATA_CACHE_SCRAPES = 4
+
+
+def _copy_scrape_metadata(metadata: dict, scrape_dir: str) -> dict:
+    """
+    Copy cached scrape metadata for a caller and set scrape_dir.
+
+    File entries hold only scalar values, so copying each entry dict is enough
+    for them; the remaining (small) values are deep-copied.
+    """
+    copied = {key: copy.deepcopy(value) for key, value in metadata.items() if key != "files"}
+    if "files" in metadata:
+        copied["files"] = [dict(f) for f in metadata["files"]]
+    copied["scrape_dir"] = scrape_dir
+    return copied
+
+
+def files_root_hash(files: list[dict]) -> str:
+    """
+    Hash a scrape's file list into a single digest.
+
+    Two scrapes with the same set of (url, checksum) pairs get the same hash,
+    regardless of the order the files were saved in.
+
+    Args:
+        files: File entries with url and checksum
+
+    Returns:
+        SHA-256 hex digest
+    """
+    digest = hashlib.sha256()
+    for url, checksum in sorted((f["url"], f["checksum"]) for f in files):
+        digest.update(f"{url}\t{checksum}\n".encode())
+    return digest.hexdigest()
+
+
+def _sorted_pairs(files: list[dict]) -> list[tuple[str, str]]:
+    """Return (url, checksum) pairs sorted by URL, one per URL (the last in file order)."""
+    # Stable sort on the URL alone keeps duplicates in file order
+    pairs = sorted(((f["url"], f["checksum"]) for f in files), key=itemgetter(0))
+    # Duplicate URLs end up adjacent; keep the last of each run, as a url -> checksum dict would
+    return [p for i, p in enumerate(pairs) if i + 1 == len(pairs) or pairs[i + 1][0] != p[0]]
+
+
+def _merge_diff(
+    old_pairs: list[tuple[str, str]], new_pairs: list[tuple[str, str]]
+) -> tuple[list[str], list[str], list[str], list[str]]:
+    """
+    Diff two URL-sorted (url, checksum) lists with a single merge walk.
+
+    Returns:
+        (added, removed, modified, unchanged) URL lists, each in URL order
+    """
+    added: list[str] = []
+    removed: list[str] = []
+    modified: list[str] = []
+    unchanged: list[str] = []
+
+    i = j = 0
+    while i < len(old_pairs) and j < len(new_pairs):
+        old_url, old_checksum = old_pairs[i]
+        new_url, new_checksum = new_pairs[j]
+        if old_url == new_url:
+            (unchanged if old_checksum == new_checksum else modified).append(new_url)
+            i += 1
+            j += 1
+        elif old_url < new_url:
+            removed.append(old_url)
+            i += 1
+        else:
+            added.append(new_url)
+            j += 1
+
+    removed.extend(url for url, _ in old_pairs[i:])
+    added.extend(url for url, _ in new_pairs[j:])
+    return added, removed, modified, unchanged
+
+
+def _remove_scrape_dir(scrape_dir: Path) -> Exception | None:
+    """Delete a scrape directory, returning the error instead of raising it."""
+    try:
+        shutil.rmtree(scrape_dir)
+    except Exception as e:
+        return e
+    return None
+
+
 class MetadataTracker:
     """Track scrape metadata for incremental updates."""
 
@@ -18,91 +114,147 @@ class MetadataTracker:
         self.base_output_dir = base_output_dir
         self.site_name = site_name
         self.site_dir = base_output_dir / site_name
+        # scrape_dir -> (mtime_ns, size, parsed metadata.json); see _read_scrape_metadata
+        self._metadata_cache: dict[str, tuple[int, int, dict]] = {}
 
-    def get_all_scrapes(self) -> list[dict]:
-        """Get list of all scrapes for this site."""
-        if not self.site_dir.exists():
+    def _read_scrape_metadata(self, scrape_dir: str) -> dict:
+        """
+        Parse a scrape's metadata.json, reusing the parse while the file is unchanged.
+
+        Only the _METADATA_CACHE_SCRAPES newest scrapes are kept. The returned
+        dict is shared with the cache, so it must not be modified or handed
+        out; public methods return _copy_scrape_metadata() copies.
+
+        Raises:
+            FileNotFoundError: If the scrape has no metadata.json (yet)
+        """
+        metadata_file = os.path.join(scrape_dir, "metadata.json")
+        try:
+            stat = os.stat(metadata_file)
+        except FileNotFoundError:
+            self._metadata_cache.pop(scrape_dir, None)
+            raise
+
+        cached = self._metadata_cache.get(scrape_dir)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+
+        metadata = cast(dict, load_json(Path(metadata_file)))
+        self._metadata_cache[scrape_dir] = (stat.st_mtime_ns, stat.st_size, metadata)
+        if len(self._metadata_cache) > _METADATA_CACHE_SCRAPES:
+            # Scrape directories are named by timestamp, so the smallest name is the oldest
+            del self._metadata_cache[min(self._metadata_cache, key=os.path.basename)]
+        return metadata
+
+    def _scrapes(self) -> list[tuple[str, dict]]:
+        """Return (scrape_dir, shared metadata) for every scrape, newest first."""
+        try:
+            # scandir's DirEntry caches the d_type from getdents, so is_dir() needs no stat
+            with os.scandir(self.site_dir) as it:
+                entries = sorted(
+                    (
+                        (entry.name, entry.path)
+                        for entry in it
+                        # Skip current directory - it has different metadata structure
+                        if entry.name != "current" and entry.is_dir(follow_symlinks=False)
+                    ),
+                    reverse=True,
+                )
+        except FileNotFoundError:
             return []
 
         scrapes = []
-        for scrape_dir in sorted(self.site_dir.iterdir(), reverse=True):
-            # Skip current directory - it has different metadata structure
-            if scrape_dir.is_dir() and scrape_dir.name != "current":
-                metadata_file = scrape_dir / "metadata.json"
-                if metadata_file.exists():
-                    try:
-                        with open(metadata_file) as f:
-                            metadata = json.load(f)
-                            metadata["scrape_dir"] = str(scrape_dir)
-                            scrapes.append(metadata)
-                    except Exception as e:
-                        logger.warning(f"Failed to load metadata from {metadata_file}: {e}")
+        for _, scrape_dir in entries:
+            try:
+                scrapes.append((scrape_dir, self._read_scrape_metadata(scrape_dir)))
+            except FileNotFoundError:
+                # Scrape still in progress (or abandoned) - no metadata.json yet
+                continue
+            except Exception as e:
+                logger.warning(f"Failed to load metadata from {scrape_dir}/metadata.json: {e}")
 
         return scrapes
 
+    def _scrape_by_timestamp(self, timestamp: str) -> dict | None:
+        """Return a scrape's shared metadata, or None if it can't be loaded."""
+        try:
+            return self._read_scrape_metadata(os.path.join(self.site_dir, timestamp))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.error(f"Failed to load metadata: {e}")
+            return None
+
+    def get_all_scrapes(self) -> list[dict]:
+        """Get list of all scrapes for this site."""
+        return [
+            _copy_scrape_metadata(metadata, scrape_dir) for scrape_dir, metadata in self._scrapes()
+        ]
+
     def get_latest_scrape(self) -> dict | None:
         """Get metadata from the most recent scrape."""
-        scrapes = self.get_all_scrapes()
-        return scrapes[0] if scrapes else None
+        scrapes = self._scrapes()
+        if not scrapes:
+            return None
+        scrape_dir, metadata = scrapes[0]
+        return _copy_scrape_metadata(metadata, scrape_dir)
 
     def get_scrape_by_timestamp(self, timestamp: str) -> dict | None:
         """Get metadata for a specific scrape by timestamp."""
-        scrape_dir = self.site_dir / timestamp
-        metadata_file = scrape_dir / "metadata.json"
-
-        if not metadata_file.exists():
-            return None
-
-        try:
-            with open(metadata_file) as f:
-                metadata = json.load(f)
-                metadata["scrape_dir"] = str(scrape_dir)
-                return cast(dict | None, metadata)
-        except Exception as e:
-            logger.error(f"Failed to load metadata: {e}")
+        metadata = self._scrape_by_timestamp(timestamp)
+        if metadata is None:
             return None
+        return _copy_scrape_metadata(metadata, os.path.join(self.site_dir, timestamp))
 
     def compare_scrapes(self, old_timestamp: str, new_timestamp: str) -> dict:
-        """Compare two scrapes to identify changes."""
-        old_scrape = self.get_scrape_by_timestamp(old_timestamp)
-        new_scrape = self.get_scrape_by_timestamp(new_timestamp)
-
-        if not old_scrape or not new_scrape:
-            return {"error": "One or both scrapes not found"}
-
-        old_files = {f["url"]: f for f in old_scrape.get("files", [])}
-        new_files = {f["url"]: f for f in new_scrape.get("files", [])}
+        """
+        Compare two scrapes to identify changes.
 
-        old_urls = set(old_files.keys())
-        new_urls = set(new_files.keys())
+        Args:
+            old_timestamp: Base scrape
+            new_timestamp: Scrape to compare against the base
 
-        # Identify changes
-        added = new_urls - old_urls
-        removed = old_urls - new_urls
-        common = old_urls & new_urls
+        Returns:
+            Comparison dict, or {"error": ...} if either scrape is missing
+        """
+        old_scrape = self._scrape_by_timestamp(old_timestamp)
+        new_scrape = self._scrape_by_timestamp(new_timestamp)
 
-        # Check for modifications
-        modified = set()
-        for url in common:
-            if old_files[url]["checksum"] != new_files[url]["checksum"]:
-                modified.add(url)
+        if not old_scrape or not new_scrape:
+            return {"error": "One or both scrapes not found"}
 
-        unchanged = common - modified
+        old_files = old_scrape.get("files", [])
+        new_files = new_scrape.get("files", [])
+        old_hash = old_scrape.get("files_root_hash")
+        same_files = bool(old_hash) and old_hash == new_scrape.get("files_root_hash")
+
+        if same_files:
+            # Same (url, checksum) set on both sides - nothing to diff
+            added: list[str] = []
+            removed: list[str] = []
+            modified: list[str] = []
+            unchanged = [url for url, _ in _sorted_pairs(new_files)]
+            old_total = new_total = len(unchanged)
+        else:
+            old_pairs = _sorted_pairs(old_files)
+            new_pairs = _sorted_pairs(new_files)
+            added, removed, modified, unchanged = _merge_diff(old_pairs, new_pairs)
+            old_total, new_total = len(old_pairs), len(new_pairs)
 
         return {
             "old_scrape": {
                 "timestamp": old_timestamp,
-                "total_files": len(old_files),
+                "total_files": old_total,
             },
             "new_scrape": {
                 "timestamp": new_timestamp,
-                "total_files": len(new_files),
+                "total_files": new_total,
             },
             "changes": {
-                "added": list(added),
-                "removed": list(removed),
-                "modified": list(modified),
-                "unchanged": list(unchanged),
+                "added": added,
+                "removed": removed,
+                "modified": modified,
+                "unchanged": unchanged,
             },
             "statistics": {
                 "added_count": len(added),
@@ -117,14 +269,15 @@ class MetadataTracker:
         Get files that changed since a previous scrape.
         If base_timestamp is None, use the most recent scrape.
         """
+        # One scan serves both the latest scrape and the default base
+        scrapes = [metadata for _, metadata in self._scrapes()]
+        latest_scrape = scrapes[0] if scrapes else None
+
         if base_timestamp:
-            base_scrape = self.get_scrape_by_timestamp(base_timestamp)
+            base_scrape = self._scrape_by_timestamp(base_timestamp)
         else:
-            scrapes = self.get_all_scrapes()
             base_scrape = scrapes[1] if len(scrapes) > 1 else None
 
-        latest_scrape = self.get_latest_scrape()
-
         if not latest_scrape:
             # Return empty sets instead of error string
             return {
@@ -141,14 +294,21 @@ class MetadataTracker:
                 "removed": set(),
             }
 
-        comparison = self.compare_scrapes(
-            base_scrape["scrape"]["timestamp"], latest_scrape["scrape"]["timestamp"]
+        base_hash = base_scrape.get("files_root_hash")
+        if base_hash and base_hash == latest_scrape.get("files_root_hash"):
+            return {"added": set(), "modified": set(), "removed": set()}
+
+        # Diff the already-loaded scrapes directly: compare_scrapes would load
+        # them again and build the unchanged list and report dict we don't need
+        added, removed, modified, _ = _merge_diff(
+            _sorted_pairs(base_scrape.get("files", [])),
+            _sorted_pairs(latest_scrape.get("files", [])),
         )
 
         return {
-            "added": set(comparison["changes"]["added"]),
-            "modified": set(comparison["changes"]["modified"]),
-            "removed": set(comparison["changes"]["removed"]),
+            "added": set(added),
+            "modified": set(modified),
+            "removed": set(removed),
         }
 
     def get_upload_status(self, timestamp: str) -> dict | None:
@@ -170,8 +330,7 @@ class MetadataTracker:
             }
 
         try:
-            with open(upload_file) as f:
-                return cast(dict | None, json.load(f))
+            return cast(dict | None, load_json(upload_file))
         except Exception as e:
             logger.error(f"Failed to load upload status: {e}")
             return None
@@ -189,28 +348,28 @@ class MetadataTracker:
         upload_data = {"uploaded": True, "timestamp": datetime.now().isoformat(), **upload_info}
 
         try:
-            with open(upload_file, "w") as f:
-                json.dump(upload_data, f, indent=2)
+            dump_json(upload_data, upload_file)
             logger.info(f"Saved upload status to {upload_file}")
         except Exception as e:
             logger.error(f"Failed to save upload status: {e}")
 
     def cleanup_old_scrapes(self, keep_count: int = 5):
         """Remove old scrapes, keeping only the most recent ones."""
-        scrapes = self.get_all_scrapes()
+        scrapes = self._scrapes()
 
         if len(scrapes) <= keep_count:
             logger.info(f"Only {len(scrapes)} scrapes, nothing to clean up")
             return
 
-        to_remove = scrapes[keep_count:]
-
-        for scrape in to_remove:
-            scrape_dir = Path(scrape["scrape_dir"])
-            try:
-                import shutil
-
-                shutil.rmtree(scrape_dir)
-                logger.info(f"Removed old scrape: {scrape_dir}")
-            except Exception as e:
-                logger.error(f"Failed to remove {scrape_dir}: {e}")
+        to_remove = [Path(scrape_dir) for scrape_dir, _ in scrapes[keep_count:]]
+
+        # rmtree is one unlink per file; independent trees can be removed side by side
+        with ThreadPoolExecutor(max_workers=min(8, len(to_remove))) as executor:
+            for scrape_dir, error in zip(
+                to_remove, executor.map(_remove_scrape_dir, to_remove), strict=True
+            ):
+                if error:
+                    logger.error(f"Failed to remove {scrape_dir}: {error}")
+                else:
+                    self._metadata_cache.pop(str(scrape_dir), None)
+                    logger.info(f"Removed old scrape: {scrape_dir}")
@@ -5,18 +5,48 @@ Output manager for saving scraped content.
 import hashlib
 import json
 import logging
+import os
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING, cast
 
 from slugify import slugify  # type: ignore
 
 from ..config import SiteConfig
 from ..scraper.crawler import CrawlResult
+from ..utils.file_copy import fast_copy
+from ..utils.json_io import dump_json, dump_json_streaming
 from .current_directory_manager import CurrentDirectoryManager
-from .metadata_tracker import MetadataTracker
+from .metadata_tracker import MetadataTracker, files_root_hash
+
+if TYPE_CHECKING:
+    from ..scraper.cleaning_profiles.base import BaseCleaningProfile
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever _add_frontmatter or the saved page layout changes, so pages
+# reused from earlier scrapes are rebuilt in the new format
+_OUTPUT_FORMAT_VERSION = 1
+
+
+@lru_cache(maxsize=4096)
+def _slugify_part(part: str) -> str:
+    """Slugify one URL path component; pages in a crawl share most of their prefixes."""
+    return cast(str, slugify(part))
+
+
+def _write_file(path: str | Path, data: bytes) -> None:
+    """Write data to path with raw os calls, skipping the buffered file object."""
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    fd = os.open(path, flags, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+    finally:
+        os.close(fd)
+
 
 class OutputManager:
     """Manages output directory structure and file saving."""
@@ -38,6 +68,11 @@ class OutputManager:
         self.failed_urls: list[dict] = []
         self.total_content_size = 0
         self.timestamp = timestamp
+        self._cleaning_profile: BaseCleaningProfile | None = None
+        self._dirs_created: set[str] = set()
+        self._previous_files: tuple[str, dict[str, dict]] | None = None
+        # sha256 state after hashing the per-site part of _source_checksum
+        self._source_digest_prefix: hashlib._Hash | None = None
 
     def save_page(self, result: CrawlResult) -> dict | None:
         """Save a single page result (public method for streaming)."""
@@ -97,18 +132,25 @@ class OutputManager:
         try:
             # Create filename from URL
             filename = self._url_to_filename(result.url)
-            filepath = self.content_dir / filename
+            # Plain string paths: this runs per page and Path objects aren't needed here
+            filepath = os.path.join(self.content_dir, filename)
 
-            # Ensure parent directory exists
-            filepath.parent.mkdir(parents=True, exist_ok=True)
+            # Ensure parent directory exists (once per directory, not once per page)
+            parent = os.path.dirname(filepath)
+            if parent not in self._dirs_created:
+                os.makedirs(parent, exist_ok=True)
+                self._dirs_created.add(parent)
 
-            # NEW: Get cleaning profile and apply
-            from ..scraper.cleaning_profiles import CleaningProfileRegistry
+            # Unchanged source since the last scrape: copy its output instead of re-cleaning
+            source_checksum = self._source_checksum(result.markdown)
+            reused = self._reuse_previous_output(result, filename, filepath, source_checksum)
+            if reused:
+                return reused
 
+            # NEW: Get cleaning profile and apply
+            reusable = True
             try:
-                profile = CleaningProfileRegistry.get_profile(
-                    self.config.cleaning_profile_name, self.config.cleaning_profile_config
-                )
+                profile = self._get_cleaning_profile()
 
                 cleaned_markdown = profile.clean(
                     result.markdown, metadata={"url": result.url, "site_config": self.config}
@@ -126,31 +168,136 @@ class OutputManager:
                 )
                 logger.warning(f"Using raw content for {result.url}")
                 cleaned_markdown = result.markdown
+                # Raw fallback output must not be reused once the profile works again
+                reusable = False
 
             # Add frontmatter to cleaned markdown
             content = self._add_frontmatter(result, cleaned_markdown)
 
-            # Write file
-            filepath.write_text(content, encoding="utf-8")
+            # Encode once: the same bytes are written and hashed
+            data = content.encode("utf-8")
+            _write_file(filepath, data)
 
             # Calculate checksum (using SHA-256 instead of deprecated MD5)
-            checksum = hashlib.sha256(content.encode()).hexdigest()
+            checksum = hashlib.sha256(data).hexdigest()
 
-            return {
+            file_info = {
                 "url": result.url,
-                "filepath": str(filepath.relative_to(self.output_dir)),
+                "filepath": os.path.normpath(os.path.join("content", filename)),
                 "filename": filename,
-                "size": len(content),
+                "size": len(data),
                 "checksum": checksum,
                 "timestamp": result.timestamp.isoformat(),
                 "cleaned": True,  # Mark as cleaned for tracking
                 "cleaning_profile": self.config.cleaning_profile_name,  # NEW: Track which profile was used
             }
+            if reusable:
+                file_info["source_checksum"] = source_checksum
+            return file_info
 
         except Exception as e:
             logger.error(f"Failed to save {result.url}: {e}")
             return None
 
+    def _source_checksum(self, markdown: str) -> str:
+        """
+        Hash a page's raw markdown together with everything that shapes its output.
+
+        The profile name, config and CLEANING_VERSION, the site display name
+        (frontmatter) and the output format version are included, so changing
+        any of them invalidates reuse of earlier output. They are the same for
+        every page, so their digest is built once and copied per page.
+        """
+        if self._source_digest_prefix is None:
+            prefix = hashlib.sha256()
+            prefix.update(
+                json.dumps(
+                    [
+                        self.config.cleaning_profile_name,
+                        self.config.cleaning_profile_config,
+                        self._cleaning_version(),
+                        self.config.display_name,
+                        _OUTPUT_FORMAT_VERSION,
+                    ],
+                    sort_keys=True,
+                    default=str,
+                ).encode()
+            )
+            self._source_digest_prefix = prefix
+
+        digest = self._source_digest_prefix.copy()
+        digest.update(markdown.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _cleaning_version(self) -> int | None:
+        """Return the profile's CLEANING_VERSION, or None if it can't be loaded."""
+        try:
+            profile = self._get_cleaning_profile()
+        except Exception:
+            # _save_page reports the failure and saves raw, non-reusable output
+            return None
+        return getattr(type(profile), "CLEANING_VERSION", None)
+
+    def _get_previous_files(self) -> tuple[str, dict[str, dict]]:
+        """Return (scrape_dir, files by URL) of the latest earlier scrape, loaded once."""
+        if self._previous_files is None:
+            latest = MetadataTracker(self.base_output_dir, self.config.name).get_latest_scrape()
+            if latest:
+                by_url = {f["url"]: f for f in latest.get("files", [])}
+                self._previous_files = (latest["scrape_dir"], by_url)
+            else:
+                self._previous_files = ("", {})
+        return self._previous_files
+
+    def _reuse_previous_output(
+        self, result: CrawlResult, filename: str, filepath: str, source_checksum: str
+    ) -> dict | None:
+        """
+        Copy the previous scrape's file for this URL if its source is unchanged.
+
+        Returns:
+            File info for the copied file, or None if the page must be saved normally
+        """
+        scrape_dir, previous_files = self._get_previous_files()
+        previous = previous_files.get(result.url)
+        if (
+            not previous
+            or previous.get("source_checksum") != source_checksum
+            or previous.get("filename") != filename
+        ):
+            return None
+
+        try:
+            # A copy (reflinked where supported), not a hard link: reclean rewrites
+            # files in place and must not reach into older scrapes
+            fast_copy(Path(scrape_dir) / previous["filepath"], Path(filepath))
+            # reclean may have rewritten the older file since its metadata was
+            # recorded, so size and checksum come from the copied bytes
+            with open(filepath, "rb") as f:
+                data = f.read()
+        except OSError as e:
+            logger.debug(f"Could not reuse previous output for {result.url}: {e}")
+            return None
+
+        logger.debug(f"Reused unchanged output for {result.url}")
+        return {
+            **previous,
+            "filepath": os.path.normpath(os.path.join("content", filename)),
+            "size": len(data),
+            "checksum": hashlib.sha256(data).hexdigest(),
+            "timestamp": result.timestamp.isoformat(),
+        }
+
+    def _get_cleaning_profile(self) -> "BaseCleaningProfile":
+        """Return the site's cleaning profile, building it on first use."""
+        if self._cleaning_profile is None:
+            from ..scraper.cleaning_profiles import CleaningProfileRegistry
+
+            self._cleaning_profile = CleaningProfileRegistry.get_profile(
+                self.config.cleaning_profile_name, self.config.cleaning_profile_config
+            )
+        return self._cleaning_profile
+
     def _url_to_filename(self, url: str) -> str:
         """Convert URL to safe filename."""
         # Extract path from URL
@@ -168,7 +315,7 @@ class OutputManager:
 
         # Replace slashes with dashes for directory structure
         # Maintain directory structure from URL paths
-        parts = [slugify(p) for p in path.split("/") if p]
+        parts = [_slugify_part(p) for p in path.split("/") if p]
 
         if not parts:
             return "index.md"
@@ -215,6 +362,8 @@ cleaned: true
                 "failed": len(self.failed_urls),
                 "total_content_size": self.total_content_size,
             },
+            # Lets compare_scrapes skip the per-file diff when nothing changed
+            "files_root_hash": files_root_hash(self.files_saved),
             "files": self.files_saved,
             "failed_urls": self.failed_urls,
         }
@@ -236,8 +385,8 @@ cleaned: true
     def _save_metadata(self, metadata: dict):
         """Save metadata as JSON."""
         filepath = self.output_dir / "metadata.json"
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(metadata, f, indent=2, ensure_ascii=False)
+        # files[] grows with the crawl; stream it rather than serializing it in one go
+        dump_json_streaming(metadata, filepath)
         logger.info(f"Saved metadata to {filepath}")
 
     def _create_report_from_state(self) -> dict:
@@ -265,8 +414,8 @@ cleaned: true
     def _save_report(self, report: dict):
         """Save report as JSON."""
         filepath = self.output_dir / "scrape_report.json"
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(report, f, indent=2, ensure_ascii=False)
+        # The report is meant to be read by people, so keep it indented
+        dump_json(report, filepath, pretty=True)
         logger.info(f"Saved report to {filepath}")
 
     def get_output_info(self) -> dict:
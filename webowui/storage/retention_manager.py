@@ -3,14 +3,35 @@ Simple retention manager for scrape directories.
 Implements count-based retention: keep last N timestamped backups, current/ always kept.
 """
 
-import json
 import logging
+import os
+import re
 import shutil
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import cast
 
+from ..utils.json_io import load_json
+
 logger = logging.getLogger(__name__)
 
+# Scrape directory names, as written by OutputManager (ASCII digits only)
+_TIMESTAMP_RE = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}_[0-9]{2}-[0-9]{2}-[0-9]{2}")
+
+
+def _iter_file_sizes(root: str) -> Iterator[int]:
+    """Yield the size of every regular file under root, without following symlinks."""
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                # DirEntry caches d_type, so only regular files cost a stat
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry.stat(follow_symlinks=False).st_size
+
 
 class RetentionManager:
     """
@@ -20,7 +41,12 @@ class RetentionManager:
     keep_backups controls how many timestamped backup directories to preserve.
     """
 
-    def __init__(self, site_dir: Path, keep_backups: int = 2):
+    def __init__(
+        self,
+        site_dir: Path,
+        keep_backups: int = 2,
+        async_delete: bool = True,
+    ):
         """
         Initialize retention manager for a site.
 
@@ -28,25 +54,39 @@ class RetentionManager:
             site_dir: Path to site's output directory
             keep_backups: Number of timestamped backup dirs to keep (default: 2)
                          Valid range: 0+ (0 = delete all backups, keep only current/)
+            async_delete: Remove old backups concurrently on a thread pool
+                         (default: True); False deletes them one at a time
         """
         self.site_dir = site_dir
+        # Resolved once for the os.scandir call in get_scrape_directories()
+        self._site_dir_str = os.fspath(site_dir)
         self.keep_backups = max(0, keep_backups)  # Allow 0 or more
+        self.async_delete = async_delete
         self.current_dir = site_dir / "current"
 
     def get_scrape_directories(self) -> list[Path]:
         """
         Get all timestamped scrape directories (excluding current/).
 
+        Always lists the directory afresh; callers that need the listing more
+        than once in one operation pass it on instead of calling this again.
+
         Returns:
             List of scrape directory paths, sorted by timestamp (newest first)
         """
-        if not self.site_dir.exists():
-            return []
-
         scrapes = []
-        for item in self.site_dir.iterdir():
-            if item.is_dir() and item.name != "current" and self._is_timestamp_dir(item.name):
-                scrapes.append(item)
+        try:
+            # DirEntry.is_dir() uses the d_type from getdents - no stat per entry
+            with os.scandir(self._site_dir_str) as it:
+                for entry in it:
+                    if (
+                        entry.name != "current"
+                        and entry.is_dir(follow_symlinks=False)
+                        and self._is_timestamp_dir(entry.name)
+                    ):
+                        scrapes.append(Path(entry.path))
+        except FileNotFoundError:
+            return []
 
         # Sort by name (timestamp format YYYY-MM-DD_HH-MM-SS sorts correctly)
         scrapes.sort(reverse=True)
@@ -55,12 +95,19 @@ class RetentionManager:
     def _is_timestamp_dir(self, name: str) -> bool:
         """Check if directory name looks like a timestamp."""
         # Format: YYYY-MM-DD_HH-MM-SS
-        parts = name.split("_")
-        if len(parts) != 2:
-            return False
-        date_part = parts[0].split("-")
-        time_part = parts[1].split("-")
-        return len(date_part) == 3 and len(time_part) == 3
+        return _TIMESTAMP_RE.fullmatch(name) is not None
+
+    def _size_or_error(self, scrape_dir: Path) -> int | Exception:
+        """Measure a backup, returning the error instead of raising it."""
+        try:
+            return self._walk_size(scrape_dir)
+        except Exception as e:
+            return e
+
+    def _walk_size(self, scrape_dir: Path) -> int:
+        """Sum the sizes of all regular files under a directory."""
+        # Builtin sum() accumulates in C; the walk itself is one stat per file
+        return sum(_iter_file_sizes(str(scrape_dir)))
 
     def get_current_source(self) -> str | None:
         """
@@ -69,28 +116,34 @@ class RetentionManager:
         Returns:
             Source timestamp or None if current/ doesn't exist
         """
-        if not self.current_dir.exists():
-            return None
-
         metadata_file = self.current_dir / "metadata.json"
         if not metadata_file.exists():
+            # No current/ or no metadata.json
             return None
 
         try:
-            with open(metadata_file) as f:
-                metadata = json.load(f)
+            metadata = load_json(metadata_file)
             return cast(str | None, metadata.get("current_state", {}).get("source_timestamp"))
         except Exception as e:
             logger.error(f"Failed to read current/ metadata: {e}")
             return None
 
-    def apply_retention(self, dry_run: bool = False) -> dict:
+    def apply_retention(
+        self,
+        dry_run: bool = False,
+        include_current_source: bool = True,
+        scrapes: list[Path] | None = None,
+    ) -> dict:
         """
         Apply retention policy - keep last N timestamped backups, delete rest.
         current/ is always kept regardless of keep_backups setting.
 
         Args:
             dry_run: If True, only report what would be deleted
+            include_current_source: Report current/'s source when nothing needs
+                deleting. False skips reading current/metadata.json in that
+                case (current_source is None); it is always read before deleting.
+            scrapes: Listing from get_scrape_directories() the caller already has
 
         Returns:
             Summary of retention action with keys:
@@ -103,7 +156,7 @@ class RetentionManager:
             - summary: human-readable summary
         """
         # Get all timestamped directories
-        scrapes = self.get_scrape_directories()
+        scrapes = self.get_scrape_directories() if scrapes is None else list(scrapes)
 
         if len(scrapes) <= self.keep_backups:
             return {
@@ -113,7 +166,7 @@ class RetentionManager:
                 "kept_timestamps": [d.name for d in scrapes],
                 "deleted": 0,
                 "deleted_timestamps": [],
-                "current_source": self.get_current_source(),
+                "current_source": self.get_current_source() if include_current_source else None,
                 "summary": f"No cleanup needed - only {len(scrapes)} backups exist",
             }
 
@@ -123,37 +176,21 @@ class RetentionManager:
         if current_source:
             current_source_dir = self.site_dir / current_source
 
-        # Determine which to keep/delete
-        to_keep = scrapes[: self.keep_backups]
-        to_delete = scrapes[self.keep_backups :]
-
-        # Protection rule: ensure current/ source is kept (if within policy)
-        if current_source_dir and current_source_dir in to_delete:
+        # Rank the current/ source ahead of everything else, then newest first.
+        # The source is always kept, so it takes the place of the oldest
+        # backup that would otherwise be kept (or one slot with keep_backups=0)
+        protected = current_source_dir in scrapes
+        if protected and current_source_dir in scrapes[self.keep_backups :]:
             logger.info(f"Protecting current/ source: {current_source}")
-            to_delete.remove(current_source_dir)
+        ranked = sorted(scrapes, key=lambda d: (d == current_source_dir, d.name), reverse=True)
+        keep_count = max(self.keep_backups, int(protected))
+        keep_set = set(ranked[:keep_count])
 
-            # Remove oldest kept item to maintain count (unless it's also the source)
-            if len(to_keep) >= self.keep_backups and self.keep_backups > 0:
-                oldest_kept = to_keep[-1]
-                if oldest_kept != current_source_dir:
-                    to_keep.remove(oldest_kept)
-                    to_delete.append(oldest_kept)
-
-            to_keep.append(current_source_dir)
-            # Re-sort to_keep
-            to_keep.sort(reverse=True)
+        to_keep = [d for d in scrapes if d in keep_set]
+        to_delete = ranked[keep_count:]
 
         # Delete marked directories
-        deleted = []
-        for scrape_dir in to_delete:
-            if not dry_run:
-                try:
-                    shutil.rmtree(scrape_dir)
-                    logger.info(f"Deleted backup: {scrape_dir.name}")
-                except Exception as e:
-                    logger.error(f"Failed to delete {scrape_dir.name}: {e}")
-                    continue
-            deleted.append(scrape_dir.name)
+        deleted = [d.name for d in to_delete] if dry_run else self._delete_directories(to_delete)
 
         return {
             "action": "dry_run" if dry_run else "cleaned",
@@ -169,10 +206,49 @@ class RetentionManager:
             ),
         }
 
-    def get_retention_status(self) -> dict:
+    def _delete_directories(self, directories: list[Path]) -> list[str]:
+        """
+        Remove backup directories, in parallel unless async_delete is off.
+
+        Args:
+            directories: Backup directories to remove
+
+        Returns:
+            Names of the directories that were removed, in input order
+        """
+        errors: dict[Path, Exception] = {}
+        if self.async_delete and len(directories) > 1:
+            # Each rmtree is a long run of unlinks; overlapping them hides the
+            # per-syscall latency that dominates on network/FUSE storage
+            with ThreadPoolExecutor(max_workers=min(8, len(directories))) as executor:
+                futures = {d: executor.submit(shutil.rmtree, d) for d in directories}
+            for scrape_dir, future in futures.items():
+                error = future.exception()
+                if error is not None:
+                    errors[scrape_dir] = cast(Exception, error)
+        else:
+            for scrape_dir in directories:
+                try:
+                    shutil.rmtree(scrape_dir)
+                except Exception as e:
+                    errors[scrape_dir] = e
+
+        deleted = []
+        for scrape_dir in directories:
+            if scrape_dir in errors:
+                logger.error(f"Failed to delete {scrape_dir.name}: {errors[scrape_dir]}")
+            else:
+                logger.info(f"Deleted backup: {scrape_dir.name}")
+                deleted.append(scrape_dir.name)
+        return deleted
+
+    def get_retention_status(self, scrapes: list[Path] | None = None) -> dict:
         """
         Get current retention status and recommendations.
 
+        Args:
+            scrapes: Listing from get_scrape_directories() the caller already has
+
         Returns:
             Status dictionary with keys:
             - total_backups: number of timestamped backup directories
@@ -183,16 +259,25 @@ class RetentionManager:
             - status: 'clean' or 'needs_cleanup'
             - recommendation: human-readable recommendation
         """
-        scrapes = self.get_scrape_directories()
+        if scrapes is None:
+            scrapes = self.get_scrape_directories()
         current_source = self.get_current_source()
 
         # Calculate total size
+        if len(scrapes) > 1:
+            # Walks are independent and spend their time in stat(), which
+            # releases the GIL, so several backups can be measured at once
+            with ThreadPoolExecutor(max_workers=min(8, len(scrapes))) as executor:
+                results = list(executor.map(self._size_or_error, scrapes))
+        else:
+            results = [self._size_or_error(d) for d in scrapes]
+
         total_size = 0
-        for scrape_dir in scrapes:
-            try:
-                total_size += sum(f.stat().st_size for f in scrape_dir.rglob("*") if f.is_file())
-            except Exception as e:
-                logger.warning(f"Failed to calculate size for {scrape_dir.name}: {e}")
+        for scrape_dir, result in zip(scrapes, results, strict=True):
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to calculate size for {scrape_dir.name}: {result}")
+            else:
+                total_size += result
 
         # Calculate what would be deleted
         excess = max(0, len(scrapes) - self.keep_backups)
@@ -3,20 +3,172 @@ Open Web UI API client for uploading scraped content.
 """
 
 import asyncio
+import contextlib
+import copy
+import functools
 import json
 import logging
+import random
+import time
 import urllib.parse
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
 from pathlib import Path
-from typing import cast
+from typing import Any, TypeVar, cast
 
 import aiohttp
 from rich.progress import BarColumn, Progress, SpinnerColumn, TextColumn
 
+from ..utils.json_io import dumps_json, load_json, loads_json
+
 logger = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
+# Concurrent single-file add requests when the batch endpoint is unavailable
+_ADD_FILE_CONCURRENCY = 8
+
+# Concurrent file detail requests in get_knowledge_files(include_hashes=True)
+_DETAIL_FETCH_CONCURRENCY = 16
+
+# Concurrent remove/delete/update requests in upload_scrape_incrementally
+_FILE_OP_CONCURRENCY = 10
+
+# Concurrent existence checks before updating modified files
+_VERIFY_CONCURRENCY = 20
+
+# Concurrent status polls in _wait_for_file_processing, and its backoff between rounds
+_STATUS_POLL_CONCURRENCY = 16
+_POLL_INITIAL_DELAY = 0.5
+_POLL_MAX_DELAY = 8.0
+
+# match_and_reconcile confidence levels, lowest first
+_CONFIDENCE_RANK = {"very_low": 0, "low": 1, "medium": 2, "high": 3}
+
+# Path separators -> underscores, as OpenWebUI would URL-encode "/" in filenames
+_SEP_TABLE = str.maketrans({"\\": "_", "/": "_"})
+
+# Rate limiting and transient server/gateway errors, retried by _request_with_retry
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_MAX_ATTEMPTS = 4
+
+# Non-idempotent requests (file uploads) are only retried when the server cannot
+# have acted on them: it refused the request, or the connection was never made.
+# A 500/502/504 or dropped connection may follow a successful create
+_SAFE_RETRY_STATUSES = frozenset({429, 503})
+
+# Batch add failures caused by the files in the batch, which splitting isolates
+_BATCH_REJECT_STATUSES = frozenset({400, 409, 422})
+# Batch add failures that every add to the knowledge base would hit the same way
+_BATCH_FATAL_STATUSES = frozenset({401, 403, 404})
+
+
+async def _gather_bounded(limit: int, aws: Iterable[Awaitable[_T]]) -> list[_T]:
+    """Await all of aws with at most limit running at once; results keep input order."""
+    semaphore = asyncio.Semaphore(limit)
+
+    async def bounded(aw: Awaitable[_T]) -> _T:
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(*(bounded(aw) for aw in aws))
+
+
+def _retry_delay(attempt: int, retry_after: str | None = None) -> float:
+    """
+    Seconds to wait after failed attempt number ``attempt`` (1-based).
+
+    Honours a numeric Retry-After header; otherwise backs off exponentially
+    (0.2s, 0.4s, 0.8s, ... capped at 5s) with full jitter.
+    """
+    if retry_after is not None:
+        with contextlib.suppress(ValueError):
+            return max(0.0, float(retry_after))
+    return random.uniform(0, min(5.0, 0.2 * 2 ** (attempt - 1)))
+
+
+@contextlib.asynccontextmanager
+async def _request_with_retry(
+    send: Callable[..., Any],
+    url: str,
+    form: Callable[[], Awaitable[aiohttp.FormData]] | None = None,
+    idempotent: bool = True,
+    **kwargs: Any,
+) -> AsyncIterator[aiohttp.ClientResponse]:
+    """
+    Send a request, retrying transient failures with backoff.
+
+    Connection errors, timeouts and _RETRY_STATUSES responses are retried, up
+    to _MAX_ATTEMPTS attempts in total. The last response is yielded whatever
+    its status, so callers handle errors exactly as for a single request.
+
+    Args:
+        send: Request method of the session, e.g. ``session.post``
+        url: Request URL
+        form: Builds a fresh multipart body for each attempt, as aiohttp
+            consumes (and closes) an uploaded file when sending it
+        idempotent: False for requests that must not run twice; only
+            _SAFE_RETRY_STATUSES and failures to connect are then retried
+        **kwargs: Passed to ``send``
+    """
+    retry_statuses = _RETRY_STATUSES if idempotent else _SAFE_RETRY_STATUSES
+    retry_errors: tuple[type[Exception], ...] = (
+        (aiohttp.ClientConnectionError, TimeoutError)
+        if idempotent
+        else (aiohttp.ClientConnectorError,)
+    )
+    for attempt in range(1, _MAX_ATTEMPTS + 1):
+        last_attempt = attempt == _MAX_ATTEMPTS
+        async with contextlib.AsyncExitStack() as stack:
+            try:
+                if form is not None:
+                    kwargs["data"] = await form()
+                response = await stack.enter_async_context(send(url, **kwargs))
+            except (aiohttp.ClientConnectionError, TimeoutError) as e:
+                if last_attempt or not isinstance(e, retry_errors):
+                    raise
+                delay = _retry_delay(attempt)
+                logger.debug(f"Request to {url} failed ({e}), retrying in {delay:.1f}s")
+            else:
+                if response.status not in retry_statuses or last_attempt:
+                    yield response
+                    return
+                retry_after = (
+                    response.headers.get("Retry-After") if response.status == 429 else None
+                )
+                delay = _retry_delay(attempt, retry_after)
+                logger.debug(f"Got {response.status} from {url}, retrying in {delay:.1f}s")
+        await asyncio.sleep(delay)
+
+
+def _shares_session(
+    method: Callable[..., Awaitable[_T]],
+) -> Callable[..., Awaitable[_T]]:
+    """
+    Run a multi-request workflow on one pooled session.
+
+    Opens the client's shared session for the duration of the call unless one
+    is already open (e.g. the caller used ``async with client``), so every
+    request the workflow makes reuses the same keep-alive connections.
+    """
+
+    @functools.wraps(method)
+    async def wrapper(self: "OpenWebUIClient", *args: Any, **kwargs: Any) -> _T:
+        if self._session is not None:
+            return await method(self, *args, **kwargs)
+        async with self:
+            return await method(self, *args, **kwargs)
+
+    return wrapper
+
 
 class OpenWebUIClient:
-    """Client for interacting with Open Web UI API."""
+    """
+    Client for interacting with Open Web UI API.
+
+    Use as ``async with OpenWebUIClient(...) as client`` to share one connection
+    pool across calls. Without it, each call opens its own session, except the
+    upload/reconcile workflows, which open a shared one for their duration.
+    """
 
     def __init__(self, base_url: str, api_key: str):
         self.base_url = base_url.rstrip("/")
@@ -24,6 +176,45 @@ class OpenWebUIClient:
         self.headers = {
             "Authorization": f"Bearer {api_key}",
         }
+        self._session: aiohttp.ClientSession | None = None
+        # (monotonic time, name -> knowledge items) from _list_knowledge()
+        self._kb_cache: tuple[float, dict[str, list[dict]]] | None = None
+        # (knowledge_id, include_hashes, site_folder) -> (monotonic time, files)
+        # from get_knowledge_files(); cleared whenever this client changes files
+        self._kb_files_cache: dict[tuple[str, bool, str | None], tuple[float, list[dict]]] = {}
+        # Cleared if the server rejects HEAD in verify_file_exists()
+        self._head_supported = True
+        self._exit_stack: contextlib.AsyncExitStack | None = None
+
+    async def __aenter__(self) -> "OpenWebUIClient":
+        """Open the shared session."""
+        stack = contextlib.AsyncExitStack()
+        connector = aiohttp.TCPConnector(
+            limit=64, limit_per_host=32, ttl_dns_cache=300, keepalive_timeout=75
+        )
+        # The session owns the connector; closing it here too only covers a
+        # session that failed to open
+        stack.push_async_callback(connector.close)
+        self._session = await stack.enter_async_context(
+            aiohttp.ClientSession(connector=connector, json_serialize=dumps_json)
+        )
+        self._exit_stack = stack
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Close the shared session and its connections."""
+        stack, self._exit_stack, self._session = self._exit_stack, None, None
+        if stack is not None:
+            await stack.aclose()
+
+    @contextlib.asynccontextmanager
+    async def _session_scope(self) -> AsyncIterator[aiohttp.ClientSession]:
+        """Yield the shared session if open, otherwise a session for this call only."""
+        if self._session is not None:
+            yield self._session
+        else:
+            async with aiohttp.ClientSession(json_serialize=dumps_json) as session:
+                yield session
 
     async def upload_files(
         self,
@@ -40,7 +231,7 @@ class OpenWebUIClient:
             file_paths: List of file paths to upload
             site_name: Optional site identifier for folder prefix
             base_content_dir: Base directory to calculate relative paths from
-            batch_size: Number of files to upload per batch
+            batch_size: Maximum number of uploads in flight at once
 
         Returns:
             List of dicts with 'file_id', 'path', 'filename', and 'upload_filename'
@@ -52,7 +243,7 @@ class OpenWebUIClient:
 
         file_results = []
 
-        async with aiohttp.ClientSession() as session:
+        async with self._session_scope() as session:
             with Progress(
                 SpinnerColumn(),
                 TextColumn("[progress.description]{task.description}"),
@@ -61,56 +252,83 @@ class OpenWebUIClient:
             ) as progress:
                 task = progress.add_task("Uploading files...", total=len(file_paths))
 
-                # Process in batches
-                for i in range(0, len(file_paths), batch_size):
-                    batch = file_paths[i : i + batch_size]
-
-                    # Upload batch concurrently with site prefix
-                    tasks = [
-                        self._upload_file(session, fp, site_name, base_content_dir) for fp in batch
-                    ]
-                    results = await asyncio.gather(*tasks, return_exceptions=True)
-
-                    for fp, result in zip(batch, results, strict=False):
-                        if isinstance(result, Exception):
-                            logger.error(f"Upload error for {fp.name}: {result}")
-                        elif result:
-                            # Calculate upload filename for tracking
-                            # Use underscores instead of forward slashes to match upload behavior
-                            if site_name and base_content_dir:
-                                try:
-                                    relative_path = fp.relative_to(base_content_dir)
-                                    upload_filename = f"{site_name}_{relative_path}".replace(
-                                        "\\", "_"
-                                    ).replace("/", "_")
-                                except ValueError:
-                                    upload_filename = f"{site_name}_{fp.name}"
-                            else:
-                                upload_filename = fp.name
-
-                            file_results.append(
-                                {
-                                    "file_id": result,
-                                    "path": str(fp),
-                                    "filename": fp.name,
-                                    "upload_filename": upload_filename,
-                                }
-                            )
+                # Keep up to batch_size uploads in flight, starting the next file
+                # as soon as any upload finishes
+                semaphore = asyncio.Semaphore(batch_size)
 
-                    progress.update(task, advance=len(batch))
-
-                    # Small delay between batches
-                    await asyncio.sleep(0.5)
+                async def bounded(index: int, fp: Path) -> tuple[int, str | None | Exception]:
+                    async with semaphore:
+                        try:
+                            return index, await self._upload_file(
+                                session, fp, upload_filenames[index]
+                            )
+                        except Exception as e:
+                            return index, e
+
+                # Computed once per file, for both the upload and the result entry
+                upload_filenames = [
+                    self._make_upload_filename(fp, site_name, base_content_dir) for fp in file_paths
+                ]
+                results: list[str | None | Exception] = [None] * len(file_paths)
+                tasks = [asyncio.create_task(bounded(i, fp)) for i, fp in enumerate(file_paths)]
+                for next_done in asyncio.as_completed(tasks):
+                    index, result = await next_done
+                    results[index] = result
+                    progress.update(task, advance=1)
+
+                # Report in input order, whatever order the uploads finished in
+                for fp, upload_filename, result in zip(
+                    file_paths, upload_filenames, results, strict=True
+                ):
+                    if isinstance(result, Exception):
+                        logger.error(f"Upload error for {fp.name}: {result}")
+                    elif result:
+                        file_results.append(
+                            {
+                                "file_id": result,
+                                "path": str(fp),
+                                "filename": fp.name,
+                                "upload_filename": upload_filename,
+                            }
+                        )
 
         logger.info(f"Successfully uploaded {len(file_results)}/{len(file_paths)} files")
         return file_results
 
+    def _make_upload_filename(
+        self, file_path: Path, site_name: str | None, base_content_dir: Path | None
+    ) -> str:
+        """
+        Build the filename a file is uploaded under.
+
+        Note: OpenWebUI URL-encodes forward slashes, so the site folder and the
+        path inside the content directory are joined with underscores.
+
+        Args:
+            file_path: Path to the file to upload
+            site_name: Optional site identifier for folder prefix
+            base_content_dir: Base directory to calculate relative paths from
+
+        Returns:
+            Upload filename, e.g. "mysite_wiki_Page.md"
+        """
+        if not (site_name and base_content_dir):
+            return file_path.name
+        try:
+            # Get relative path from content directory for nested structure
+            relative_path = file_path.relative_to(base_content_dir)
+        except ValueError:
+            # Not relative to base_content_dir, use plain filename with site prefix
+            return f"{site_name}_{file_path.name}"
+        # Replace path separators with underscores to preserve folder hierarchy
+        # This prevents OpenWebUI from URL-encoding forward slashes as %2F
+        return f"{site_name}_{relative_path}".translate(_SEP_TABLE)
+
     async def _upload_file(
         self,
         session: aiohttp.ClientSession,
         file_path: Path,
-        site_name: str | None = None,
-        base_content_dir: Path | None = None,
+        upload_filename: str,
     ) -> str | None:
         """
         Upload a single file to /api/v1/files/ and return the file_id.
@@ -118,8 +336,7 @@ class OpenWebUIClient:
         Args:
             session: aiohttp session
             file_path: Path to the file to upload
-            site_name: Optional site identifier for folder prefix
-            base_content_dir: Base directory to calculate relative paths from
+            upload_filename: Name to upload the file under (see _make_upload_filename)
 
         Returns:
             file_id if successful, None otherwise
@@ -127,40 +344,40 @@ class OpenWebUIClient:
         try:
             url = f"{self.base_url}/api/v1/files/"
 
-            # Construct filename with site folder if provided
-            # Note: OpenWebUI URL-encodes forward slashes, so use underscores for folder structure
-            if site_name and base_content_dir:
-                # Get relative path from content directory for nested structure
-                try:
-                    relative_path = file_path.relative_to(base_content_dir)
-                    # Replace path separators with underscores to preserve folder hierarchy
-                    # This prevents OpenWebUI from URL-encoding forward slashes as %2F
-                    upload_filename = f"{site_name}_{relative_path}".replace("\\", "_").replace(
-                        "/", "_"
-                    )
-                except ValueError:
-                    # Not relative to base_content_dir, use plain filename with site prefix
-                    upload_filename = f"{site_name}_{file_path.name}"
-            else:
-                upload_filename = file_path.name
+            loop = asyncio.get_running_loop()
 
-            # Create multipart form data with file
-            data = aiohttp.FormData()
-            content = file_path.read_bytes()
-            data.add_field("file", content, filename=upload_filename, content_type="text/markdown")
+            with contextlib.ExitStack() as open_files:
 
-            async with session.post(url, headers=self.headers, data=data) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    file_id = cast(str | None, result.get("id"))
-                    logger.debug(f"✓ Uploaded: {upload_filename} (ID: {file_id})")
-                    return file_id
-                else:
-                    error_text = await response.text()
-                    logger.error(
-                        f"✗ Failed to upload {upload_filename}: {response.status} - {error_text}"
+                async def form() -> aiohttp.FormData:
+                    # Create multipart form data with the open file: aiohttp streams it
+                    # in chunks (read off the event loop) instead of buffering the whole
+                    # file. Opening it can block on a slow disk too, so that runs in the
+                    # executor
+                    f = open_files.enter_context(
+                        await loop.run_in_executor(None, file_path.open, "rb")
                     )
-                    return None
+                    data = aiohttp.FormData()
+                    data.add_field(
+                        "file", f, filename=upload_filename, content_type="text/markdown"
+                    )
+                    return data
+
+                # Creates a file record, so a failure that may have reached the
+                # server is not retried (it could leave an orphaned duplicate)
+                async with _request_with_retry(
+                    session.post, url, form=form, idempotent=False, headers=self.headers
+                ) as response:
+                    if response.status == 200:
+                        result = await response.json(loads=loads_json)
+                        file_id = cast(str | None, result.get("id"))
+                        logger.debug(f"✓ Uploaded: {upload_filename} (ID: {file_id})")
+                        return file_id
+                    else:
+                        error_text = await response.text()
+                        logger.error(
+                            f"✗ Failed to upload {upload_filename}: {response.status} - {error_text}"
+                        )
+                        return None
 
         except Exception as e:
             logger.error(f"Error uploading {file_path}: {e}")
@@ -174,16 +391,20 @@ class OpenWebUIClient:
         try:
             url = f"{self.base_url}/api/v1/files/{file_id}/data/content/update"
 
-            # Read new content
-            content = file_path.read_text(encoding="utf-8")
+            # Read new content in the executor so other requests progress meanwhile
+            loop = asyncio.get_running_loop()
+            content = await loop.run_in_executor(
+                None, functools.partial(file_path.read_text, encoding="utf-8")
+            )
 
             payload = {"content": content}
 
             async with (
-                aiohttp.ClientSession() as session,
+                self._session_scope() as session,
                 session.post(url, headers=self.headers, json=payload) as response,
             ):
                 if response.status == 200:
+                    self._kb_files_cache.clear()
                     logger.debug(f"✓ Updated file {file_id}: {file_path.name}")
                     return True
                 elif response.status == 404:
@@ -209,13 +430,15 @@ class OpenWebUIClient:
             url = f"{self.base_url}/api/v1/files/{file_id}"
 
             async with (
-                aiohttp.ClientSession() as session,
+                self._session_scope() as session,
                 session.delete(url, headers=self.headers) as response,
             ):
                 if response.status == 200:
+                    self._kb_files_cache.clear()
                     logger.debug(f"✓ Deleted file {file_id}")
                     return True
                 elif response.status == 404:
+                    self._kb_files_cache.clear()
                     logger.debug(f"⚠ File {file_id} already deleted (OK)")
                     return True  # Consider success - file is gone
                 else:
@@ -242,18 +465,28 @@ class OpenWebUIClient:
         try:
             url = f"{self.base_url}/api/v1/files/{file_id}"
 
-            async with (
-                aiohttp.ClientSession() as session,
-                session.get(url, headers=self.headers) as response,
-            ):
-                if response.status == 200:
-                    return True
-                elif response.status == 404:
-                    return False
-                else:
-                    # Other errors - assume file might exist to avoid false deletions
-                    logger.warning(f"Unexpected status {response.status} checking file {file_id}")
-                    return True
+            async with self._session_scope() as session:
+                # HEAD answers 200/404 without sending the file record
+                status = None
+                if self._head_supported:
+                    async with session.head(url, headers=self.headers) as response:
+                        status = response.status
+                    if status == 405:
+                        # Server only routes GET here; don't try HEAD again
+                        self._head_supported = False
+                if not self._head_supported:
+                    headers = {**self.headers, "Range": "bytes=0-0"}
+                    async with session.get(url, headers=headers) as response:
+                        status = response.status
+
+            if status in (200, 206):
+                return True
+            elif status == 404:
+                return False
+            else:
+                # Other errors - assume file might exist to avoid false deletions
+                logger.warning(f"Unexpected status {status} checking file {file_id}")
+                return True
         except Exception as e:
             logger.error(f"Error checking file existence: {e}")
             return True  # Assume exists on error to avoid false deletions
@@ -267,11 +500,11 @@ class OpenWebUIClient:
             url = f"{self.base_url}/api/v1/files/{file_id}/process/status"
 
             async with (
-                aiohttp.ClientSession() as session,
+                self._session_scope() as session,
                 session.get(url, headers=self.headers) as response,
             ):
                 if response.status == 200:
-                    return cast(dict | None, await response.json())
+                    return cast(dict | None, await response.json(loads=loads_json))
                 else:
                     logger.debug(f"Could not get status for file {file_id}")
                     return None
@@ -301,11 +534,13 @@ class OpenWebUIClient:
             }
 
             async with (
-                aiohttp.ClientSession() as session,
+                self._session_scope() as session,
                 session.post(url, headers=self.headers, json=payload) as response,
             ):
                 if response.status == 200:
-                    result = await response.json()
+                    result = await response.json(loads=loads_json)
+                    # The cached listing doesn't include the new knowledge base
+                    self._kb_cache = None
                     logger.info(f"Created knowledge: {name} (ID: {result.get('id')})")
                     return cast(dict | None, result)
                 else:
@@ -317,29 +552,51 @@ class OpenWebUIClient:
             logger.error(f"Error creating knowledge: {e}")
             return None
 
+    async def _list_knowledge(self, max_age: float = 30.0) -> dict[str, list[dict]] | None:
+        """
+        List knowledge bases, grouped by name.
+
+        The listing is cached for max_age seconds, so lookups made close
+        together (e.g. find, then create) share one request.
+
+        Args:
+            max_age: Seconds a cached listing stays valid
+
+        Returns:
+            Dict of name -> knowledge items (in API order), or None if the
+            request was rejected
+        """
+        if self._kb_cache is not None and time.monotonic() - self._kb_cache[0] < max_age:
+            return self._kb_cache[1]
+
+        url = f"{self.base_url}/api/v1/knowledge/"
+
+        async with (
+            self._session_scope() as session,
+            session.get(url, headers=self.headers) as response,
+        ):
+            if response.status != 200:
+                return None
+            result = await response.json(loads=loads_json)
+
+        # Response is a list of knowledge items
+        if isinstance(result, list):
+            knowledge_list = result
+        else:
+            knowledge_list = result.get("data") or result.get("items", [])
+
+        by_name: dict[str, list[dict]] = {}
+        for item in knowledge_list:
+            by_name.setdefault(item.get("name"), []).append(item)
+        self._kb_cache = (time.monotonic(), by_name)
+        return by_name
+
     async def _get_knowledge_by_name(self, name: str) -> dict | None:
         """Try to find existing knowledge by name."""
         try:
-            url = f"{self.base_url}/api/v1/knowledge/"
-
-            async with (
-                aiohttp.ClientSession() as session,
-                session.get(url, headers=self.headers) as response,
-            ):
-                if response.status == 200:
-                    result = await response.json()
-                    # Response is a list of knowledge items
-                    if isinstance(result, list):
-                        knowledge_list = result
-                    else:
-                        knowledge_list = result.get("data") or result.get("items", [])
-
-                    for item in knowledge_list:
-                        if item.get("name") == name:
-                            return cast(dict | None, item)
-                    return None
-                else:
-                    return None
+            by_name = await self._list_knowledge()
+            matches = by_name.get(name) if by_name else None
+            return matches[0] if matches else None
 
         except Exception as e:
             logger.debug(f"Could not fetch existing knowledge: {e}")
@@ -362,55 +619,47 @@ class OpenWebUIClient:
         """
         try:
             # Get all knowledge bases
-            url = f"{self.base_url}/api/v1/knowledge/"
-
-            async with (
-                aiohttp.ClientSession() as session,
-                session.get(url, headers=self.headers) as response,
-            ):
-                if response.status != 200:
-                    return None
-
-                result = await response.json()
-                if isinstance(result, list):
-                    knowledge_list = result
-                else:
-                    knowledge_list = result.get("data") or result.get("items", [])
-
-                # Find all KBs with matching name
-                matching_kbs = [kb for kb in knowledge_list if kb.get("name") == knowledge_name]
+            by_name = await self._list_knowledge()
+            if by_name is None:
+                return None
+
+            # Find all KBs with matching name
+            matching_kbs = by_name.get(knowledge_name, [])
+
+            if len(matching_kbs) == 0:
+                logger.debug(f"No knowledge bases found with name: {knowledge_name}")
+                return None
+
+            if len(matching_kbs) == 1:
+                # Only one match, use it
+                kb_id = cast(str, matching_kbs[0]["id"])
+                logger.info(f"Found unique knowledge base: {knowledge_name} (ID: {kb_id})")
+                return kb_id
+
+            # Multiple KBs with same name - find by content
+            logger.info(
+                f"Found {len(matching_kbs)} knowledge bases named '{knowledge_name}', checking content..."
+            )
 
-                if len(matching_kbs) == 0:
-                    logger.debug(f"No knowledge bases found with name: {knowledge_name}")
-                    return None
+            # Check every KB for files from our site (filename prefix filtering)
+            # at once, then take the first match in listing order
+            kb_ids = [cast(str, kb["id"]) for kb in matching_kbs]
+            kb_files = await asyncio.gather(
+                *(self.get_knowledge_files(kb_id, site_folder=site_name) for kb_id in kb_ids)
+            )
 
-                if len(matching_kbs) == 1:
-                    # Only one match, use it
-                    kb_id = cast(str, matching_kbs[0]["id"])
-                    logger.info(f"Found unique knowledge base: {knowledge_name} (ID: {kb_id})")
+            for kb_id, files in zip(kb_ids, kb_files, strict=True):
+                if files:
+                    logger.info(
+                        f"Found knowledge base with {len(files)} files from {site_name}_ prefix (ID: {kb_id})"
+                    )
                     return kb_id
 
-                # Multiple KBs with same name - find by content
-                logger.info(
-                    f"Found {len(matching_kbs)} knowledge bases named '{knowledge_name}', checking content..."
-                )
-
-                for kb in matching_kbs:
-                    kb_id = cast(str, kb["id"])
-                    # Check if this KB has files from our site (filename prefix filtering)
-                    files = await self.get_knowledge_files(kb_id, site_folder=site_name)
-
-                    if files and len(files) > 0:
-                        logger.info(
-                            f"Found knowledge base with {len(files)} files from {site_name}_ prefix (ID: {kb_id})"
-                        )
-                        return kb_id
-
-                # None of the KBs have our files - use first one as default
-                logger.warning(
-                    f"No knowledge base contains files from {site_name}_ prefix, using first match"
-                )
-                return cast(str, matching_kbs[0]["id"])
+            # None of the KBs have our files - use first one as default
+            logger.warning(
+                f"No knowledge base contains files from {site_name}_ prefix, using first match"
+            )
+            return cast(str, matching_kbs[0]["id"])
 
         except Exception as e:
             logger.error(f"Error finding knowledge by content: {e}")
@@ -420,63 +669,145 @@ class OpenWebUIClient:
         """
         Add uploaded files to a knowledge collection in batch.
         Uses POST /api/v1/knowledge/{id}/files/batch/add endpoint.
+
+        If a file in the batch is rejected, the batch is split in half and each
+        half retried as its own batch, so one bad file costs O(log N) extra
+        requests instead of N individual adds. Other failures fall back to
+        individual adds once, or fail fast when no add could succeed.
         """
         logger.info(f"Adding {len(file_ids)} files to knowledge {knowledge_id} (batch)")
 
-        try:
-            url = f"{self.base_url}/api/v1/knowledge/{knowledge_id}/files/batch/add"
+        async with self._session_scope() as session:
+            result, status, error = await self._post_batch_add(session, knowledge_id, file_ids)
+            if error is None:
+                logger.info(f"✓ Batch added {len(file_ids)} files to knowledge")
+                return {
+                    "success": True,
+                    "knowledge_id": knowledge_id,
+                    "files_added": len(file_ids),
+                    "result": result,
+                }
 
-            # API expects a list of objects with file_id field
-            payload = [{"file_id": fid} for fid in file_ids]
+            if "process_files_batch" in error:
+                # Known OpenWebUI backend bug: the batch endpoint fails regardless
+                # of content, so smaller batches would fail the same way
+                logger.warning(
+                    f"⚠ Batch add failed - OpenWebUI backend bug detected:\n"
+                    f"   {error[:200]}\n"
+                    f"   Falling back to individual adds (will still work)..."
+                )
+            else:
+                logger.error(f"✗ Failed batch add: {error}")
+            success_count = await self._recover_failed_batch(
+                session, knowledge_id, file_ids, status, error
+            )
 
-            async with (
-                aiohttp.ClientSession() as session,
-                session.post(url, headers=self.headers, json=payload) as response,
-            ):
-                if response.status == 200:
-                    result = await response.json()
-                    logger.info(f"✓ Batch added {len(file_ids)} files to knowledge")
-                    return {
-                        "success": True,
-                        "knowledge_id": knowledge_id,
-                        "files_added": len(file_ids),
-                        "result": result,
-                    }
-                else:
-                    error_text = await response.text()
-                    # Check for known OpenWebUI backend bug
-                    if "process_files_batch" in error_text:
-                        logger.warning(
-                            f"⚠ Batch add failed - OpenWebUI backend bug detected:\n"
-                            f"   {error_text[:200]}\n"
-                            f"   Falling back to individual adds (will still work)..."
-                        )
-                    else:
-                        logger.error(f"✗ Failed batch add: {response.status} - {error_text}")
-                    # Fall back to individual adds
-                    return await self._add_files_individually(knowledge_id, file_ids)
+        failed_count = len(file_ids) - success_count
+        logger.info(f"✓ Added {success_count}/{len(file_ids)} files to knowledge")
+        return {
+            "success": success_count > 0,
+            "knowledge_id": knowledge_id,
+            "files_added": success_count,
+            "files_failed": failed_count,
+        }
 
+    async def _post_batch_add(
+        self, session: aiohttp.ClientSession, knowledge_id: str, file_ids: list[str]
+    ) -> tuple[Any, int | None, str | None]:
+        """
+        POST one batch of files to the knowledge batch/add endpoint.
+
+        Returns:
+            (result, 200, None) on success, (None, status, error_text) on
+            failure; status is None if no response was received
+        """
+        url = f"{self.base_url}/api/v1/knowledge/{knowledge_id}/files/batch/add"
+
+        # API expects a list of objects with file_id field
+        payload = [{"file_id": fid} for fid in file_ids]
+
+        try:
+            async with session.post(url, headers=self.headers, json=payload) as response:
+                if response.status == 200:
+                    self._kb_files_cache.clear()
+                    return await response.json(loads=loads_json), response.status, None
+                return None, response.status, f"{response.status} - {await response.text()}"
         except Exception as e:
-            logger.error(f"Error in batch add, falling back to individual: {e}")
-            return await self._add_files_individually(knowledge_id, file_ids)
+            return None, None, str(e)
+
+    async def _add_batch_or_split(
+        self,
+        session: aiohttp.ClientSession,
+        knowledge_id: str,
+        file_ids: list[str],
+        semaphore: asyncio.Semaphore,
+    ) -> int:
+        """Add files as one batch, halving it on failure until bad files are isolated."""
+        if not file_ids:
+            return 0
+        if len(file_ids) == 1:
+            async with semaphore:
+                return int(await self._add_file_to_knowledge(session, knowledge_id, file_ids[0]))
+
+        # Only the request itself holds a slot; the recursion below must not
+        async with semaphore:
+            _, status, error = await self._post_batch_add(session, knowledge_id, file_ids)
+        if error is None:
+            return len(file_ids)
+
+        return await self._recover_failed_batch(
+            session, knowledge_id, file_ids, status, error, semaphore
+        )
+
+    async def _recover_failed_batch(
+        self,
+        session: aiohttp.ClientSession,
+        knowledge_id: str,
+        file_ids: list[str],
+        status: int | None,
+        error: str,
+        semaphore: asyncio.Semaphore | None = None,
+    ) -> int:
+        """
+        Add the files of a failed batch, choosing the recovery from the failure.
+
+        Rejected files are isolated by splitting the batch. Auth errors and a
+        missing knowledge base fail fast; anything else (the process_files_batch
+        backend bug, server or connection errors) falls back to one individual
+        add per file, as splitting would only repeat the failure.
+
+        One semaphore is shared by the whole recovery, so split batches and
+        individual adds together keep at most _ADD_FILE_CONCURRENCY requests
+        in flight.
+
+        Returns:
+            Number of files added successfully
+        """
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(_ADD_FILE_CONCURRENCY)
+
+        if status in _BATCH_REJECT_STATUSES and "process_files_batch" not in error:
+            logger.debug(f"Batch of {len(file_ids)} files rejected, splitting: {error}")
+            mid = len(file_ids) // 2
+            counts = await asyncio.gather(
+                self._add_batch_or_split(session, knowledge_id, file_ids[:mid], semaphore),
+                self._add_batch_or_split(session, knowledge_id, file_ids[mid:], semaphore),
+            )
+            return sum(counts)
+
+        if status in _BATCH_FATAL_STATUSES:
+            logger.error(f"✗ Not adding {len(file_ids)} files individually: {error}")
+            return 0
+
+        return await self._add_files_bounded(session, knowledge_id, file_ids, semaphore)
 
     async def _add_files_individually(self, knowledge_id: str, file_ids: list[str]) -> dict:
         """Fallback: Add files individually (legacy method)."""
         logger.info(f"Adding {len(file_ids)} files individually (fallback)")
 
-        success_count = 0
-        failed_count = 0
-
-        async with aiohttp.ClientSession() as session:
-            for file_id in file_ids:
-                success = await self._add_file_to_knowledge(session, knowledge_id, file_id)
-                if success:
-                    success_count += 1
-                else:
-                    failed_count += 1
-
-                # Small delay to avoid rate limiting
-                await asyncio.sleep(0.1)
+        async with self._session_scope() as session:
+            success_count = await self._add_files_bounded(session, knowledge_id, file_ids)
+        failed_count = len(file_ids) - success_count
 
         logger.info(f"Added {success_count}/{len(file_ids)} files to knowledge")
 
@@ -491,19 +822,9 @@ class OpenWebUIClient:
         """Add uploaded files to a knowledge collection."""
         logger.info(f"Adding {len(file_ids)} files to knowledge {knowledge_id}")
 
-        success_count = 0
-        failed_count = 0
-
-        async with aiohttp.ClientSession() as session:
-            for file_id in file_ids:
-                success = await self._add_file_to_knowledge(session, knowledge_id, file_id)
-                if success:
-                    success_count += 1
-                else:
-                    failed_count += 1
-
-                # Small delay to avoid rate limiting
-                await asyncio.sleep(0.1)
+        async with self._session_scope() as session:
+            success_count = await self._add_files_bounded(session, knowledge_id, file_ids)
+        failed_count = len(file_ids) - success_count
 
         logger.info(f"Added {success_count}/{len(file_ids)} files to knowledge")
 
@@ -514,6 +835,33 @@ class OpenWebUIClient:
             "failed": failed_count,
         }
 
+    async def _add_files_bounded(
+        self,
+        session: aiohttp.ClientSession,
+        knowledge_id: str,
+        file_ids: list[str],
+        semaphore: asyncio.Semaphore | None = None,
+    ) -> int:
+        """
+        Add files to a knowledge collection one request each, several at a time.
+
+        At most _ADD_FILE_CONCURRENCY requests are in flight, which also keeps
+        the request rate bounded without a fixed delay per file. Pass a shared
+        semaphore to count these requests against a larger operation's limit.
+
+        Returns:
+            Number of files added successfully
+        """
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(_ADD_FILE_CONCURRENCY)
+
+        async def add(file_id: str) -> bool:
+            async with semaphore:
+                return await self._add_file_to_knowledge(session, knowledge_id, file_id)
+
+        results = await asyncio.gather(*(add(fid) for fid in file_ids), return_exceptions=True)
+        return sum(1 for result in results if result is True)
+
     async def _add_file_to_knowledge(
         self, session: aiohttp.ClientSession, knowledge_id: str, file_id: str
     ) -> bool:
@@ -523,8 +871,11 @@ class OpenWebUIClient:
 
             payload = {"file_id": file_id}
 
-            async with session.post(url, headers=self.headers, json=payload) as response:
+            async with _request_with_retry(
+                session.post, url, headers=self.headers, json=payload
+            ) as response:
                 if response.status == 200:
+                    self._kb_files_cache.clear()
                     logger.debug(f"✓ Added file {file_id} to knowledge")
                     return True
                 else:
@@ -551,13 +902,17 @@ class OpenWebUIClient:
             payload = {"file_id": file_id}
 
             async with (
-                aiohttp.ClientSession() as session,
-                session.post(url, headers=self.headers, json=payload) as response,
+                self._session_scope() as session,
+                _request_with_retry(
+                    session.post, url, headers=self.headers, json=payload
+                ) as response,
             ):
                 if response.status == 200:
+                    self._kb_files_cache.clear()
                     logger.debug(f"✓ Removed file {file_id} from knowledge")
                     return True
                 elif response.status == 404:
+                    self._kb_files_cache.clear()
                     logger.debug(f"⚠ File {file_id} already gone (OK)")
                     return True  # Consider success - file is already removed
                 else:
@@ -572,29 +927,55 @@ class OpenWebUIClient:
             return False
 
     async def get_knowledge_files(
-        self, knowledge_id: str, include_hashes: bool = False, site_folder: str | None = None
+        self,
+        knowledge_id: str,
+        include_hashes: bool = False,
+        site_folder: str | None = None,
+        max_age: float = 15.0,
     ) -> list[dict] | None:
         """
         Get list of files currently in a knowledge base.
 
+        Results are cached for max_age seconds, so back-to-back checks (e.g. a
+        health check right after a reconcile) share one walk of the knowledge
+        base. Adding, removing, updating or deleting files through this client
+        clears the cache. Each call returns its own copy of the file dicts.
+
         Args:
             knowledge_id: Knowledge base ID
             include_hashes: If True, fetch detailed file info including hashes
             site_folder: If provided, only return files in this folder (e.g., 'monsterhunter/')
+            max_age: Seconds a cached result stays valid (0 always fetches)
 
         Returns:
             List of file dicts with id, filename, hash (if requested), etc., or None on error
         """
+        key = (knowledge_id, include_hashes, site_folder)
+        cached = self._kb_files_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < max_age:
+            return copy.deepcopy(cached[1])
+
+        files = await self._fetch_knowledge_files(knowledge_id, include_hashes, site_folder)
+        if files is not None:
+            self._kb_files_cache[key] = (time.monotonic(), files)
+            # Callers get their own file dicts (meta included), never the cached ones
+            return copy.deepcopy(files)
+        return None
+
+    async def _fetch_knowledge_files(
+        self, knowledge_id: str, include_hashes: bool, site_folder: str | None
+    ) -> list[dict] | None:
+        """Fetch a knowledge base's files (see get_knowledge_files), uncached."""
         try:
             # Updated endpoint for retrieving files
             url = f"{self.base_url}/api/v1/knowledge/{knowledge_id}/files"
 
             async with (
-                aiohttp.ClientSession() as session,
+                self._session_scope() as session,
                 session.get(url, headers=self.headers) as response,
             ):
                 if response.status == 200:
-                    result = await response.json()
+                    result = await response.json(loads=loads_json)
                     # Extract file list from response (new format: {"items": [...]})
                     # Fallback to "files" for backward compatibility if needed
                     files = result.get("items") or result.get("files")
@@ -606,17 +987,15 @@ class OpenWebUIClient:
 
                     # If hashes requested, fetch detailed info for each file
                     if include_hashes and files:
-                        detailed_files = []
-                        for f in files:
-                            file_id = f.get("id")
-                            if file_id:
-                                detailed = await self._get_file_details(session, file_id)
-                                if detailed:
-                                    detailed_files.append(detailed)
-                                else:
-                                    # Fall back to basic info if detailed fetch fails
-                                    detailed_files.append(f)
-                        files = detailed_files
+                        semaphore = asyncio.Semaphore(_DETAIL_FETCH_CONCURRENCY)
+
+                        async def fetch(f: dict) -> dict:
+                            async with semaphore:
+                                detailed = await self._get_file_details(session, f["id"])
+                            # Fall back to basic info if detailed fetch fails
+                            return detailed or f
+
+                        files = await asyncio.gather(*(fetch(f) for f in files if f.get("id")))
 
                     # Filter by site folder if specified
                     if site_folder:
@@ -629,14 +1008,11 @@ class OpenWebUIClient:
                         if files is not None:
                             for f in files:
                                 # Get filename from meta.name and decode it
-                                filename_encoded = f.get("meta", {}).get(
-                                    "name", f.get("filename", "")
-                                )
-                                filename = (
-                                    urllib.parse.unquote(filename_encoded)
-                                    if filename_encoded
-                                    else ""
-                                )
+                                meta = f.get("meta") or {}
+                                filename = meta.get("name", f.get("filename", "")) or ""
+                                # Names are normally stored unencoded; only unquote if needed
+                                if "%" in filename:
+                                    filename = urllib.parse.unquote(filename)
 
                                 # Check if file is in the specified folder (underscore-based naming)
                                 if filename.startswith(site_folder):
@@ -674,7 +1050,7 @@ class OpenWebUIClient:
 
             async with session.get(url, headers=self.headers) as response:
                 if response.status == 200:
-                    file_data = await response.json()
+                    file_data = await response.json(loads=loads_json)
                     return cast(dict | None, file_data)
                 else:
                     logger.debug(f"Could not get details for file {file_id}: {response.status}")
@@ -683,6 +1059,7 @@ class OpenWebUIClient:
             logger.debug(f"Error getting file details {file_id}: {e}")
             return None
 
+    @_shares_session
     async def check_state_health(
         self, knowledge_id: str, site_name: str, local_metadata: dict | None = None
     ) -> dict:
@@ -739,7 +1116,7 @@ class OpenWebUIClient:
         logger.info(f"Local: {local_count} files tracked")
 
         # Build maps for comparison
-        local_file_ids = {f.get("file_id") for f in local_files if "file_id" in f}
+        local_file_ids = {fid for f in local_files if (fid := f.get("file_id")) is not None}
         remote_file_ids = {f["id"] for f in remote_files}
 
         # Check for discrepancies
@@ -780,6 +1157,7 @@ class OpenWebUIClient:
             ),
         }
 
+    @_shares_session
     async def match_and_reconcile(
         self, knowledge_id: str, site_name: str, local_metadata: dict
     ) -> dict:
@@ -799,10 +1177,27 @@ class OpenWebUIClient:
             - matched_count: Number of files matched by hash
             - unmatched_local: Files in local but not found in remote
             - unmatched_remote: Files in remote but not in local
+            - remote_filename_map: Remote files by site-relative filename
+              (file_id, hash, filename)
             - confidence: 'high', 'medium', 'low' based on match rate
         """
         logger.info(f"Matching local files with remote state for {site_name}...")
 
+        if not local_metadata.get("files"):
+            # Nothing to match - skip walking the remote knowledge base
+            logger.info("No local files to match")
+            return {
+                "success": True,
+                "file_id_map": {},
+                "matched_count": 0,
+                "total_local": 0,
+                "match_rate": 0,
+                "unmatched_local": [],
+                "unmatched_remote": [],
+                "remote_filename_map": {},
+                "confidence": "very_low",
+            }
+
         # Get remote files with hashes
         remote_files = await self.get_knowledge_files(
             knowledge_id, include_hashes=True, site_folder=site_name
@@ -819,39 +1214,45 @@ class OpenWebUIClient:
 
         logger.info(f"Found {len(remote_files)} remote files")
 
-        # Build hash -> file_id map from remote
+        # Build hash -> file_id map (Pass 1) and filename -> file_id map (Pass 2)
+        # from remote in one walk over the listing
         remote_hash_map = {}
+        remote_filename_map = {}
+        site_prefix = f"{site_name}_"
         for f in remote_files:
-            file_hash = f.get("hash")
             file_id = f.get("id")
-            if file_hash and file_id:
+            if not file_id:
+                continue
+            file_hash = f.get("hash")
+            filename_decoded = f.get("decoded_filename", "")
+
+            if file_hash:
                 remote_hash_map[file_hash] = {
                     "file_id": file_id,
-                    "filename": f.get("decoded_filename", f.get("filename", "unknown")),
+                    "filename": filename_decoded or f.get("filename", "unknown"),
                 }
 
-        logger.info(f"Built hash map for {len(remote_hash_map)} remote files")
-
-        # Build filename -> file_id map from remote (for Pass 2)
-        remote_filename_map = {}
-        for f in remote_files:
-            file_id = f.get("id")
-            filename_decoded = f.get("decoded_filename", "")
-            if filename_decoded and file_id:
+            if filename_decoded:
                 # Strip site folder prefix to get relative path (using underscores in new format)
-                relative_filename = filename_decoded.removeprefix(f"{site_name}_")
+                relative_filename = filename_decoded.removeprefix(site_prefix)
                 # Store both the flattened version (for matching) and original
                 remote_filename_map[relative_filename] = {
                     "file_id": file_id,
-                    "hash": f.get("hash"),
+                    "hash": file_hash,
                     "filename": filename_decoded,
                 }
 
+        logger.info(f"Built hash map for {len(remote_hash_map)} remote files")
         logger.info(f"Built filename map for {len(remote_filename_map)} remote files")
 
+        # Per-file match messages are only built when they will be emitted
+        log_matches = logger.isEnabledFor(logging.DEBUG)
+
         # Pass 1: Match local files by hash (perfect matches)
         local_files = local_metadata.get("files", [])
         file_id_map = {}
+        # Remote file_ids claimed by a local file, filled in as matches happen
+        matched_file_ids: set[str] = set()
         matched_count = 0
         unmatched_local = []
 
@@ -866,8 +1267,10 @@ class OpenWebUIClient:
             if local_hash in remote_hash_map:
                 file_id = remote_hash_map[local_hash]["file_id"]
                 file_id_map[url] = file_id
+                matched_file_ids.add(file_id)
                 matched_count += 1
-                logger.debug(f"✓ Hash matched: {local_file.get('filename')} -> {file_id}")
+                if log_matches:
+                    logger.debug(f"✓ Hash matched: {local_file.get('filename')} -> {file_id}")
             else:
                 unmatched_local.append(local_file)
 
@@ -892,19 +1295,21 @@ class OpenWebUIClient:
 
             # Try to match by filename
             # Flatten local filename to match remote format (slashes -> underscores)
-            local_filename_flattened = local_filename.replace("/", "_").replace("\\", "_")
+            local_filename_flattened = local_filename.translate(_SEP_TABLE)
             if local_filename_flattened in remote_filename_map:
                 remote_info = remote_filename_map[local_filename_flattened]
                 file_id = remote_info["file_id"]
                 file_id_map[url] = file_id
+                matched_file_ids.add(file_id)
                 filename_matched_count += 1
                 matched_count += 1
-                logger.debug(
-                    f"✓ Filename matched (hash differs): {local_filename} -> {file_id}\n"
-                    f"  Local hash:  {local_file.get('checksum', 'unknown')[:16]}...\n"
-                    f"  Remote hash: {remote_info.get('hash', 'unknown')[:16]}...\n"
-                    f"  Will be updated on next incremental upload"
-                )
+                if log_matches:
+                    logger.debug(
+                        f"✓ Filename matched (hash differs): {local_filename} -> {file_id}\n"
+                        f"  Local hash:  {local_file.get('checksum', 'unknown')[:16]}...\n"
+                        f"  Remote hash: {(remote_info.get('hash') or 'unknown')[:16]}...\n"
+                        f"  Will be updated on next incremental upload"
+                    )
             else:
                 still_unmatched.append(
                     {
@@ -919,7 +1324,6 @@ class OpenWebUIClient:
         unmatched_local = still_unmatched
 
         # Check for unmatched remote files
-        matched_file_ids = set(file_id_map.values())
         unmatched_remote = []
 
         for remote_hash, info in remote_hash_map.items():
@@ -958,9 +1362,11 @@ class OpenWebUIClient:
             "match_rate": match_rate,
             "unmatched_local": unmatched_local,
             "unmatched_remote": unmatched_remote,
+            "remote_filename_map": remote_filename_map,
             "confidence": confidence,
         }
 
+    @_shares_session
     async def _rebuild_state_inline(
         self,
         knowledge_id: str,
@@ -992,16 +1398,7 @@ class OpenWebUIClient:
 
         # Check confidence level
         confidence = match_result["confidence"]
-        confidence_levels = ["very_low", "low", "medium", "high"]
-
-        min_level_idx = (
-            confidence_levels.index(min_confidence) if min_confidence in confidence_levels else 1
-        )
-        actual_level_idx = (
-            confidence_levels.index(confidence) if confidence in confidence_levels else 0
-        )
-
-        if actual_level_idx < min_level_idx:
+        if _CONFIDENCE_RANK.get(confidence, 0) < _CONFIDENCE_RANK.get(min_confidence, 1):
             logger.warning(
                 f"Match confidence '{confidence}' is below threshold '{min_confidence}'\n"
                 f"  Matched: {match_result['matched_count']}/{match_result['total_local']} files\n"
@@ -1037,33 +1434,29 @@ class OpenWebUIClient:
             "files": [],
         }
 
-        # Build remote hash lookup for filename-matched files
-        remote_files_list = await self.get_knowledge_files(
-            knowledge_id, include_hashes=True, site_folder=site_name
-        )
-
-        remote_hash_by_filename = {}
-        if remote_files_list:
-            for rf in remote_files_list:
-                decoded_filename = rf.get("decoded_filename", "")
-                relative_filename = decoded_filename.removeprefix(f"{site_name}_")
-                if relative_filename and rf.get("hash"):
-                    remote_hash_by_filename[relative_filename] = rf["hash"]
+        # Build remote hash lookup for filename-matched files from the listing
+        # match_and_reconcile already fetched
+        remote_hash_by_filename = {
+            relative_filename: info["hash"]
+            for relative_filename, info in match_result["remote_filename_map"].items()
+            if relative_filename and info.get("hash")
+        }
 
         # Convert file_id_map to files list format
         file_id_map = match_result["file_id_map"]
         for local_file in local_metadata.get("files", []):
             url = local_file.get("url")
             if url and url in file_id_map:
-                # Preserve all original fields from local_file
-                file_entry = local_file.copy()
-                # Add the matched file_id
-                file_entry["file_id"] = file_id_map[url]
-                # Add reference to decoded filename we've matched it to
-                file_entry["matched_filename"] = local_file.get("filename")
+                local_filename = local_file.get("filename")
+                # Preserve all original fields from local_file, plus the matched
+                # file_id and the decoded filename we've matched it to
+                file_entry = {
+                    **local_file,
+                    "file_id": file_id_map[url],
+                    "matched_filename": local_filename,
+                }
 
                 # CRITICAL: For filename matches, use remote hash so update is detected
-                local_filename = local_file.get("filename")
                 local_hash = local_file.get("checksum")
 
                 if local_filename in remote_hash_by_filename:
@@ -1075,7 +1468,13 @@ class OpenWebUIClient:
 
                 upload_status["files"].append(file_entry)
 
-        logger.info(f"Reconstructed upload_status:\n{json.dumps(upload_status, indent=2)}")
+        logger.info(
+            f"Reconstructed upload_status: {len(upload_status['files'])} files "
+            f"(confidence: {confidence})"
+        )
+        # Pretty-printing the whole status is costly for large knowledge bases
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Reconstructed upload_status:\n{json.dumps(upload_status, indent=2)}")
 
         return upload_status
 
@@ -1090,7 +1489,7 @@ class OpenWebUIClient:
             payload = {"knowledge_id": knowledge_id}
 
             async with (
-                aiohttp.ClientSession() as session,
+                self._session_scope() as session,
                 session.post(url, headers=self.headers, json=payload) as response,
             ):
                 if response.status == 200:
@@ -1105,6 +1504,7 @@ class OpenWebUIClient:
             logger.error(f"Error reindexing knowledge: {e}")
             return False
 
+    @_shares_session
     async def upload_scrape_incrementally(
         self,
         scrape_dir: Path,
@@ -1190,18 +1590,23 @@ class OpenWebUIClient:
 
         # Phase 1: Delete removed files
         deleted_count = 0
-        removed_count = 0
         if files_to_delete and previous_file_map:
             action = "Removing" if keep_files else "Deleting"
             logger.info(f"{action} {len(files_to_delete)} files...")
-            for url in files_to_delete:
-                file_id = previous_file_map.get(url)
-                if file_id and await self.remove_file_from_knowledge(knowledge_id, file_id):
-                    removed_count += 1
-                    # Only delete file if keep_files is False
-                    if not keep_files and await self.delete_file(file_id):
-                        deleted_count += 1
-                await asyncio.sleep(0.1)
+
+            async def remove(file_id: str) -> bool:
+                # True only if the file was also deleted from storage
+                if not await self.remove_file_from_knowledge(knowledge_id, file_id):
+                    return False
+                # Only delete file if keep_files is False
+                return not keep_files and await self.delete_file(file_id)
+
+            deleted_count = sum(
+                await _gather_bounded(
+                    _FILE_OP_CONCURRENCY,
+                    (remove(fid) for url in files_to_delete if (fid := previous_file_map.get(url))),
+                )
+            )
 
         # Phase 2: Process files to upload (new and modified)
         new_files = []
@@ -1265,8 +1670,13 @@ class OpenWebUIClient:
             logger.info(f"Verifying {len(modified_files)} files exist before update...")
             verified_modified = []
 
-            for file_id, file_path, file_info in modified_files:
-                if await self.verify_file_exists(file_id):
+            exists = await _gather_bounded(
+                _VERIFY_CONCURRENCY, (self.verify_file_exists(fid) for fid, _, _ in modified_files)
+            )
+            for (file_id, file_path, file_info), file_exists in zip(
+                modified_files, exists, strict=True
+            ):
+                if file_exists:
                     verified_modified.append((file_id, file_path, file_info))
                 else:
                     logger.warning(
@@ -1294,28 +1704,22 @@ class OpenWebUIClient:
                 file_paths, site_name=site_name, base_content_dir=scrape_dir, batch_size=batch_size
             )
 
+            # Index new files by the full flattened upload filename (not just the
+            # basename, which can repeat across folders) to find each result's file
+            files_by_upload_name: dict[str, dict] = {}
+            for file_path, file_info in new_files:
+                upload_name = self._make_upload_filename(file_path, site_name, scrape_dir)
+                files_by_upload_name.setdefault(upload_name, file_info)
+
             # Map results to new_file_map and collect file_ids
             new_file_ids = []
             for result in upload_results:
-                file_id = result.get("file_id")
+                file_id = cast(str, result.get("file_id"))
                 if file_id:
-                    new_file_ids.append(cast(str, file_id))
-
-                    # Find which new_file this result corresponds to
-                    # Match by the full flattened upload filename, not just basename
-                    for file_path, file_info in new_files:
-                        # Construct the expected upload filename (same logic as _upload_file)
-                        try:
-                            relative_path = file_path.relative_to(scrape_dir)
-                            expected_upload_name = f"{site_name}_{relative_path}".replace(
-                                "\\", "_"
-                            ).replace("/", "_")
-                        except ValueError:
-                            expected_upload_name = f"{site_name}_{file_path.name}"
-
-                        if expected_upload_name == result.get("upload_filename"):
-                            new_file_map[file_info["url"]] = cast(str, file_id)
-                            break
+                    new_file_ids.append(file_id)
+                    matched_info = files_by_upload_name.get(result.get("upload_filename", ""))
+                    if matched_info:
+                        new_file_map[matched_info["url"]] = file_id
 
             uploaded_count = len(new_file_ids)
 
@@ -1327,8 +1731,14 @@ class OpenWebUIClient:
         updated_count = 0
         if modified_files:
             logger.info(f"Updating {len(modified_files)} modified files...")
-            for file_id, file_path, file_info in modified_files:
-                if await self.update_file_content(file_id, file_path):
+            update_results = await _gather_bounded(
+                _FILE_OP_CONCURRENCY,
+                (self.update_file_content(fid, fp) for fid, fp, _ in modified_files),
+            )
+            for (file_id, _, file_info), updated in zip(
+                modified_files, update_results, strict=True
+            ):
+                if updated:
                     updated_count += 1
                     new_file_map[file_info["url"]] = file_id
                 else:
@@ -1336,7 +1746,6 @@ class OpenWebUIClient:
                     logger.warning(
                         f"Failed to update {file_info['url']}, file may have been deleted during upload"
                     )
-                await asyncio.sleep(0.1)
 
         # Phase 3: Add new files to knowledge (batch)
         if new_file_ids:
@@ -1344,8 +1753,9 @@ class OpenWebUIClient:
             await self.add_files_to_knowledge_batch(knowledge_id, new_file_ids)
 
         # Preserve file IDs for unchanged files
+        deleted_urls = set(files_to_delete)
         for url, file_id in previous_file_map.items():
-            if url not in new_file_map and url not in files_to_delete:
+            if url not in new_file_map and url not in deleted_urls:
                 new_file_map[url] = file_id
 
         # NEW: Phase 4: Cleanup untracked files in site folder
@@ -1356,27 +1766,35 @@ class OpenWebUIClient:
 
             if remote_files:
                 untracked_file_ids = []
+                tracked_ids = set(new_file_map.values())
 
                 for f in remote_files:
                     file_id = f["id"]
                     # Check if this file is in our new state
-                    if file_id not in new_file_map.values():
+                    if file_id not in tracked_ids:
                         untracked_file_ids.append((file_id, f.get("meta", {}).get("name", f["id"])))
 
                 if untracked_file_ids:
                     logger.info(
                         f"Found {len(untracked_file_ids)} untracked files in {site_name}/ folder, deleting..."
                     )
-                    for file_id, filename in untracked_file_ids:
+
+                    async def purge(file_id: str) -> bool:
                         # Remove from knowledge and delete file
-                        if (
-                            file_id
-                            and await self.remove_file_from_knowledge(knowledge_id, file_id)
-                            and await self.delete_file(file_id)
-                        ):
+                        return await self.remove_file_from_knowledge(
+                            knowledge_id, file_id
+                        ) and await self.delete_file(file_id)
+
+                    untracked_file_ids = [(fid, name) for fid, name in untracked_file_ids if fid]
+                    purge_results = await _gather_bounded(
+                        _FILE_OP_CONCURRENCY, (purge(fid) for fid, _ in untracked_file_ids)
+                    )
+                    for (_, filename), purged in zip(
+                        untracked_file_ids, purge_results, strict=True
+                    ):
+                        if purged:
                             deleted_untracked += 1
                             logger.debug(f"✓ Deleted untracked: {filename}")
-                        await asyncio.sleep(0.1)
 
                     logger.info(f"✓ Cleaned up {deleted_untracked} untracked files")
 
@@ -1401,6 +1819,7 @@ class OpenWebUIClient:
             "summary": f"Uploaded: {uploaded_count}, Updated: {updated_count}, Deleted: {deleted_count}",
         }
 
+    @_shares_session
     async def _wait_for_file_processing(self, file_ids: list[str], timeout: int = 60):
         """
         Wait for files to finish processing before adding to knowledge.
@@ -1412,14 +1831,18 @@ class OpenWebUIClient:
         logger.info(f"Waiting for {len(file_ids)} files to be processed...")
 
         start_time = asyncio.get_event_loop().time()
-        pending_files = set(file_ids)
+        pending_files = list(dict.fromkeys(file_ids))
+        delay = _POLL_INITIAL_DELAY
 
         while pending_files and (asyncio.get_event_loop().time() - start_time) < timeout:
-            completed = set()
-
-            for file_id in list(pending_files):
-                status = await self.get_file_process_status(file_id)
+            statuses = await _gather_bounded(
+                _STATUS_POLL_CONCURRENCY,
+                (self.get_file_process_status(file_id) for file_id in pending_files),
+            )
 
+            still_pending = []
+            unknown = False
+            for file_id, status in zip(pending_files, statuses, strict=True):
                 if status:
                     # Check if processing is complete
                     # Status could be: "completed", "processing", "failed", etc.
@@ -1427,20 +1850,24 @@ class OpenWebUIClient:
 
                     if state in ["completed", "success", "done"]:
                         logger.debug(f"✓ File {file_id} processed successfully")
-                        completed.add(file_id)
                     elif state in ["failed", "error"]:
+                        # Remove from pending even if failed
                         logger.warning(f"✗ File {file_id} processing failed")
-                        completed.add(file_id)  # Remove from pending even if failed
+                    else:
+                        still_pending.append(file_id)
                 else:
-                    # If we can't get status, assume it's ready after a short wait
-                    await asyncio.sleep(1)
-                    completed.add(file_id)
+                    unknown = True
+
+            if unknown:
+                # If we can't get status, assume it's ready after a short wait
+                await asyncio.sleep(1)
 
-            pending_files -= completed
+            pending_files = still_pending
 
             if pending_files:
                 logger.debug(f"Waiting for {len(pending_files)} files to complete processing...")
-                await asyncio.sleep(2)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, _POLL_MAX_DELAY)
 
         if pending_files:
             logger.warning(f"Timeout waiting for {len(pending_files)} files to process")
@@ -1458,7 +1885,7 @@ class OpenWebUIClient:
             url = f"{self.base_url}/api/v1/knowledge/"
 
             async with (
-                aiohttp.ClientSession() as session,
+                self._session_scope() as session,
                 session.get(url, headers=self.headers) as response,
             ):
                 if response.status == 200:
@@ -1471,6 +1898,7 @@ class OpenWebUIClient:
             logger.error(f"Connection error: {e}")
             return False
 
+    @_shares_session
     async def upload_scrape_to_knowledge(
         self,
         scrape_dir: Path,
@@ -1547,9 +1975,7 @@ class OpenWebUIClient:
         if not upload_results:
             return {"error": "Failed to upload files"}
 
-        file_ids = [
-            cast(str, r["file_id"]) for r in upload_results if "file_id" in r and r["file_id"]
-        ]
+        file_ids: list[str] = [fid for r in upload_results if (fid := r.get("file_id"))]
 
         # Wait for files to be processed
         if file_ids:
@@ -1563,35 +1989,35 @@ class OpenWebUIClient:
         metadata_file = scrape_dir.parent / "metadata.json"
         filename_to_url = {}
         if metadata_file.exists():
-            with open(metadata_file) as f:
-                metadata = json.load(f)
-                for file_info in metadata.get("files", []):
-                    filename = file_info.get("filename")
-                    url = file_info.get("url")
-                    if filename and url:
-                        # Store both original and flattened versions for matching
-                        filename_to_url[filename] = url
-                        flattened = filename.replace("/", "_").replace("\\", "_")
-                        filename_to_url[flattened] = url
+            metadata = load_json(metadata_file)
+            for file_info in metadata.get("files", []):
+                filename = file_info.get("filename")
+                url = file_info.get("url")
+                if filename and url:
+                    # Store both original and flattened versions for matching
+                    filename_to_url[filename] = url
+                    flattened = filename.translate(_SEP_TABLE)
+                    filename_to_url[flattened] = url
 
         # Build file_id_map with real URLs
         file_id_map = {}
+        site_prefix = f"{site_name}_"
         for result in upload_results:
-            upload_filename = result.get("upload_filename", "")
             # Strip site prefix: "maxroll_poe2_guides_artisan.md" → "guides_artisan.md"
-            relative_filename = upload_filename.removeprefix(f"{site_name}_")
+            relative_filename = result.get("upload_filename", "").removeprefix(site_prefix)
+            file_id = result.get("file_id")
 
             # Look up the real URL from metadata
             url = filename_to_url.get(relative_filename)
             if url:
-                file_id_map[url] = result.get("file_id")
+                file_id_map[url] = file_id
             else:
                 # Fallback for backwards compatibility or if metadata missing
                 logger.warning(
                     f"Could not find URL for {relative_filename} in metadata, "
                     f"using filename as fallback"
                 )
-                file_id_map[relative_filename] = result.get("file_id")
+                file_id_map[relative_filename] = file_id
 
         return {
             "success": True,
@@ -0,0 +1,110 @@
+"""
+Fast file copying for scrape and current/ content.
+"""
+
+import contextlib
+import errno
+import os
+import stat
+import sys
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
+# Buffer size for the userspace copy fallback
+_COPY_BUFSIZE = 1024 * 1024
+
+# Errors meaning a kernel copy path is unavailable for this pair of files
+_COPY_FALLBACK_ERRNOS = {
+    errno.ENOSYS,
+    errno.EXDEV,
+    errno.EINVAL,
+    errno.EBADF,
+    errno.ENOTSUP,
+    errno.EOPNOTSUPP,
+}
+
+# Linux FICLONE ioctl: share the source's extents with dst (Btrfs, XFS, bcachefs)
+_FICLONE = 0x40049409
+
+
+def _try_reflink(in_fd: int, out_fd: int) -> bool:
+    """Clone in_fd into out_fd copy-on-write; False if the filesystem can't."""
+    if fcntl is None or not sys.platform.startswith("linux"):
+        return False
+    try:
+        fcntl.ioctl(out_fd, _FICLONE, in_fd)
+    except OSError:
+        # EOPNOTSUPP/EXDEV/EINVAL/ENOTTY etc. - any real I/O problem resurfaces
+        # in the regular copy paths below
+        return False
+    return True
+
+
+def _fadvise(fd: int, advice_name: str) -> None:
+    """Best-effort os.posix_fadvise over the whole file; no-op where unsupported."""
+    advice = getattr(os, advice_name, None)
+    if advice is None or not hasattr(os, "posix_fadvise"):
+        return
+    with contextlib.suppress(OSError):
+        os.posix_fadvise(fd, 0, 0, advice)
+
+
+def fast_copy(src: Path, dst: Path) -> None:
+    """
+    Copy file contents from src to dst using the fastest available path.
+
+    Tries a FICLONE reflink (no data copied on CoW filesystems), then
+    os.copy_file_range (in-kernel), then os.sendfile, then a buffered readinto
+    loop. Permission bits and timestamps are carried over from the stat
+    already taken, as shutil.copy2() would, but xattrs and flags are not.
+    """
+    src_stat = os.stat(src)
+    # Request at least the full file per call so small files need a single syscall
+    blocksize = max(src_stat.st_size, 8 * _COPY_BUFSIZE)
+
+    with open(src, "rb", buffering=0) as fsrc, open(dst, "wb", buffering=0) as fdst:
+        in_fd = fsrc.fileno()
+        out_fd = fdst.fileno()
+        done = _try_reflink(in_fd, out_fd)
+        if not done:
+            # The source is read once, front to back: ask for aggressive readahead
+            _fadvise(in_fd, "POSIX_FADV_SEQUENTIAL")
+
+        if not done and hasattr(os, "copy_file_range"):
+            try:
+                while os.copy_file_range(in_fd, out_fd, blocksize):
+                    pass
+                done = True
+            except OSError as e:
+                if e.errno not in _COPY_FALLBACK_ERRNOS:
+                    raise
+
+        if not done and hasattr(os, "sendfile"):
+            try:
+                while os.sendfile(out_fd, in_fd, None, blocksize):
+                    pass
+                done = True
+            except OSError as e:
+                if e.errno not in _COPY_FALLBACK_ERRNOS:
+                    raise
+
+        if not done:
+            # Both kernel paths continue from the current offsets, so a partial
+            # kernel copy is resumed rather than restarted
+            with memoryview(bytearray(_COPY_BUFSIZE)) as buf:
+                while n := fsrc.readinto(buf):
+                    # Raw writes may be short; loop until the whole chunk is out
+                    view = buf[:n]
+                    while view:
+                        view = view[os.write(out_fd, view) :]
+
+        # Scrape sources aren't read again; drop their pages so the cache keeps
+        # current/ (which the uploader reads next) instead
+        _fadvise(in_fd, "POSIX_FADV_DONTNEED")
+
+    os.chmod(dst, stat.S_IMODE(src_stat.st_mode))
+    os.utime(dst, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
@@ -0,0 +1,189 @@
+"""
+JSON helpers used by the storage layer and the API client.
+
+Uses orjson when it is installed (``pip install web-to-openwebui[fast]``) and
+falls back to the standard library otherwise. Both paths read and write the
+same on-disk format, so files stay interchangeable between installs.
+
+Writes are atomic: data goes to a temporary sibling file that is fsync'd and
+then renamed over the target, so a crash never leaves a half-written file.
+Output is compact unless WEBOWUI_PRETTY_JSON=1 is set, for debugging.
+"""
+
+import json
+import mmap
+import os
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+
+def load_json(path: Path) -> Any:
+    """
+    Load a JSON document from disk.
+
+    Args:
+        path: File to read
+
+    Returns:
+        Decoded JSON value
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the file is not valid JSON (json.JSONDecodeError subclasses it)
+    """
+    with open(path, "rb") as f:
+        if orjson is None:
+            return json.loads(f.read())
+        if os.fstat(f.fileno()).st_size == 0:
+            # mmap can't map an empty file; let orjson raise its usual decode error
+            return orjson.loads(b"")
+        # orjson parses straight from the mapped pages, skipping the bytes copy
+        # read() would make; the view must be released before the map closes
+        with (
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+            memoryview(mapped) as view,
+        ):
+            return orjson.loads(view)
+
+
+def loads_json(data: str | bytes) -> Any:
+    """
+    Decode a JSON document held in memory, e.g. an HTTP response body.
+
+    Args:
+        data: JSON text
+
+    Returns:
+        Decoded JSON value
+
+    Raises:
+        ValueError: If data is not valid JSON
+    """
+    if orjson is None:
+        return json.loads(data)
+    return orjson.loads(data)
+
+
+def dumps_json(obj: Any) -> str:
+    """
+    Serialize obj to compact JSON text, e.g. for an HTTP request body.
+
+    Matches aiohttp's ``json_serialize`` signature, so a ClientSession can
+    encode ``json=`` payloads with orjson.
+
+    Args:
+        obj: JSON-serializable value
+
+    Returns:
+        JSON text
+    """
+    return _dumps(obj).decode()
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """
+    Replace path with data atomically.
+
+    Args:
+        path: File to write (overwritten)
+        data: Complete new file contents
+    """
+    atomic_write_chunks(path, (data,))
+
+
+def atomic_write_chunks(path: Path, chunks: Iterable[bytes]) -> None:
+    """
+    Replace path atomically with the concatenation of chunks.
+
+    Chunks are written as they are produced, so the full contents never
+    have to exist in memory at once.
+
+    Args:
+        path: File to write (overwritten)
+        chunks: File contents, in order
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _pretty_json() -> bool:
+    """Whether WEBOWUI_PRETTY_JSON asks for indented output."""
+    return os.getenv("WEBOWUI_PRETTY_JSON", "").lower() in ("1", "true", "yes")
+
+
+def _dumps(obj: Any, pretty: bool = False) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes, compact unless pretty."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else None)
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode()
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def dump_json(obj: Any, path: Path, pretty: bool = False) -> None:
+    """
+    Atomically write a JSON document to disk.
+
+    Output is compact (no whitespace) unless pretty is passed or
+    WEBOWUI_PRETTY_JSON is set, in which case it is indented by two spaces.
+
+    Args:
+        obj: JSON-serializable value
+        path: File to write (overwritten)
+        pretty: Always indent, for files meant to be read by people
+    """
+    atomic_write_bytes(path, _dumps(obj, pretty or _pretty_json()))
+
+
+def _iter_json_chunks(obj: dict) -> Iterator[bytes]:
+    """Serialize a dict, emitting top-level list values one element at a time."""
+    yield b"{"
+    for i, (key, value) in enumerate(obj.items()):
+        if i:
+            yield b","
+        yield _dumps(key) + b":"
+        if isinstance(value, list):
+            yield b"["
+            for j, item in enumerate(value):
+                if j:
+                    yield b","
+                yield _dumps(item)
+            yield b"]"
+        else:
+            yield _dumps(value)
+    yield b"}"
+
+
+def dump_json_streaming(obj: dict, path: Path) -> None:
+    """
+    Atomically write a JSON object whose top-level lists may be very large.
+
+    Produces the same bytes as dump_json, but each element of a top-level
+    list is serialized and written on its own, so the serialized form of a
+    large ``files`` array is never held in memory as a whole. With
+    WEBOWUI_PRETTY_JSON set this falls back to dump_json.
+
+    Args:
+        obj: JSON object (string keys) to write
+        path: File to write (overwritten)
+    """
+    if _pretty_json():
+        dump_json(obj, path)
+        return
+
+    atomic_write_chunks(path, _iter_json_chunks(obj))
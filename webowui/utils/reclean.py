@@ -2,35 +2,50 @@
 Utility to re-clean existing scraped files with updated ContentCleaner.
 """
 
+import asyncio
+import functools
+import os
 import sys
+from collections.abc import Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor
 from pathlib import Path
 
 from ..scraper.cleaning_profiles import CleaningProfileRegistry
+from ..scraper.cleaning_profiles.base import BaseCleaningProfile
 
+# Files being read/cleaned/written at once by reclean_directory
+_RECLEAN_CONCURRENCY = 32
 
-def reclean_file(filepath: Path, profile_name: str = "mediawiki") -> tuple[int, int]:
-    """Re-clean a single file. Returns (before_lines, after_lines)."""
+# Below this many files, worker process startup outweighs parallel cleaning
+_PROCESS_POOL_MIN_FILES = 64
+
+
+@functools.cache
+def _get_profile(profile_name: str) -> BaseCleaningProfile:
+    """Resolve a cleaning profile once per process, falling back to 'mediawiki'."""
+    if not CleaningProfileRegistry.has_profile(profile_name):
+        print(f"Warning: Profile '{profile_name}' not found, using 'mediawiki'")
+        profile_name = "mediawiki"
+    return CleaningProfileRegistry.get_profile(profile_name)
+
+
+def reclean_file(
+    filepath: Path, profile_name: str = "mediawiki", dry_run: bool = False
+) -> tuple[int, int]:
+    """Re-clean a single file, unless dry_run. Returns (before_lines, after_lines)."""
     content = filepath.read_text(encoding="utf-8")
 
     # Count original non-frontmatter lines
-    original_lines = [line for line in content.split("\n")[7:] if line.strip()]
+    original_lines = sum(1 for line in content.split("\n")[7:] if line.strip())
 
     # Get profile
-    try:
-        profile = CleaningProfileRegistry.get_profile(profile_name)
-    except ValueError:
-        print(f"Warning: Profile '{profile_name}' not found, using 'mediawiki'")
-        profile = CleaningProfileRegistry.get_profile("mediawiki")
-
-    # Separate frontmatter
-    if content.startswith("---"):
-        parts = content.split("---", 2)
-        if len(parts) >= 3:
-            frontmatter = "---" + parts[1] + "---"
-            body = parts[2]
-        else:
-            frontmatter = ""
-            body = content
+    profile = _get_profile(profile_name)
+
+    # Separate frontmatter: everything up to and including the closing "---"
+    end = content.find("---", 3) if content.startswith("---") else -1
+    if end != -1:
+        frontmatter = content[: end + 3]
+        body = content[end + 3 :]
     else:
         frontmatter = ""
         body = content
@@ -38,35 +53,122 @@ def reclean_file(filepath: Path, profile_name: str = "mediawiki") -> tuple[int,
     # Apply new cleaner
     cleaned_body = profile.clean(body)
 
-    new_content = frontmatter + "\n\n" + cleaned_body
+    new_content = "".join((frontmatter, "\n\n", cleaned_body))
 
-    # Write back
-    filepath.write_text(new_content, encoding="utf-8")
+    # Write back, unless cleaning left the file as it was
+    if not dry_run and new_content != content:
+        filepath.write_text(new_content, encoding="utf-8")
 
-    new_lines = [line for line in cleaned_body.split("\n") if line.strip()]
+    new_lines = sum(1 for line in cleaned_body.split("\n") if line.strip())
 
-    return len(original_lines), len(new_lines)
+    return original_lines, new_lines
 
 
-def reclean_directory(directory: Path, profile_name: str = "mediawiki"):
-    """Re-clean all markdown files in a directory."""
-    md_files = list(directory.rglob("*.md"))
+def _iter_markdown(root: str) -> Iterator[str]:
+    """
+    Yield paths of *.md files under root, directory by directory in sorted order.
 
-    print(f"Found {len(md_files)} files to re-clean using profile '{profile_name}'")
+    Walks with os.scandir so only matching files ever become path strings;
+    symlinked directories are not followed.
+    """
+    files = []
+    subdirs = []
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+            elif entry.name.endswith(".md") and entry.is_file():
+                files.append(entry.path)
+
+    yield from sorted(files)
+    for subdir in sorted(subdirs):
+        yield from _iter_markdown(subdir)
 
+
+def _report_line(filepath: Path, before: int, after: int) -> str:
+    """Format the line counts for one re-cleaned file."""
+    removed = before - after
+    if removed > 0:
+        return f"✓ {filepath.name}: {before} → {after} lines (-{removed})\n"
+    return f"  {filepath.name}: {after} lines (no change)\n"
+
+
+async def _reclean_files(
+    md_files: list[Path],
+    profile_name: str,
+    dry_run: bool = False,
+    executor: Executor | None = None,
+) -> tuple[int, int]:
+    """
+    Re-clean files off the event loop with a sliding window of workers.
+
+    A new file starts as soon as any in-flight one finishes, so a single slow
+    file never holds up the rest.
+
+    Args:
+        md_files: Files to re-clean
+        profile_name: Cleaning profile to apply
+        dry_run: Only report line counts; leave files untouched
+        executor: Where reclean_file runs (default: the loop's thread pool)
+
+    Returns:
+        Total (before_lines, after_lines) across all files
+    """
+    loop = asyncio.get_running_loop()
     total_before = 0
     total_after = 0
+    pending: dict[asyncio.Future[tuple[int, int]], Path] = {}
+    remaining = iter(md_files)
+
+    while True:
+        for filepath in remaining:
+            future = loop.run_in_executor(executor, reclean_file, filepath, profile_name, dry_run)
+            pending[future] = filepath
+            if len(pending) >= _RECLEAN_CONCURRENCY:
+                break
+
+        if not pending:
+            break
+
+        done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        report = []
+        for future in done:
+            before, after = future.result()
+            report.append(_report_line(pending.pop(future), before, after))
+            total_before += before
+            total_after += after
+        # One write per batch of completed files rather than one per file
+        sys.stdout.write("".join(report))
+
+    return total_before, total_after
+
+
+def reclean_directory(directory: Path, profile_name: str = "mediawiki", dry_run: bool = False):
+    """
+    Re-clean all markdown files in a directory.
+
+    Args:
+        directory: Directory searched recursively for *.md files
+        profile_name: Cleaning profile to apply
+        dry_run: Only report line counts; leave files untouched
+    """
+    # Grouped by directory so files in the same directory are rewritten together
+    md_files = [Path(path) for path in _iter_markdown(str(directory))]
 
-    for filepath in md_files:
-        before, after = reclean_file(filepath, profile_name)
-        total_before += before
-        total_after += after
-
-        removed = before - after
-        if removed > 0:
-            print(f"✓ {filepath.name}: {before} → {after} lines (-{removed})")
-        else:
-            print(f"  {filepath.name}: {after} lines (no change)")
+    print(f"Found {len(md_files)} files to re-clean using profile '{profile_name}'")
+    # Resolve up front: threads share the result and forked workers inherit it
+    _get_profile(profile_name)
+    if dry_run:
+        print("Dry run: files will not be modified")
+
+    if len(md_files) >= _PROCESS_POOL_MIN_FILES:
+        # Cleaning is CPU-bound Python, so large sweeps spread it across cores
+        with ProcessPoolExecutor() as pool:
+            total_before, total_after = asyncio.run(
+                _reclean_files(md_files, profile_name, dry_run, executor=pool)
+            )
+    else:
+        total_before, total_after = asyncio.run(_reclean_files(md_files, profile_name, dry_run))
 
     print("\nTotal:")
     print(f"  Before: {total_before} lines")